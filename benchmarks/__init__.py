@@ -0,0 +1,8 @@
+"""
+Offline benchmarks for the nutshell client, run against the local MockNutshell server.
+
+Run every benchmark with ``python -m benchmarks --output results.json``, or a single module with for example
+``python -m benchmarks.bench_client``. Passing ``--compare baseline.json`` exits non-zero when a metric regresses by
+more than ``--threshold`` (default 20%).
+
+"""
@@ -0,0 +1,4 @@
+from benchmarks import bench_client, bench_decoding, bench_import
+from benchmarks.harness import main
+
+main({**bench_client.BENCHMARKS, **bench_decoding.BENCHMARKS, **bench_import.BENCHMARKS})
@@ -0,0 +1,305 @@
+"""
+Benchmarks of NutshellAPI against the mock server: call_api throughput, per-call latency percentiles, the parse time
+of _map_results on large pages (eager, and lazy reading only id and name), the memory retained by a parsed
+page with and without an identity map, a pipeline aggregation over models versus columnar arrays, bulk edits,
+synchronous calls from many threads, event loop latency while large pages are parsed on and off the loop, an
+analytics report grid, a full lead pull paged serially, with prefetch and as concurrent shards, and adaptive page
+sizes.
+"""
+
+import asyncio
+import gc
+import json
+import multiprocessing
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from benchmarks.harness import main, percentile, time_repeated
+from nutshell.analytics import AnalyticsEngine
+from nutshell.bulk import BulkEditor
+from nutshell.columnar import LeadColumns
+from nutshell.interning import IdentityMap
+from nutshell.entities import AnalyticsReportType, User
+from nutshell.methods import GetAnalyticsReport, GetLead, FindActivities, FindLeads
+from nutshell.mock_server import MockNutshell
+from nutshell.nutshell_api import NutshellAPI
+from nutshell.pagination import AdaptivePageSize, Paginator
+from nutshell.sharding import ShardedFindLeads
+
+CALLS = 500
+LATENCY = 0.01
+
+
+def _throughput(max_batch_size: int) -> dict[str, float]:
+    with MockNutshell(leads=CALLS, activities=0, latency=LATENCY, record_requests=False) as server:
+        with NutshellAPI("user", password="key", max_batch_size=max_batch_size, coalesce=False) as api:
+            api.URL = server.url
+            api.api_calls = [GetLead(lead_id=lead_id) for lead_id in range(1, CALLS + 1)]
+            api.call_api()  # warm the connection pool
+            timing = time_repeated(api.call_api, repeat=3)
+    return {"calls_per_s": CALLS / timing["best_s"], **timing}
+
+
+def call_api_throughput() -> dict[str, float]:
+    return _throughput(max_batch_size=1)
+
+
+def call_api_batched_throughput() -> dict[str, float]:
+    return _throughput(max_batch_size=50)
+
+
+def per_call_latency() -> dict[str, float]:
+    with MockNutshell(leads=CALLS, activities=0, latency=LATENCY, record_requests=False) as server:
+        with NutshellAPI("user", password="key", coalesce=False) as api:
+            api.URL = server.url
+            calls = [GetLead(lead_id=lead_id) for lead_id in range(1, CALLS + 1)]
+            list(api.iter_completed(calls[:20]))  # warm the connection pool
+            start = time.perf_counter()
+            latencies = [time.perf_counter() - start for _ in api.iter_completed(calls)]
+    return {"p50_s": percentile(latencies, 50), "p90_s": percentile(latencies, 90),
+            "p99_s": percentile(latencies, 99), "first_result_s": latencies[0]}
+
+
+def _parse_time(method, page_size: int, lazy: bool = False) -> dict[str, float]:
+    server = MockNutshell(leads=page_size, activities=page_size, users=50)
+    raw = json.loads(json.dumps({"result": server.respond(method.api_method, method.params)}))
+
+    def parse_and_read_names():
+        (response,) = NutshellAPI._map_results([method], [raw], lazy=lazy)
+        return [(entity.id, entity.name) for entity in response.result]
+
+    timing = time_repeated(parse_and_read_names, repeat=5)
+    return {"entities_per_s": page_size / timing["best_s"], **timing,
+            "payload_bytes": len(json.dumps(raw))}
+
+
+def map_results_leads() -> dict[str, float]:
+    return _parse_time(FindLeads(limit=1000, stub_responses=False), 1000)
+
+
+def map_results_activities() -> dict[str, float]:
+    return _parse_time(FindActivities(limit=1000, stub_responses=False), 1000)
+
+
+def map_results_activities_lazy() -> dict[str, float]:
+    return _parse_time(FindActivities(limit=1000, stub_responses=False), 1000, lazy=True)
+
+
+def parsed_page_memory() -> dict[str, float]:
+    server = MockNutshell(leads=1000, activities=1000, users=50)
+    method = FindActivities(limit=1000, stub_responses=False)
+    body = json.dumps({"result": server.respond(method.api_method, method.params)})
+
+    def retained_bytes(identity_map: IdentityMap = None) -> int:
+        raw = json.loads(body)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            (response,) = NutshellAPI._map_results([method], [raw])
+            if identity_map is not None:
+                identity_map.intern_response(response)
+            del raw
+            gc.collect()
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    plain, interned = retained_bytes(), retained_bytes(IdentityMap())
+    return {"plain_bytes": plain, "interned_bytes": interned, "interned_ratio": interned / plain}
+
+
+def pipeline_value_by_milestone() -> dict[str, float]:
+    """Open value per milestone of 10,000 leads: parsed models and a Python loop versus columnar arrays."""
+    import numpy
+
+    server = MockNutshell(leads=10_000, activities=0, users=50)
+    method = FindLeads(limit=10_000, stub_responses=False)
+    raw = json.loads(json.dumps({"result": server.respond(method.api_method, method.params)}))
+
+    def with_models():
+        (response,) = NutshellAPI._map_results([method], [raw])
+        totals = {}
+        for lead in response.result:
+            if lead.status == 0:
+                totals[lead.milestone.id] = totals.get(lead.milestone.id, 0.0) + float(lead.value["amount"])
+        return totals
+
+    def with_columns():
+        columns = LeadColumns.from_json(raw["result"]).to_numpy()
+        open_leads = columns["status"] == 0
+        return numpy.bincount(columns["milestone_id"][open_leads], weights=columns["value_amount"][open_leads])
+
+    models, columnar = time_repeated(with_models, repeat=3), time_repeated(with_columns, repeat=3)
+    return {"models_leads_per_s": 10_000 / models["best_s"], "columnar_leads_per_s": 10_000 / columnar["best_s"]}
+
+
+def bulk_edit_throughput() -> dict[str, float]:
+    """Reassigns every lead with BulkEditor from known revs, one in ten of them out of date to force conflicts."""
+    with MockNutshell(leads=CALLS, activities=0, latency=LATENCY, record_requests=False) as server:
+        with NutshellAPI("user", password="key", coalesce=False) as api:
+            api.URL = server.url
+            revs = {lead["id"]: lead["rev"] for lead in server.leads}
+            for lead in server.leads[::10]:
+                server.modify(lead)
+            edits = [(lead_id, {"assignee": {"entityType": "Users", "id": 1}}) for lead_id in revs]
+            start = time.perf_counter()
+            outcomes = BulkEditor(api, concurrency=20).run(edits, revs=revs)
+            elapsed = time.perf_counter() - start
+    return {"edits_per_s": len(edits) / elapsed, "conflicts": sum(outcome.conflicts for outcome in outcomes)}
+
+
+def threaded_call_throughput() -> dict[str, float]:
+    """Single calls from 16 threads: sharing one instance (its background loop and connection pool) versus each call
+    running its own event loop and session with asyncio.run."""
+    calls = [GetLead(lead_id=lead_id) for lead_id in range(1, CALLS + 1)]
+    with MockNutshell(leads=CALLS, activities=0, latency=LATENCY, record_requests=False) as server:
+        with NutshellAPI("user", password="key", coalesce=False) as api:
+            api.URL = server.url
+
+            def own_loop(call):
+                async def run():
+                    async with NutshellAPI("user", password="key", coalesce=False) as own:
+                        own.URL = server.url
+                        return await own.acall(call)
+                return asyncio.run(run())
+
+            with ThreadPoolExecutor(16) as threads:
+                list(threads.map(api.call_api, calls[:32]))  # warm the connection pool
+                shared = time_repeated(lambda: list(threads.map(api.call_api, calls)), repeat=3)
+                separate = time_repeated(lambda: list(threads.map(own_loop, calls)), repeat=3)
+    return {"shared_calls_per_s": CALLS / shared["best_s"], "asyncio_run_calls_per_s": CALLS / separate["best_s"]}
+
+
+async def _loop_lag(api: NutshellAPI, calls: list) -> tuple[list[float], float]:
+    """Makes the calls while a ticker sleeping 1 ms records how late the loop wakes it."""
+    lags, done = [], False
+
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    ticking = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await api.acall(calls)
+    elapsed = time.perf_counter() - start
+    done = True
+    await ticking
+    return lags, elapsed
+
+
+def loop_latency_while_parsing() -> dict[str, float]:
+    """Loop lag while eight 250-activity pages are fetched and parsed: inline, in a thread pool, in a process pool."""
+    calls = [FindActivities(limit=250, page=page, stub_responses=False) for page in range(1, 9)]
+    executors = {"inline": lambda: None, "thread": lambda: ThreadPoolExecutor(4),
+                 "process": lambda: ProcessPoolExecutor(4, mp_context=multiprocessing.get_context("spawn"))}
+    metrics = {}
+    with MockNutshell(leads=10, activities=2000, users=50, latency=LATENCY, record_requests=False) as server:
+        for name, make_executor in executors.items():
+            executor = make_executor()
+
+            async def run():
+                async with NutshellAPI("user", password="key", coalesce=False, parse_executor=executor) as api:
+                    api.URL = server.url
+                    await api.acall(calls[:4])  # warm the connection pool and the workers
+                    return await _loop_lag(api, calls)
+
+            lags, elapsed = asyncio.run(run())
+            if executor is not None:
+                executor.shutdown()
+            metrics |= {f"{name}_max_lag_s": max(lags), f"{name}_p99_lag_s": percentile(lags, 99),
+                        f"{name}_elapsed_s": elapsed}
+    return metrics
+
+
+def analytics_grid() -> dict[str, float]:
+    """Effort of 25 users over 4 periods: one report at a time summed in Python, the engine, and the engine again
+    from its cache."""
+    periods = ["-d7", "-d14", "-d30", "-d90"]
+    with MockNutshell(leads=1, activities=1, users=25, latency=LATENCY, record_requests=False) as server:
+        users = [User.model_validate(user) for user in server.users]
+        with NutshellAPI("user", password="key") as api:
+            api.URL = server.url
+            start = time.perf_counter()
+            totals = {}
+            for user in users:
+                for period in periods:
+                    api.api_calls = GetAnalyticsReport(report_type=AnalyticsReportType.EFFORT, period=period,
+                                                       filters=[user])
+                    series = api.call_api().result.series_data
+                    totals[user.id, period] = (sum(count for _, count in series.total_effort),
+                                               sum(count for _, count in series.successful_effort))
+            sequential = time.perf_counter() - start
+            engine = AnalyticsEngine(api, concurrency=20)
+            start = time.perf_counter()
+            engine.grid(users, periods)
+            fanned_out = time.perf_counter() - start
+            start = time.perf_counter()
+            engine.grid(users, periods)
+            cached = time.perf_counter() - start
+    return {"sequential_s": sequential, "engine_s": fanned_out, "cached_s": cached,
+            "cells_per_s": len(totals) / fanned_out}
+
+
+def sharded_lead_pull() -> dict[str, float]:
+    """Every one of 3000 lead stubs, 100 to a page with 100 ms of latency: one page at a time, with two pages
+    prefetched, and as eight milestone shards each prefetching a page."""
+    leads = 3000
+    method = FindLeads(limit=100)
+    with MockNutshell(leads=leads, activities=0, users=10, latency=LATENCY * 10, record_requests=False) as server:
+        with NutshellAPI("user", password="key") as api:
+            api.URL = server.url
+            serial = time_repeated(lambda: list(api.paginate(method, prefetch=0)), repeat=3)["best_s"]
+            prefetched = time_repeated(lambda: list(api.paginate(method, prefetch=2)), repeat=3)["best_s"]
+            sharded = time_repeated(ShardedFindLeads(api, method, by="milestone", values=range(1, 9)).fetch,
+                                    repeat=3)["best_s"]
+    return {"serial_s": serial, "prefetch_s": prefetched, "sharded_s": sharded, "sharded_leads_per_s": leads / sharded}
+
+
+def adaptive_page_size() -> dict[str, float]:
+    """3000 lead stubs from pages of 50, fixed or adaptive up to 500, and the page size chosen for activities with
+    4 kB descriptions (and their lead's) under a 200 kB budget, where a fixed page of 250 is several MB."""
+    leads = 3000
+    results = {}
+    with MockNutshell(leads=leads, activities=0, users=10, latency=LATENCY * 5) as server:
+        for mode, adaptive_paging in (("fixed", None), ("adaptive", AdaptivePageSize(max_limit=500))):
+            with NutshellAPI("user", password="key", adaptive_paging=adaptive_paging) as api:
+                api.URL = server.url
+                server.requests.clear()
+                start = time.perf_counter()
+                list(api.paginate(FindLeads(limit=50), prefetch=0))
+                results[f"stubs_{mode}_s"] = time.perf_counter() - start
+                results[f"stubs_{mode}_requests"] = len(server.requests)
+    adaptive = AdaptivePageSize(max_bytes=200_000)
+    with MockNutshell(leads=100, activities=500, users=10, description_size=4000, latency=LATENCY * 5) as server:
+        with NutshellAPI("user", password="key", adaptive_paging=adaptive) as api:
+            api.URL = server.url
+            pages = Paginator(api, FindActivities(limit=250, stub_responses=False), prefetch=0, raw=True).pages()
+            for _ in api._background_loop().iterate(pages):
+                pass
+    activities = adaptive.stats["findActivities"]
+    return {**results, "activities_limit": activities.limit,
+            "activities_page_bytes": activities.limit * activities.bytes_per_entity}
+
+
+BENCHMARKS = {
+    "call_api_throughput": call_api_throughput,
+    "call_api_batched_throughput": call_api_batched_throughput,
+    "per_call_latency": per_call_latency,
+    "map_results_leads": map_results_leads,
+    "map_results_activities": map_results_activities,
+    "map_results_activities_lazy": map_results_activities_lazy,
+    "parsed_page_memory": parsed_page_memory,
+    "pipeline_value_by_milestone": pipeline_value_by_milestone,
+    "bulk_edit_throughput": bulk_edit_throughput,
+    "threaded_call_throughput": threaded_call_throughput,
+    "loop_latency_while_parsing": loop_latency_while_parsing,
+    "analytics_grid": analytics_grid,
+    "sharded_lead_pull": sharded_lead_pull,
+    "adaptive_page_size": adaptive_page_size,
+}
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
@@ -0,0 +1,45 @@
+"""
+Benchmarks of the response decode paths on large findLeads and findActivities pages: stdlib json plus validation of
+the dict, orjson plus validation of the dict, and pydantic model_validate_json straight from the bytes.
+"""
+
+import json
+
+from benchmarks.harness import main, time_repeated
+from nutshell.decoding import get_decoder
+from nutshell.methods import FindActivities, FindLeads
+from nutshell.mock_server import MockNutshell
+
+PAGE_SIZE = 2000
+
+
+def _page_bytes(method) -> bytes:
+    server = MockNutshell(leads=PAGE_SIZE, activities=PAGE_SIZE, users=50, description_size=500)
+    return json.dumps({"id": "1", "jsonrpc": "2.0",
+                       "result": server.respond(method.api_method, method.params)}).encode()
+
+
+def _decode_benchmarks(label: str, method) -> dict:
+    response_class = method.response_class
+    body = _page_bytes(method)
+
+    def via(decoder_name: str):
+        def bench() -> dict[str, float]:
+            if decoder_name == "pydantic":
+                timing = time_repeated(lambda: response_class.model_validate_json(body))
+            else:
+                decoder = get_decoder(decoder_name)
+                timing = time_repeated(lambda: response_class(**decoder.loads(body)))
+            return {"mb_per_s": len(body) / 1e6 / timing["best_s"], **timing, "payload_bytes": len(body)}
+        return bench
+
+    return {f"decode_{label}_{name}": via(name) for name in ("json", "orjson", "pydantic")}
+
+
+BENCHMARKS = {
+    **_decode_benchmarks("leads", FindLeads(limit=PAGE_SIZE, stub_responses=False)),
+    **_decode_benchmarks("activities", FindActivities(limit=PAGE_SIZE, stub_responses=False)),
+}
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
@@ -0,0 +1,58 @@
+"""
+Benchmarks of cold start: the time a fresh interpreter takes to import the package and get to its first parsed
+response, net of interpreter startup, for short-lived CLI and serverless invocations.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import main
+from nutshell.mock_server import MockNutshell
+
+REPEAT = 7
+
+_GET_LEAD_BODY = json.dumps({"result": MockNutshell(leads=1, activities=1, users=2).leads[0]})
+
+# scenario -> code run in a fresh interpreter
+SCENARIOS = {
+    "import_package": "import nutshell",
+    "import_client": "from nutshell import NutshellAPI",
+    "import_methods": "from nutshell.methods import FindLeads, GetLead",
+    "first_lead_parsed": f"from nutshell.methods import GetLead\n"
+                         f"GetLead.response_class.model_validate_json({_GET_LEAD_BODY!r})",
+}
+
+_REPORT = ("\nimport sys\nprint(int('aiohttp' in sys.modules), len([name for name in sys.modules if "
+           "name.startswith('nutshell')]))")
+
+
+def _run(code: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output
+
+
+def _startup() -> float:
+    return min(_run("pass")[0] for _ in range(REPEAT))
+
+
+def _scenario(code: str):
+    def bench() -> dict[str, float]:
+        startup = _startup()
+        timings, output = [], ""
+        for _ in range(REPEAT):
+            elapsed, output = _run(code + _REPORT)
+            timings.append(elapsed - startup)
+        aiohttp_loaded, modules = output.split()
+        return {"best_s": min(timings), "median_s": statistics.median(timings),
+                "aiohttp_loaded": int(aiohttp_loaded), "nutshell_modules": int(modules)}
+    return bench
+
+
+BENCHMARKS = {f"cold_{name}": _scenario(code) for name, code in SCENARIOS.items()}
+
+if __name__ == "__main__":
+    main(BENCHMARKS)
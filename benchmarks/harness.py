@@ -0,0 +1,83 @@
+"""
+Shared helpers for the benchmark modules: timing, percentiles, JSON output and regression comparison.
+
+Each benchmark is a function returning a dict of metrics. Metrics named ``*_per_s`` are rates where higher is better;
+every other metric is a cost (seconds or bytes) where lower is better.
+
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable
+
+Benchmark = Callable[[], dict[str, float]]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def time_repeated(func: Callable[[], object], repeat: int = 5) -> dict[str, float]:
+    """Runs func ``repeat`` times and returns the best and median wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"best_s": min(timings), "median_s": statistics.median(timings)}
+
+
+def run(benchmarks: dict[str, Benchmark], selected: list[str] = None) -> dict:
+    results = {}
+    for name, benchmark in benchmarks.items():
+        if selected and name not in selected:
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = benchmark()
+    return {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+
+
+def regressions(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Describes every metric in current which is worse than baseline by more than ``threshold`` (a fraction)."""
+    found = []
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            previous = baseline.get("results", {}).get(name, {}).get(metric)
+            if not previous:
+                continue
+            change = (previous - value) / previous if metric.endswith("_per_s") else (value - previous) / previous
+            if change > threshold:
+                found.append(f"{name}.{metric}: {previous:.6g} -> {value:.6g} ({change:+.0%})")
+    return found
+
+
+def main(benchmarks: dict[str, Benchmark]):
+    parser = argparse.ArgumentParser(description="Run nutshell benchmarks against the local mock server")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--output", help="write results as JSON to this file instead of stdout")
+    parser.add_argument("--compare", help="baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction")
+    args = parser.parse_args()
+
+    results = run(benchmarks, args.names)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            found = regressions(json.load(f), results, args.threshold)
+        for regression in found:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if found:
+            sys.exit(1)
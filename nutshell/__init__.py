@@ -11,6 +11,36 @@ The methods module provides classes for the JSON-RPC API methods, such as FindUs
 The responses module provides classes for the various API responses, such as FindUsersResult, GetUserResult,
 GetAnalyticsReportResult, etc.
 
+NutshellAPI and the submodules are imported on first access, so importing the package alone stays cheap for
+short-lived scripts.
+
 """
 
-from .nutshell_api import NutshellAPI
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .nutshell_api import NutshellAPI
+
+__all__ = ["NutshellAPI"]
+
+# attribute -> submodule defining it
+_LAZY_ATTRIBUTES = {"NutshellAPI": "nutshell_api"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
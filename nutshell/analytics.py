@@ -0,0 +1,177 @@
+"""
+This module fans GetAnalyticsReport out over a grid of entities and periods and collects the series into NumPy arrays.
+
+Each cell of a grid is one report: an entity (a user, team or activity type, a tuple of them combined as filters, or
+None for the whole account) over one period. Reports are fetched ``concurrency`` at a time and each series is loaded
+from the response JSON straight into an array of ``(timestamp, value)`` rows, without building models.
+``ReportGrid.values`` holds the total of every series as an entities × periods × metrics array::
+
+    engine = AnalyticsEngine(api)
+    grid = engine.grid(users, ["-d7", "-d30"])
+    weekly_effort = grid.values[:, 0, grid.metrics.index("total_effort")]
+
+Fetched series are cached per report type, filters, period and options, so a grid overlapping an earlier one only
+fetches its new cells. Relative periods such as ``-d7`` move with time, and ``ttl`` bounds how long a cached cell is
+reused.
+
+NumPy is required (``pip install "nutshell[numpy]"``).
+
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+from nutshell.entities import ActivityType, AnalyticsReportType, Team, User
+from nutshell.methods import GetAnalyticsReport
+
+if TYPE_CHECKING:
+    import numpy
+    from nutshell.nutshell_api import NutshellAPI
+
+Filter = User | Team | ActivityType
+Entity = Optional[Filter | tuple[Filter, ...]]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError('AnalyticsEngine requires the numpy package: pip install "nutshell[numpy]"') from error
+    return numpy
+
+
+def _filters(entity: Entity) -> list[Filter]:
+    if entity is None:
+        return []
+    return list(entity) if isinstance(entity, tuple) else [entity]
+
+
+def label(entity: Entity) -> str:
+    """``"<entityType>:<id>"`` of an entity, filters of a tuple joined by ``+``, or ``"all"`` for None."""
+    return "+".join(f"{item.entity_type}:{item.id}" for item in _filters(entity)) or "all"
+
+
+@dataclass
+class ReportGrid:
+    """Report totals over a grid of entities and periods, with the series behind them.
+
+    Attributes
+    ----------
+    entities : the grid's entities, in the order of the first axis.
+    labels : the entities' labels (see ``label``).
+    periods : the periods, in the order of the second axis.
+    metrics : the series names (such as ``total_effort``), in the order of the third axis.
+    values : entities × periods × metrics float64 array of series totals, NaN where the report failed.
+    series : (entity index, period index) -> metric -> array of (timestamp in ms, value) rows.
+    errors : (entity index, period index) -> the error the cell's report failed with.
+    fetched : reports fetched from the API for this grid.
+    cached : reports answered from the engine's cache.
+    """
+    entities: list[Entity]
+    labels: list[str]
+    periods: list[str]
+    metrics: list[str]
+    values: "numpy.ndarray"
+    series: dict[tuple[int, int], dict[str, "numpy.ndarray"]] = field(default_factory=dict)
+    errors: dict[tuple[int, int], Exception] = field(default_factory=dict)
+    fetched: int = 0
+    cached: int = 0
+
+    def value(self, entity: Entity | str, period: str, metric: str) -> float:
+        """Total of one cell, the entity given as itself or its label."""
+        row = self.labels.index(entity if isinstance(entity, str) else label(entity))
+        return float(self.values[row, self.periods.index(period), self.metrics.index(metric)])
+
+
+class AnalyticsEngine:
+    """Fetches analytics reports over grids of entities and periods, caching every fetched cell.
+
+    Attributes
+    ----------
+    report_type : the report fetched for every cell.
+    concurrency : reports in flight at once.
+    ttl : seconds a cached cell is reused, or None to reuse it until ``clear``.
+    hits : reports answered from the cache.
+    misses : reports fetched from the API.
+    """
+
+    def __init__(self, api: "NutshellAPI", report_type: AnalyticsReportType = AnalyticsReportType.EFFORT,
+                 concurrency: int = 10, ttl: float = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        _numpy()
+        self.api = api
+        self.report_type = report_type
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache: dict[tuple, tuple[float, dict[str, "numpy.ndarray"]]] = {}
+
+    def clear(self):
+        self._cache.clear()
+
+    def grid(self, entities: Iterable[Entity], periods: Sequence[str], filters: Sequence[Filter] = (),
+             options: list[dict] = None) -> ReportGrid:
+        """Fetches the report for every entity and period, each with ``filters`` applied as well."""
+        return self.api._background_loop().run(self.agrid(entities, periods, filters, options))
+
+    async def agrid(self, entities: Iterable[Entity], periods: Sequence[str], filters: Sequence[Filter] = (),
+                    options: list[dict] = None) -> ReportGrid:
+        numpy = _numpy()
+        entities, periods = list(entities), list(periods)
+        cells, calls = {}, {}
+        extra = {"options": options} if options else {}
+        for row, entity in enumerate(entities):
+            for column, period in enumerate(periods):
+                cell_filters = [*filters, *_filters(entity)]
+                key = cells[row, column] = self._key(cell_filters, period, options)
+                calls.setdefault(key, GetAnalyticsReport(report_type=self.report_type, period=period,
+                                                         filters=cell_filters or None, **extra))
+        now = time.time()
+        missing = [key for key in calls if key not in self._cache
+                   or (self.ttl is not None and now - self._cache[key][0] >= self.ttl)]
+        self.hits += len(calls) - len(missing)
+        self.misses += len(missing)
+
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(call: GetAnalyticsReport) -> dict[str, "numpy.ndarray"] | Exception:
+            async with slots:
+                try:
+                    return await self._fetch(call)
+                except Exception as error:
+                    return error
+
+        errors = {}
+        for key, result in zip(missing, await asyncio.gather(*(bounded(calls[key]) for key in missing))):
+            if isinstance(result, Exception):
+                errors[key] = result
+                self._cache.pop(key, None)
+            else:
+                self._cache[key] = (now, result)
+
+        series = {cell: self._cache[key][1] for cell, key in cells.items() if key not in errors}
+        metrics = list(dict.fromkeys(metric for cell_series in series.values() for metric in cell_series))
+        grid = ReportGrid(entities, [label(entity) for entity in entities], periods, metrics,
+                          numpy.full((len(entities), len(periods), len(metrics)), numpy.nan), series,
+                          {cell: errors[key] for cell, key in cells.items() if key in errors},
+                          fetched=len(missing), cached=len(calls) - len(missing))
+        for (row, column), cell_series in series.items():
+            for index, metric in enumerate(metrics):
+                if metric in cell_series:
+                    grid.values[row, column, index] = cell_series[metric][:, 1].sum()
+        return grid
+
+    def _key(self, filters: list[Filter], period: str, options: Optional[list[dict]]) -> tuple:
+        return (self.report_type.value, period, tuple((item.entity_type, item.id) for item in filters),
+                json.dumps(options, sort_keys=True))
+
+    async def _fetch(self, call: GetAnalyticsReport) -> dict[str, "numpy.ndarray"]:
+        numpy = _numpy()
+        (report,) = await self.api._fetch_raw([call])
+        return {metric: numpy.asarray(rows, dtype=numpy.float64).reshape(-1, 2)
+                for metric, rows in report["seriesData"].items()}
@@ -0,0 +1,222 @@
+"""
+This module runs bulk edits of leads or activities, resolving rev conflicts item by item.
+
+Each edit is an ``(id, patch)`` pair, where the patch is the dict of fields sent with EditLead or EditActivity, or a
+function building that dict from the current entity (for changes which depend on it, such as adding a tag). Edits
+run concurrently up to a limit. The rev sent with each edit comes from ``revs`` when given (e.g. from a Mirror), the
+client's entity cache, or a Get* call. When the API answers that the rev is out of date, only that item refetches
+the entity and applies its patch again; the rest carry on.
+
+EditPlanner turns a fetched entity and a desired state into the smallest Edit* call, keyed by the API's field names,
+or no call at all when nothing differs. BulkEditor plans every edit for which it has the entity, so no-op edits never
+reach the API.
+
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Optional
+
+from pydantic import BaseModel
+
+from nutshell.entities import Activity, Lead
+from nutshell.exceptions import NutshellRPCError
+from nutshell.lazy import LazyEntity
+from nutshell.methods import _APIMethod, EditActivity, EditLead, GetActivity, GetLead
+from nutshell.responses import _APIResponse
+
+if TYPE_CHECKING:
+    from nutshell.nutshell_api import NutshellAPI
+
+Patch = dict | BaseModel | Callable[[BaseModel], dict | BaseModel]
+
+# kind -> (entity type in the entity cache, Get* call for an id, Edit* call for an id, rev and patch)
+_EDITABLE: dict[str, tuple[str, Callable[[int], _APIMethod], Callable[[int, str, dict], _APIMethod]]] = {
+    "leads": ("Leads", lambda lead_id: GetLead(lead_id=lead_id),
+              lambda lead_id, rev, patch: EditLead(lead_id=lead_id, rev=rev, lead=patch)),
+    "activities": ("Activities", lambda activity_id: GetActivity(activity_id=activity_id),
+                   lambda activity_id, rev, patch: EditActivity(activity_id=activity_id, rev=rev, activity=patch)),
+}
+_KIND_OF_MODEL = {Lead: "leads", Activity: "activities"}
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    if isinstance(value, dict):
+        return {key: _dump(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_dump(item) for item in value]
+    return value
+
+
+def _model(entity: Any) -> Any:
+    """The model behind a LazyEntity, so planning works whatever the client's parse mode; anything else as it is."""
+    return entity.model() if isinstance(entity, LazyEntity) else entity
+
+
+def _same(current: Any, desired: Any) -> bool:
+    """Whether sending ``desired`` would leave ``current`` as it is. Dicts match when every key sent already has that
+    value, so a reference such as ``{"entityType": "Users", "id": 3}`` matches the full user it refers to."""
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(key in current and _same(current[key], item)
+                                                 for key, item in desired.items())
+    if isinstance(desired, list):
+        return (isinstance(current, list) and len(current) == len(desired)
+                and all(_same(current_item, item) for current_item, item in zip(current, desired)))
+    return current == desired
+
+
+class EditPlanner:
+    """Builds minimal EditLead and EditActivity calls, counting the writes and fields left out.
+
+    Attributes
+    ----------
+    planned : Edit* calls built.
+    avoided : edits skipped because the entity already had the desired state.
+    fields_dropped : fields left out of the calls built because they already had the desired value.
+    """
+
+    def __init__(self):
+        self.planned = 0
+        self.avoided = 0
+        self.fields_dropped = 0
+
+    @staticmethod
+    def changes(entity: BaseModel, desired: dict | BaseModel) -> dict[str, Any]:
+        """The fields of ``desired`` which differ from ``entity``, keyed by alias. ``desired`` is a dict keyed by
+        field names or aliases, or a model of which only the fields set are compared."""
+        entity, desired = _model(entity), _model(desired)
+        model = type(entity)
+        if isinstance(desired, BaseModel):
+            desired = {name: getattr(desired, name) for name in desired.model_fields_set}
+        current = entity.model_dump(mode="json", by_alias=True)
+        changed = {}
+        for key, value in desired.items():
+            field = model.model_fields.get(key)
+            alias = (field.alias or key) if field is not None else key
+            value = _dump(value)
+            if alias not in current or not _same(current[alias], value):
+                changed[alias] = value
+        return changed
+
+    def edit(self, entity: Lead | Activity | LazyEntity, desired: dict | BaseModel) -> Optional[_APIMethod]:
+        """The Edit* call bringing the entity to the desired state at its current rev, or None if it already is."""
+        entity, desired = _model(entity), _model(desired)
+        kind = _KIND_OF_MODEL.get(type(entity))
+        if kind is None:
+            raise TypeError(f"{type(entity).__name__} cannot be edited")
+        requested = len(desired.model_fields_set) if isinstance(desired, BaseModel) else len(desired)
+        changes = self.changes(entity, desired)
+        self.fields_dropped += requested - len(changes)
+        if not changes:
+            self.avoided += 1
+            return None
+        self.planned += 1
+        _, _, edit_call = _EDITABLE[kind]
+        return edit_call(entity.id, entity.rev, changes)
+
+
+@dataclass
+class EditOutcome:
+    """Result of one edit of a bulk run.
+
+    Attributes
+    ----------
+    entity_id : id of the edited lead or activity.
+    response : the Edit* response, holding the updated entity, when the edit succeeded.
+    error : the error the edit failed with otherwise.
+    attempts : Edit* calls made for the item.
+    conflicts : rev conflicts resolved (or hit, if the item ran out of attempts).
+    skipped : the entity already had the desired state, so no Edit* call was needed.
+    """
+    entity_id: int
+    response: Optional[_APIResponse] = None
+    error: Optional[Exception] = None
+    attempts: int = 0
+    conflicts: int = 0
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None or self.skipped
+
+
+class BulkEditor:
+    """Edits many leads or activities with bounded concurrency and per-item rev conflict resolution.
+
+    Attributes
+    ----------
+    kind : ``"leads"`` or ``"activities"``.
+    concurrency : edits in flight at once.
+    max_attempts : Edit* calls per item before a persisting rev conflict is reported as its error.
+    planner : EditPlanner shrinking each edit for which the entity is at hand (cached or fetched) to the fields which
+        differ, and skipping it when none do; its counters show the writes avoided. None sends patches as given.
+    """
+
+    def __init__(self, api: "NutshellAPI", kind: str = "leads", concurrency: int = 20, max_attempts: int = 3,
+                 minimal: bool = True):
+        if kind not in _EDITABLE:
+            raise ValueError(f"Unknown kind {kind!r}, expected one of {', '.join(_EDITABLE)}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.api = api
+        self.kind = kind
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.planner = EditPlanner() if minimal else None
+        self._entity_type, self._get_call, self._edit_call = _EDITABLE[kind]
+
+    def run(self, edits: Iterable[tuple[int, Patch]], revs: Mapping[int, str] = None) -> list[EditOutcome]:
+        """Runs the edits and returns their outcomes in the same order. Failures are reported, not raised."""
+        return self.api._background_loop().run(self.arun(edits, revs))
+
+    async def arun(self, edits: Iterable[tuple[int, Patch]], revs: Mapping[int, str] = None) -> list[EditOutcome]:
+        slots = asyncio.Semaphore(self.concurrency)
+        revs = revs or {}
+
+        async def bounded(entity_id: int, patch: Patch) -> EditOutcome:
+            async with slots:
+                return await self._edit(entity_id, patch, revs.get(entity_id))
+
+        return list(await asyncio.gather(*(bounded(entity_id, patch) for entity_id, patch in edits)))
+
+    def _cached(self, entity_id: int) -> Optional[BaseModel]:
+        if self.api.entity_cache is None:
+            return None
+        return self.api.entity_cache.get(self._entity_type, entity_id)
+
+    async def _fetch(self, entity_id: int) -> BaseModel:
+        if self.api.entity_cache is not None:
+            self.api.entity_cache.invalidate(self._entity_type, entity_id)
+        return (await self.api.acall(self._get_call(entity_id))).result
+
+    async def _edit(self, entity_id: int, patch: Patch, rev: Optional[str]) -> EditOutcome:
+        outcome = EditOutcome(entity_id)
+        entity = None
+        try:
+            while True:
+                if callable(patch) or rev is None:
+                    entity = entity or self._cached(entity_id) or await self._fetch(entity_id)
+                elif self.planner is not None:
+                    entity = entity or self._cached(entity_id)
+                changes = patch(entity) if callable(patch) else patch
+                if self.planner is not None and entity is not None:
+                    call = self.planner.edit(entity, changes)
+                    if call is None:
+                        outcome.skipped = True
+                        return outcome
+                else:
+                    call = self._edit_call(entity_id, entity.rev if entity is not None else rev, _dump(changes))
+                outcome.attempts += 1
+                try:
+                    outcome.response = await self.api.acall(call)
+                    return outcome
+                except NutshellRPCError as error:
+                    if not error.is_rev_conflict or outcome.attempts >= self.max_attempts:
+                        raise
+                    outcome.conflicts += 1
+                    entity = await self._fetch(entity_id)
+        except Exception as error:
+            outcome.error = error
+            return outcome
@@ -0,0 +1,110 @@
+"""
+This module contains the in-process entity cache used by NutshellAPI to answer GetLead, GetActivity and GetUser calls
+without contacting the API.
+
+Entities are keyed by ``(entity_type, id)`` and kept with their ``rev``. Fresh entities returned by Get*, EditLead and
+EditActivity calls replace older revisions, and DeleteActivity drops the deleted activity.
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from pydantic import BaseModel
+
+from nutshell.methods import _APIMethod
+from nutshell.responses import _APIResponse, GetLeadResult, GetActivityResult, GetUserResult
+
+# api_method -> (entity type, method field holding the entity id, response class)
+_CACHEABLE_GETS = {
+    "getLead": ("Leads", "lead_id", GetLeadResult),
+    "getActivity": ("Activities", "activity_id", GetActivityResult),
+    "getUser": ("Users", "user_id", GetUserResult),
+}
+_STORED_RESULTS = {"getLead", "getActivity", "getUser", "editLead", "editActivity"}
+
+
+def _is_older(rev: str, than: str) -> bool:
+    """Revs are numeric strings; anything else is never considered older."""
+    return rev.isdigit() and than.isdigit() and int(rev) < int(than)
+
+
+class EntityCache:
+    """LRU cache of parsed entities, each expiring ``ttl`` seconds after it was stored.
+
+    Attributes
+    ----------
+    max_entries : entities kept before the least recently used is evicted.
+    ttl : seconds an entity is served from the cache, or None to keep it until evicted.
+    hits : Get* calls answered from the cache.
+    misses : cacheable Get* calls which had to go to the API.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: Optional[float] = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, int], tuple[float, BaseModel]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, entity_type: str, entity_id: int) -> Optional[BaseModel]:
+        """Returns the cached entity if present and fresh."""
+        key = (entity_type, entity_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, entity = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entity
+
+    def put(self, entity: BaseModel):
+        """Stores an entity, unless a newer revision of it is already cached."""
+        key = (entity.entity_type, entity.id)
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and _is_older(entity.rev, current[1].rev):
+                return
+            self._entries[key] = (time.monotonic(), entity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, entity_type: str, entity_id: int):
+        with self._lock:
+            self._entries.pop((entity_type, entity_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def lookup(self, call: _APIMethod) -> Optional[_APIResponse]:
+        """Returns a response for a cacheable Get* call when the entity is cached, otherwise None."""
+        if call.api_method not in _CACHEABLE_GETS:
+            return None
+        entity_type, id_field, response_class = _CACHEABLE_GETS[call.api_method]
+        entity_id = getattr(call, id_field)
+        if entity_id is None:  # e.g. GetUser for the current user
+            return None
+        entity = self.get(entity_type, entity_id)
+        if entity is None or getattr(call, "rev", None) not in (None, entity.rev):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return response_class.model_construct(result=entity)
+
+    def update(self, call: _APIMethod, response: _APIResponse):
+        """Stores or drops entities according to the response to a call."""
+        if call.api_method in _STORED_RESULTS:
+            self.put(response.result)
+        elif call.api_method == "deleteActivity" and response.result:
+            self.invalidate("Activities", call.activity_id)
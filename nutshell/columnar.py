@@ -0,0 +1,134 @@
+"""
+This module provides columnar (struct-of-arrays) tables of leads and activities for analytics.
+
+A table keeps each field as one contiguous ``array.array`` built straight from the response JSON, without creating
+a model per entity. Ids, statuses and timestamps (as epoch seconds) are int64 columns, amounts are float64 and flags
+are int8. Values missing from an entity, as in stub responses, are ``MISSING`` (the smallest int64, outside the
+values of every column: -1 is the OVERDUE activity status and negative epochs are dates before 1970) in integer
+columns and NaN in float columns.
+
+``to_numpy()`` returns the columns as NumPy arrays sharing the same memory, for vectorized filters and aggregations::
+
+    leads = api.columns(FindLeads(limit=500, stub_responses=False)).to_numpy()
+    open_pipeline = leads["value_amount"][leads["status"] == 0].sum()
+
+NumPy is optional and only needed for ``to_numpy`` (``pip install "nutshell[numpy]"``).
+
+"""
+
+import math
+from array import array
+from datetime import datetime
+from typing import Any, Callable, ClassVar, Optional
+
+MISSING = -2**63
+
+# array typecode -> NumPy dtype of the same layout
+_DTYPES = {"q": "int64", "d": "float64", "b": "int8"}
+
+
+def _epoch(timestamp: Optional[str]) -> int:
+    """Nutshell timestamps (e.g. 2024-04-03T00:24:02+0000) as epoch seconds."""
+    if not timestamp:
+        return MISSING
+    return int(datetime.fromisoformat(timestamp).timestamp())
+
+
+def _nested_id(nested: Optional[dict]) -> int:
+    return nested["id"] if nested else MISSING
+
+
+def _amount(money: Optional[dict]) -> float:
+    if not isinstance(money, dict) or money.get("amount") is None:
+        return math.nan
+    return float(money["amount"])
+
+
+def _int(value: Any) -> int:
+    return MISSING if value is None else int(value)
+
+
+def _flag(value: Any) -> int:
+    return int(bool(value))
+
+
+class _ColumnTable:
+    """Base for tables of one entity type. ``COLUMNS`` maps each column name to its typecode, the entity key it is
+    read from and the extractor converting the value of that key."""
+    COLUMNS: ClassVar[dict[str, tuple[str, str, Callable[[Any], Any]]]] = {}
+
+    def __init__(self, columns: Optional[dict[str, array]] = None):
+        if columns is None:
+            columns = {name: array(typecode) for name, (typecode, _, _) in self.COLUMNS.items()}
+        self._columns = columns
+
+    @classmethod
+    def from_json(cls, entities: list[dict]) -> "_ColumnTable":
+        """Builds the table from the raw entities of a Find* result."""
+        return cls({name: array(typecode, [extract(entity.get(key)) for entity in entities])
+                    for name, (typecode, key, extract) in cls.COLUMNS.items()})
+
+    def extend(self, other: "_ColumnTable"):
+        """Appends the rows of another table of the same type."""
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot extend {type(self).__name__} with {type(other).__name__}")
+        for name, column in self._columns.items():
+            column.extend(other._columns[name])
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._columns)
+
+    def __getitem__(self, name: str) -> array:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self._columns["id"])
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Returns the columns as NumPy arrays which share memory with this table."""
+        try:
+            import numpy
+        except ImportError as error:
+            raise ImportError('to_numpy requires the numpy package: pip install "nutshell[numpy]"') from error
+        return {name: numpy.frombuffer(column, dtype=_DTYPES[column.typecode]) if column else
+                numpy.empty(0, dtype=_DTYPES[column.typecode]) for name, column in self._columns.items()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} rows: {', '.join(self._columns)})"
+
+
+class LeadColumns(_ColumnTable):
+    """Columnar table of leads."""
+    COLUMNS = {
+        "id": ("q", "id", _int),
+        "status": ("q", "status", _int),
+        "confidence": ("q", "confidence", _int),
+        "milestone_id": ("q", "milestone", _nested_id),
+        "stageset_id": ("q", "stageset", _nested_id),
+        "assignee_id": ("q", "assignee", _nested_id),
+        "created_time": ("q", "createdTime", _epoch),
+        "due_time": ("q", "dueTime", _epoch),
+        "value_amount": ("d", "value", _amount),
+        "normalized_value_amount": ("d", "normalizedValue", _amount),
+    }
+
+
+class ActivityColumns(_ColumnTable):
+    """Columnar table of activities."""
+    COLUMNS = {
+        "id": ("q", "id", _int),
+        "status": ("q", "status", _int),
+        "activity_type_id": ("q", "activityType", _nested_id),
+        "lead_id": ("q", "lead", _nested_id),
+        "start_time": ("q", "startTime", _epoch),
+        "end_time": ("q", "endTime", _epoch),
+        "is_flagged": ("b", "isFlagged", _flag),
+    }
+
+
+# api_method -> table its results can be collected into
+COLUMN_TABLES: dict[str, type[_ColumnTable]] = {
+    "findLeads": LeadColumns,
+    "findActivities": ActivityColumns,
+}
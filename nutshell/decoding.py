@@ -0,0 +1,77 @@
+"""
+This module contains the pluggable JSON decoders NutshellAPI uses for response bodies.
+
+- ``json``: the standard library decoder (the default).
+- ``orjson``: the orjson decoder, requires the optional ``orjson`` package (``pip install "nutshell[orjson]"``).
+- ``pydantic``: hands the raw bytes of a single-call response straight to the response class's
+  ``model_validate_json``, so no intermediate Python dict is built. Batch responses must be split by request id, so
+  they are decoded with orjson when installed and the standard library otherwise.
+
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class RawResponse:
+    """Undecoded body of a response, parsed later directly into its response class. ``request_id`` picks the call's
+    response out of a batch body; it is None for a single-call body."""
+    body: bytes
+    request_id: Optional[str] = None
+
+
+class Decoder:
+    """Decodes response bodies. ``defers_single`` decoders leave single-call bodies as RawResponse."""
+    name = "json"
+    defers_single = False
+
+    def loads(self, body: bytes) -> Any:
+        return json.loads(body)
+
+
+class OrjsonDecoder(Decoder):
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as error:
+            raise ImportError('The orjson decoder requires the orjson package: '
+                              'pip install "nutshell[orjson]"') from error
+        self._loads = orjson.loads
+
+    def loads(self, body: bytes) -> Any:
+        return self._loads(body)
+
+
+class PydanticDecoder(Decoder):
+    name = "pydantic"
+    defers_single = True
+
+    def __init__(self):
+        try:
+            self._fallback = OrjsonDecoder()
+        except ImportError:
+            self._fallback = Decoder()
+
+    def loads(self, body: bytes) -> Any:
+        return self._fallback.loads(body)
+
+
+DECODERS: dict[str, type[Decoder]] = {
+    "json": Decoder,
+    "orjson": OrjsonDecoder,
+    "pydantic": PydanticDecoder,
+}
+
+
+def get_decoder(decoder: str | Decoder) -> Decoder:
+    """Returns a decoder instance from a decoder or the name of one."""
+    if isinstance(decoder, Decoder):
+        return decoder
+    try:
+        return DECODERS[decoder]()
+    except KeyError:
+        raise ValueError(f"Unknown decoder {decoder!r}, expected one of {', '.join(DECODERS)}") from None
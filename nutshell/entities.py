@@ -7,7 +7,7 @@ from __future__ import annotations
 from enum import StrEnum, IntEnum
 from typing import Optional
 
-from pydantic import BaseModel, computed_field, Field
+from pydantic import BaseModel, ConfigDict, computed_field, Field
 
 
 class AnalyticsReportType(StrEnum):
@@ -78,7 +78,13 @@ class ActivityStatus(IntEnum):
     OVERDUE = -1
 
 
-class User(BaseModel):
+class _Model(BaseModel):
+    """Base of the package's models. Validation schemas are built on first use rather than at import, so only the
+    models a program uses are compiled."""
+    model_config = ConfigDict(defer_build=True)
+
+
+class User(_Model):
     """Model of a Nutshell User"""
     stub: bool = None
     id: int
@@ -94,7 +100,7 @@ class User(BaseModel):
     created_time: str = Field(..., alias="createdTime")
 
 
-class Team(BaseModel):
+class Team(_Model):
     """Model of a Nutshell Team"""
     stub: bool
     id: int
@@ -105,7 +111,7 @@ class Team(BaseModel):
     created_time: str = Field(..., alias="createdTime")
 
 
-class ActivityType(BaseModel):
+class ActivityType(_Model):
     """Model of a Nutshell Activity Type"""
     stub: bool
     id: int
@@ -115,13 +121,13 @@ class ActivityType(BaseModel):
     deleted_time: Optional[str] = Field(None, alias="deletedTime")
 
 
-class TimeSeriesData(BaseModel):
+class TimeSeriesData(_Model):
     """Model of the Time Series Data for an Analytics Report"""
     total_effort: list[list[int]]
     successful_effort: list[list[int]]
 
 
-class SummaryData(BaseModel):
+class SummaryData(_Model):
     """Model of the Summary Data for an Analytics Report"""
     sum: float
     avg: float
@@ -133,7 +139,7 @@ class SummaryData(BaseModel):
     max_delta: float
 
 
-class AnalyticsReport(BaseModel):
+class AnalyticsReport(_Model):
     """Model for constructing a Nutshell Analytics Report"""
     series_data: TimeSeriesData = Field(..., alias="seriesData")
     summary_data: dict[str, SummaryData] = Field(..., alias="summaryData")
@@ -141,7 +147,7 @@ class AnalyticsReport(BaseModel):
     delta_period_description: str = Field(..., alias="deltaPeriodDescription")
 
 
-class Stageset(BaseModel):
+class Stageset(_Model):
     """Model of a Nutshell Stageset (Pipeline) """
     id: int
     entity_type: str = Field(..., alias="entityType", pattern=r"Stagesets")
@@ -150,7 +156,7 @@ class Stageset(BaseModel):
     position: Optional[int] = None
 
 
-class Milestone(BaseModel):
+class Milestone(_Model):
     """Model of a Nutshell Milestone"""
     id: int
     entity_type: str = Field(..., alias="entityType", pattern=r"Milestones")
@@ -160,7 +166,7 @@ class Milestone(BaseModel):
     stageset_id: Optional[int] = Field(None, alias="stagesetId")
 
 
-class Lead(BaseModel):
+class Lead(_Model):
     """Model of a Nutshell Lead"""
     stub: Optional[bool] = None
     id: int
@@ -185,7 +191,7 @@ class Lead(BaseModel):
     custom_fields: Optional[dict] = Field(None, alias="customFields")
 
 
-class Activity(BaseModel):
+class Activity(_Model):
     """Model of a Nutshell Activity"""
     id: int
     stub: Optional[bool] = None
@@ -212,7 +218,7 @@ class Activity(BaseModel):
     created_time: str = Field(..., alias="createdTime")
 
 
-class CreateActivity(BaseModel):
+class CreateActivity(_Model):
     """Minimal class for creating an activity in the Nutshell API. serialization_alias used as this class should only be
     used to create a new activity"""
 
@@ -228,7 +234,7 @@ class CreateActivity(BaseModel):
     participants: Optional[list] = None
 
 
-class FindLeadsQuery(BaseModel):
+class FindLeadsQuery(_Model):
     """Model for building a FindLeads query"""
     status: Optional[FindLeadsQueryStatus] = None
     filter: Optional[FindLeadsQueryFilter] = None
@@ -269,7 +275,7 @@ class FindLeadsQuery(BaseModel):
         return query_dict
 
 
-class FindActivitiesQuery(BaseModel):
+class FindActivitiesQuery(_Model):
     """Model for building a FindActivities query"""
     lead_id: Optional[int] = None
     contact_id: Optional[list[int]] = None
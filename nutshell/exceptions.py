@@ -0,0 +1,49 @@
+"""
+This module contains the exceptions raised by the NutshellAPI class.
+"""
+
+# JSON-RPC error code the API answers edits with when the rev sent is no longer the entity's current rev
+REV_CONFLICT = 409
+
+
+class NutshellAPIError(Exception):
+    """Base class for errors raised while calling the Nutshell API."""
+
+
+class NutshellHTTPError(NutshellAPIError):
+    """The API answered with an HTTP error status, optionally asking the client to wait ``retry_after`` seconds."""
+
+    def __init__(self, status: int, message: str = "", retry_after: float = None):
+        super().__init__(f"HTTP {status}: {message}" if message else f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class NutshellRPCError(NutshellAPIError):
+    """The API answered a call with a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str, data=None):
+        super().__init__(f"JSON-RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def __reduce__(self):  # errors are pickled back from process pool parsers
+        return type(self), (self.code, self.message, self.data)
+
+    @classmethod
+    def from_response(cls, error: dict) -> "NutshellRPCError":
+        return cls(error.get("code"), error.get("message", ""), error.get("data"))
+
+    @property
+    def is_rev_conflict(self) -> bool:
+        return self.code == REV_CONFLICT
+
+
+class CircuitOpenError(NutshellAPIError):
+    """The circuit breaker for an API method is open, so the call was failed without contacting the API."""
+
+    def __init__(self, api_method: str, retry_in: float):
+        super().__init__(f"circuit open for {api_method}, retry in {retry_in:.1f}s")
+        self.api_method = api_method
+        self.retry_in = retry_in
@@ -0,0 +1,229 @@
+"""
+This module contains the instrumentation hooks of NutshellAPI and an in-memory histogram collector for them.
+
+Every call made by a NutshellAPI with ``hooks`` is reported to each hook as a CallTiming, splitting its time into:
+
+- ``queue_wait``: waiting for an in-flight slot, a rate-limit token and a pooled connection;
+- ``connect``: opening a connection (DNS, TCP and TLS), zero when a pooled connection was reused;
+- ``first_byte``: from sending the request to receiving the response headers;
+- ``transfer``: reading the response body;
+- ``decode``: decoding the JSON body;
+- ``validation``: building the call's response model.
+
+The network timings come from an ``aiohttp.TraceConfig`` and, with the byte size and decode time, belong to the HTTP
+request, so every call of a batch reports the same values. Network-bound slowdowns show up in ``first_byte`` and
+``transfer``, CPU-bound ones in ``decode`` and ``validation``::
+
+    collector = HistogramCollector()
+    api = NutshellAPI(username, password, hooks=[collector])
+    ...
+    print(collector.export_text())
+
+"""
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+PHASES = ("queue_wait", "connect", "first_byte", "transfer", "decode", "validation")
+
+# upper bounds (le) of the histogram buckets
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+@dataclass(slots=True)
+class CallTiming:
+    """Where the time of one call went, in seconds.
+
+    Attributes
+    ----------
+    api_method : the call's API method.
+    batch_size : calls sent in the same HTTP request, which share its network timings and size.
+    response_bytes : size of the response body.
+    ok : whether the call got a response rather than an error.
+    """
+    api_method: str
+    batch_size: int = 1
+    queue_wait: float = 0.0
+    connect: float = 0.0
+    first_byte: float = 0.0
+    transfer: float = 0.0
+    response_bytes: int = 0
+    decode: float = 0.0
+    validation: float = 0.0
+    ok: bool = True
+
+
+Hook = Callable[[CallTiming], None]
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """Timings of one HTTP request, filled in by the trace callbacks and NutshellAPI as the request progresses.
+    ``latency`` runs from sending the request to reading its body, and is recorded with or without hooks."""
+    batch_size: int = 1
+    queue_wait: float = 0.0
+    connect: float = 0.0
+    first_byte: float = 0.0
+    transfer: float = 0.0
+    response_bytes: int = 0
+    latency: float = 0.0
+    decode: float = 0.0
+    _mark: float = 0.0
+    _sent_at: float = 0.0
+    _headers_at: float = 0.0
+
+    def body_read(self, size: int):
+        read_at = time.perf_counter()
+        self.transfer = read_at - self._headers_at
+        self.latency = read_at - self._sent_at
+        self.response_bytes = size
+
+    def timing(self, api_method: str, validation: float = 0.0, ok: bool = True) -> CallTiming:
+        return CallTiming(api_method, self.batch_size, self.queue_wait, self.connect, self.first_byte, self.transfer,
+                          self.response_bytes, self.decode, validation, ok)
+
+
+def _trace(context: Any) -> Optional[RequestTrace]:
+    trace = context.trace_request_ctx
+    return trace if isinstance(trace, RequestTrace) else None
+
+
+async def _request_start(session, context, params):
+    if trace := _trace(context):
+        trace._sent_at = time.perf_counter()
+
+
+async def _mark(session, context, params):
+    if trace := _trace(context):
+        trace._mark = time.perf_counter()
+
+
+async def _connection_queued_end(session, context, params):
+    if trace := _trace(context):
+        waited = time.perf_counter() - trace._mark
+        trace.queue_wait += waited
+        trace._sent_at += waited
+
+
+async def _connection_create_end(session, context, params):
+    if trace := _trace(context):
+        connected = time.perf_counter() - trace._mark
+        trace.connect += connected
+        trace._sent_at += connected
+
+
+async def _request_end(session, context, params):
+    if trace := _trace(context):
+        trace._headers_at = time.perf_counter()
+        trace.first_byte = trace._headers_at - trace._sent_at
+
+
+def trace_config() -> "aiohttp.TraceConfig":
+    """TraceConfig recording pool waits, connection setup and time to first byte into the request's RequestTrace,
+    passed as ``trace_request_ctx``."""
+    import aiohttp
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_request_start)
+    config.on_connection_queued_start.append(_mark)
+    config.on_connection_queued_end.append(_connection_queued_end)
+    config.on_connection_create_start.append(_mark)
+    config.on_connection_create_end.append(_connection_create_end)
+    config.on_request_end.append(_request_end)
+    return config
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram of observations, with counts per upper bound."""
+    bounds: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self):
+        self.counts = self.counts or [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf when it falls past the last bound)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class HistogramCollector:
+    """Hook keeping a histogram of every phase and of the response size per API method.
+
+    Attributes
+    ----------
+    histograms : (api_method, phase or ``"response_bytes"``) -> Histogram.
+    errors : api_method -> calls which failed.
+    """
+
+    def __init__(self, seconds_buckets: tuple[float, ...] = SECONDS_BUCKETS,
+                 bytes_buckets: tuple[float, ...] = BYTES_BUCKETS):
+        self.seconds_buckets = seconds_buckets
+        self.bytes_buckets = bytes_buckets
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, timing: CallTiming):
+        with self._lock:
+            for phase in PHASES:
+                self._histogram(timing.api_method, phase, self.seconds_buckets).observe(getattr(timing, phase))
+            self._histogram(timing.api_method, "response_bytes", self.bytes_buckets).observe(timing.response_bytes)
+            if not timing.ok:
+                self.errors[timing.api_method] = self.errors.get(timing.api_method, 0) + 1
+
+    def _histogram(self, api_method: str, metric: str, bounds: tuple[float, ...]) -> Histogram:
+        histogram = self.histograms.get((api_method, metric))
+        if histogram is None:
+            histogram = self.histograms[api_method, metric] = Histogram(bounds)
+        return histogram
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.errors.clear()
+
+    def export_text(self) -> str:
+        """The histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, unit, metrics in (("nutshell_call_seconds", "seconds", PHASES),
+                                        ("nutshell_response_bytes", "bytes", ("response_bytes",))):
+                lines += [f"# HELP {name} NutshellAPI call {unit} by API method"
+                          + (" and phase" if len(metrics) > 1 else ""), f"# TYPE {name} histogram"]
+                for (api_method, metric), histogram in sorted(self.histograms.items()):
+                    if metric not in metrics:
+                        continue
+                    labels = f'method="{api_method}"' + (f',phase="{metric}"' if len(metrics) > 1 else "")
+                    cumulative = 0
+                    for bound, count in zip((*histogram.bounds, "+Inf"), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.total:g}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            lines += ["# HELP nutshell_call_errors_total NutshellAPI calls which failed by API method",
+                      "# TYPE nutshell_call_errors_total counter"]
+            lines += [f'nutshell_call_errors_total{{method="{api_method}"}} {count}'
+                      for api_method, count in sorted(self.errors.items())]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,84 @@
+"""
+This module contains the identity map NutshellAPI uses to share repeated nested entities between parsed responses.
+
+Pages of leads and activities embed the same users, teams, milestones, stagesets, activity types and leads again and
+again, and each copy is parsed into its own model instance. IdentityMap walks parsed responses and replaces every
+entity it has already seen, keyed by ``(model, entity_type, id, rev, stub)``, with the one instance it holds, and
+interns the short strings (entity types, timestamps, tags, names) so equal strings share one object.
+
+Entities are held by weak reference, so the map never keeps a parsed page alive on its own. Shared entities are the
+same object everywhere they appear: changing one changes every response referring to it.
+
+"""
+
+import sys
+import weakref
+from typing import Any, Hashable, Optional
+
+from pydantic import BaseModel
+
+from nutshell.responses import _APIResponse
+
+
+class IdentityMap:
+    """Resolves repeated entities to one shared instance and interns short strings.
+
+    Attributes
+    ----------
+    max_string_length : strings up to this length are interned; longer ones (descriptions, notes) are left alone.
+    shared : entities replaced by an instance already in the map.
+    """
+
+    def __init__(self, max_string_length: int = 64):
+        self.max_string_length = max_string_length
+        self.shared = 0
+        self._entities: weakref.WeakValueDictionary[Hashable, BaseModel] = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def clear(self):
+        self._entities.clear()
+
+    @staticmethod
+    def _key(entity: BaseModel) -> Optional[tuple]:
+        values = entity.__dict__
+        try:
+            return type(entity), values["entity_type"], values["id"], values["rev"], values.get("stub")
+        except KeyError:  # not an entity, e.g. an analytics report
+            return None
+
+    def intern(self, value: Any) -> Any:
+        """Returns the shared equivalent of a value, interning the models, lists and dicts within it in place."""
+        if type(value) is str:
+            return sys.intern(value) if len(value) <= self.max_string_length else value
+        if isinstance(value, BaseModel):
+            return self._intern_model(value)
+        if isinstance(value, list):
+            value[:] = [self.intern(item) for item in value]
+        elif isinstance(value, dict):
+            interned = {self.intern(key): self.intern(item) for key, item in value.items()}
+            value.clear()
+            value.update(interned)
+        return value
+
+    def _intern_model(self, model: BaseModel) -> BaseModel:
+        key = self._key(model)
+        if key is not None:
+            existing = self._entities.get(key)
+            if existing is not None:
+                if existing is not model:
+                    self.shared += 1
+                return existing
+        values = model.__dict__
+        for name, value in values.items():
+            interned = self.intern(value)
+            if interned is not value:
+                values[name] = interned
+        if key is not None:
+            self._entities[key] = model
+        return model
+
+    def intern_response(self, response: _APIResponse) -> _APIResponse:
+        """Interns the entities and strings of a parsed response in place and returns it."""
+        return self._intern_model(response)
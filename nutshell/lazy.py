@@ -0,0 +1,153 @@
+"""
+This module provides lazy, on-access validation of API responses.
+
+A lazy response keeps the raw result returned by the API. Entities are wrapped in LazyEntity proxies which validate a
+field only when it is first read, using the same field definitions (types, aliases and patterns) as the entity model,
+and nested entities are themselves wrapped lazily. Callers reading only ``id`` and ``name`` of a large page never pay
+for validating the rest.
+
+"""
+
+import types
+from functools import lru_cache
+from typing import Any, Iterator, Sequence, Union, get_args, get_origin, Annotated
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+from nutshell.responses import _APIResponse
+
+_MISSING = object()
+
+
+def _model_of(annotation: Any) -> type[BaseModel] | None:
+    """Returns the model class when the annotation is a model, optionally Optional; otherwise None."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    return annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+
+
+def _list_model_of(annotation: Any) -> type[BaseModel] | None:
+    """Returns the model class when the annotation is a list of a model, optionally Optional; otherwise None."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation)
+        return _model_of(item)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    field_info: FieldInfo = model.model_fields[name]
+    if field_info.metadata:
+        return TypeAdapter(Annotated[(field_info.annotation, *field_info.metadata)])
+    return TypeAdapter(field_info.annotation)
+
+
+def lazy_value(annotation: Any, value: Any) -> Any:
+    """Wraps raw model data in lazy proxies where the annotation allows it."""
+    if isinstance(value, dict) and (model := _model_of(annotation)):
+        return LazyEntity(model, value)
+    if isinstance(value, list) and (model := _list_model_of(annotation)):
+        return LazyList(model, value)
+    return _MISSING
+
+
+class LazyEntity:
+    """Proxy for an entity model which validates each field of the raw data the first time it is read.
+
+    ``model()`` validates everything and returns the real model instance.
+    """
+
+    __slots__ = ("_model", "_raw", "_values")
+
+    def __init__(self, model: type[BaseModel], raw: dict):
+        self._model = model
+        self._raw = raw
+        self._values: dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        field_info = self._model.model_fields.get(name)
+        if field_info is None:
+            raise AttributeError(f"{self._model.__name__} has no field {name!r}")
+
+        key = field_info.alias or name
+        if key in self._raw:
+            raw = self._raw[key]
+            value = lazy_value(field_info.annotation, raw)
+            if value is _MISSING:
+                value = _field_adapter(self._model, name).validate_python(raw)
+        elif field_info.is_required():
+            self.model()  # raises the ValidationError for the missing field
+        else:
+            value = field_info.get_default(call_default_factory=True)
+        self._values[name] = value
+        return value
+
+    def model(self) -> BaseModel:
+        return self._model.model_validate(self._raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyEntity):
+            return self._model is other._model and self._raw == other._raw
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Lazy{self._model.__name__}(id={self._raw.get('id')!r})"
+
+
+class LazyList(Sequence):
+    """Sequence of raw entities, each wrapped in a LazyEntity when it is first accessed."""
+
+    __slots__ = ("_model", "_raw", "_items")
+
+    def __init__(self, model: type[BaseModel], raw: list[dict]):
+        self._model = model
+        self._raw = raw
+        self._items: list[Any] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = LazyEntity(self._model, self._raw[index])
+        return item
+
+    def __iter__(self) -> Iterator[LazyEntity]:
+        return (self[idx] for idx in range(len(self)))
+
+    def models(self) -> list[BaseModel]:
+        """Validates every entity and returns the real model instances."""
+        return [self._model.model_validate(raw) for raw in self._raw]
+
+    def __repr__(self) -> str:
+        return f"LazyList[{self._model.__name__}]({len(self)} items)"
+
+
+def lazy_response(response_class: type[_APIResponse], raw: dict) -> _APIResponse:
+    """Builds a response without validating its result, wrapping entities in lazy proxies.
+
+    Results which are not entities (such as the bool of DeleteActivity) are validated immediately, as that is cheap.
+    """
+    if "result" not in raw:
+        return response_class.model_validate(raw)
+    annotation = response_class.model_fields["result"].annotation
+    result = lazy_value(annotation, raw["result"])
+    if result is _MISSING:
+        return response_class.model_validate(raw)
+    return response_class.model_construct(result=result)
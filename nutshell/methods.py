@@ -5,21 +5,44 @@ Methods are intantiated then passed to the NutshellAPI class to actually make th
 
 """
 
-from typing import Optional
+from typing import Any, ClassVar, Optional
 
-from pydantic import BaseModel, computed_field
+from pydantic import computed_field
 
-from nutshell.entities import AnalyticsReportType, FindLeadsQuery, ActivityType, User, Team, FindActivitiesQuery, \
-    CreateActivity
+from nutshell.entities import _Model, AnalyticsReportType, FindLeadsQuery, ActivityType, User, Team, \
+    FindActivitiesQuery, CreateActivity
+from nutshell.responses import _APIResponse, FindUsersResult, GetUserResult, FindTeamsResult, \
+    FindActivityTypesResult, GetAnalyticsReportResult, FindStagesetsResult, FindMilestonesResult, FindLeadsResult, \
+    FindActivitiesResult, NewActivityResult, GetActivityResult, EditActivityResult, DeleteActivityResult, \
+    GetLeadResult, EditLeadResult
 
+# api_method -> response class, filled in as _APIMethod subclasses are defined
+RESPONSE_CLASSES: dict[str, type[_APIResponse]] = {}
 
-class _APIMethod(BaseModel):
+
+def register_response(api_method: str, response_class: type[_APIResponse]):
+    """Registers the response class used to parse results of an API method."""
+    RESPONSE_CLASSES[api_method] = response_class
+
+
+class _APIMethod(_Model):
     """
     Base class for all method calls to the Nutshell API.
 
-    This class should not be used directly, but should be subclassed for each API method.
+    This class should not be used directly, but should be subclassed for each API method. Subclasses declare the
+    ``response_class`` their results are parsed into, which registers it for their ``api_method``. Subclasses which
+    change data set ``idempotent`` to False, so they are not retried automatically after a transient failure.
     """
     api_method: str
+    idempotent: ClassVar[bool] = True
+    response_class: ClassVar[Optional[type[_APIResponse]]] = None
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any):
+        super().__pydantic_init_subclass__(**kwargs)
+        api_method = cls.model_fields["api_method"].default
+        if "response_class" in cls.__dict__ and isinstance(api_method, str):
+            register_response(api_method, cls.response_class)
 
     @computed_field
     @property
@@ -35,6 +58,7 @@ class FindUsers(_APIMethod):
     limit: int = 50
     page: int = 1
     api_method: str = "findUsers"
+    response_class: ClassVar[type[_APIResponse]] = FindUsersResult
 
     @computed_field
     @property
@@ -56,6 +80,7 @@ class GetUser(_APIMethod):
     user_id: int = None  # with no user_id, the API will return the current user
     rev: str = None  # included to match API documentation
     api_method: str = "getUser"
+    response_class: ClassVar[type[_APIResponse]] = GetUserResult
 
     @computed_field
     @property
@@ -75,6 +100,7 @@ class FindTeams(_APIMethod):
     limit: int = 50
     page: int = 1
     api_method: str = "findTeams"
+    response_class: ClassVar[type[_APIResponse]] = FindTeamsResult
 
     @computed_field
     @property
@@ -96,6 +122,7 @@ class FindActivityTypes(_APIMethod):
     limit: int = 50
     page: int = 1
     api_method: str = "findActivityTypes"
+    response_class: ClassVar[type[_APIResponse]] = FindActivityTypesResult
 
     @computed_field
     @property
@@ -117,6 +144,7 @@ class GetAnalyticsReport(_APIMethod):
     filters: Optional[list[User | Team | ActivityType]] = None
     options: list[dict] = None  # little documentation 
     api_method: str = "getAnalyticsReport"
+    response_class: ClassVar[type[_APIResponse]] = GetAnalyticsReportResult
 
     @computed_field
     @property
@@ -137,6 +165,7 @@ class FindStagesets(_APIMethod):
     limit: int = 50
     page: int = 1
     api_method: str = "findStagesets"
+    response_class: ClassVar[type[_APIResponse]] = FindStagesetsResult
 
     @computed_field
     @property
@@ -157,6 +186,7 @@ class FindMilestones(_APIMethod):
     limit: int = 50
     page: int = 1
     api_method: str = "findMilestones"
+    response_class: ClassVar[type[_APIResponse]] = FindMilestonesResult
 
     @computed_field
     @property
@@ -179,6 +209,7 @@ class FindLeads(_APIMethod):
     page: int = 1
     stub_responses: bool = True
     api_method: str = "findLeads"
+    response_class: ClassVar[type[_APIResponse]] = FindLeadsResult
 
     @computed_field
     @property
@@ -206,6 +237,7 @@ class FindActivities(_APIMethod):
     page: int = 1
     stub_responses: bool = True
     api_method: str = "findActivities"
+    response_class: ClassVar[type[_APIResponse]] = FindActivitiesResult
 
     @computed_field
     @property
@@ -227,6 +259,8 @@ class NewActivity(_APIMethod):
     """Creates a new activity"""
     activity: CreateActivity
     api_method: str = "newActivity"
+    response_class: ClassVar[type[_APIResponse]] = NewActivityResult
+    idempotent: ClassVar[bool] = False
 
     @computed_field
     @property
@@ -240,6 +274,7 @@ class GetActivity(_APIMethod):
     """Retrieves a single activity"""
     activity_id: int
     api_method: str = "getActivity"
+    response_class: ClassVar[type[_APIResponse]] = GetActivityResult
 
     @computed_field
     @property
@@ -255,6 +290,8 @@ class EditActivity(_APIMethod):
     rev: str
     activity: dict
     api_method: str = "editActivity"
+    response_class: ClassVar[type[_APIResponse]] = EditActivityResult
+    idempotent: ClassVar[bool] = False
 
     @computed_field
     @property
@@ -271,6 +308,8 @@ class DeleteActivity(_APIMethod):
     activity_id: int
     rev: str
     api_method: str = "deleteActivity"
+    response_class: ClassVar[type[_APIResponse]] = DeleteActivityResult
+    idempotent: ClassVar[bool] = False
 
     @computed_field
     @property
@@ -285,6 +324,7 @@ class GetLead(_APIMethod):
     """Retrieves a single lead"""
     lead_id: int
     api_method: str = "getLead"
+    response_class: ClassVar[type[_APIResponse]] = GetLeadResult
 
     @computed_field
     @property
@@ -300,6 +340,8 @@ class EditLead(_APIMethod):
     rev: str
     lead: dict
     api_method: str = "editLead"
+    response_class: ClassVar[type[_APIResponse]] = EditLeadResult
+    idempotent: ClassVar[bool] = False
 
     @computed_field
     @property
@@ -0,0 +1,252 @@
+"""
+This module maintains a local SQLite mirror of an account's leads, activities, users and reference data, so reports
+can query it locally instead of downloading the account again.
+
+The first update fetches every lead and activity. Later updates list stubs ordered by ``modifiedTime``, newest first,
+only back to the newest modification already mirrored; the full entity is fetched for each stub whose ``rev``
+changed, and entities whose ``deletedTime`` is set are dropped. Users and the other reference lists are small and are
+fetched whole on every update.
+
+Each table keeps the entity JSON along with columns to query on (the fields of ``nutshell.columnar``, with NULL for
+missing values)::
+
+    with Mirror(api, "account.db") as mirror:
+        mirror.update()
+        rows = mirror.query("SELECT milestone_id, SUM(value_amount) FROM leads WHERE status = 0 GROUP BY 1")
+
+"""
+
+import asyncio
+import json
+import math
+import sqlite3
+import threading
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+from pydantic import BaseModel
+
+from nutshell.columnar import ActivityColumns, LeadColumns
+from nutshell.entities import Activity, Lead, User
+from nutshell.methods import FindActivities, FindLeads, GetActivity, GetLead
+from nutshell.pagination import Paginator
+from nutshell.reference import _KINDS
+
+if TYPE_CHECKING:
+    from nutshell.nutshell_api import NutshellAPI
+
+# table -> (method listing the entities, method getting one by id, entity model, query columns)
+_TABLES = {
+    "leads": (FindLeads, lambda lead_id: GetLead(lead_id=lead_id), Lead, LeadColumns.COLUMNS),
+    "activities": (FindActivities, lambda activity_id: GetActivity(activity_id=activity_id), Activity,
+                   ActivityColumns.COLUMNS),
+}
+_SQL_TYPES = {"q": "INTEGER", "b": "INTEGER", "d": "REAL"}
+
+
+@dataclass
+class SyncStats:
+    """What one update did to a mirrored table.
+
+    Attributes
+    ----------
+    full : whether the whole table was fetched, rather than only the changes since the last update.
+    fetched : full entities fetched from the API.
+    updated : rows inserted or replaced.
+    deleted : rows removed, because the entity was deleted or is no longer listed.
+    """
+    full: bool = False
+    fetched: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+
+def _query_value(entity: dict, key: str, extract: Callable[[Any], Any]) -> Any:
+    """Value of a query column, NULL when the entity has no value for its key (or no amount for a money field)."""
+    value = entity.get(key)
+    if value is None:
+        return None
+    value = extract(value)
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+class Mirror:
+    """SQLite mirror of an account, brought up to date by ``update``.
+
+    Attributes
+    ----------
+    path : SQLite database file, or ``":memory:"``.
+    page_size : entities requested per Find* page.
+    """
+
+    def __init__(self, api: "NutshellAPI", path: str | Path = ":memory:", page_size: int = 100):
+        self.api = api
+        self.path = path
+        self.page_size = page_size
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        statements = ["CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, watermark TEXT, updated_at REAL)",
+                      "CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, rev TEXT, modified_time TEXT, "
+                      "name TEXT, data TEXT NOT NULL)",
+                      "CREATE TABLE IF NOT EXISTS reference (kind TEXT, id INTEGER, name TEXT, data TEXT NOT NULL, "
+                      "PRIMARY KEY (kind, id))"]
+        for table, (_, _, _, columns) in _TABLES.items():
+            definitions = ", ".join(f"{name} {_SQL_TYPES[typecode]}" for name, (typecode, _, _) in columns.items()
+                                    if name != "id")
+            statements.append(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, rev TEXT NOT NULL, "
+                              f"modified_time TEXT, name TEXT, {definitions}, data TEXT NOT NULL)")
+        with self._lock, self._connection:
+            for statement in statements:
+                self._connection.execute(statement)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def query(self, sql: str, parameters: Iterable[Any] = ()) -> list[tuple]:
+        """Runs a read query against the mirror and returns every row."""
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters)).fetchall()
+
+    def _entities(self, table: str, model: type[BaseModel], where: str = "", parameters: Iterable[Any] = ()
+                  ) -> list[BaseModel]:
+        rows = self.query(f"SELECT data FROM {table} {where} ORDER BY id", parameters)
+        return [model.model_validate_json(data) for (data,) in rows]
+
+    def leads(self) -> list[Lead]:
+        return self._entities("leads", Lead)
+
+    def lead(self, lead_id: int) -> Optional[Lead]:
+        return next(iter(self._entities("leads", Lead, "WHERE id = ?", (lead_id,))), None)
+
+    def activities(self) -> list[Activity]:
+        return self._entities("activities", Activity)
+
+    def activity(self, activity_id: int) -> Optional[Activity]:
+        return next(iter(self._entities("activities", Activity, "WHERE id = ?", (activity_id,))), None)
+
+    def users(self) -> list[User]:
+        return self._entities("users", User)
+
+    def user(self, user_id: int) -> Optional[User]:
+        return next(iter(self._entities("users", User, "WHERE id = ?", (user_id,))), None)
+
+    def reference(self, kind: str) -> list[BaseModel]:
+        """Mirrored reference list, by the ReferenceData name: activity_types, stagesets, milestones or teams."""
+        _, model = _KINDS[kind]
+        return self._entities("reference", model, "WHERE kind = ?", (kind,))
+
+    def watermark(self, table: str) -> Optional[str]:
+        """The newest ``modifiedTime`` mirrored in the table, or None before its first update."""
+        rows = self.query("SELECT watermark FROM sync_state WHERE name = ?", (table,))
+        return rows[0][0] if rows else None
+
+    def update(self) -> dict[str, SyncStats]:
+        """Brings the mirror up to date, fetching everything on the first update and only changes afterwards."""
+        return self.api._background_loop().run(self.aupdate())
+
+    async def aupdate(self) -> dict[str, SyncStats]:
+        tables = list(_TABLES)
+        stats = await asyncio.gather(*(self._update_table(table) for table in tables), self._update_reference())
+        return dict(zip(tables, stats[:-1])) | stats[-1]
+
+    async def _update_table(self, table: str) -> SyncStats:
+        watermark = self.watermark(table)
+        if watermark is None:
+            return await self._full_update(table)
+        return await self._delta_update(table, watermark)
+
+    async def _full_update(self, table: str) -> SyncStats:
+        find_class, _, _, _ = _TABLES[table]
+        stats = SyncStats(full=True)
+        seen, newest = set(), ""
+        method = find_class(limit=self.page_size, stub_responses=False)
+        async for entities in Paginator(self.api, method, raw=True).pages():
+            newest = max([newest, *(entity.get("modifiedTime") or "" for entity in entities)])
+            live = [entity for entity in entities if not entity.get("deletedTime")]
+            seen.update(entity["id"] for entity in live)
+            stats.fetched += len(entities)
+            stats.updated += self._write(table, live, ())[0]
+        gone = {row_id for (row_id,) in self.query(f"SELECT id FROM {table}")} - seen
+        stats.deleted = self._write(table, (), gone, newest)[1]
+        return stats
+
+    async def _delta_update(self, table: str, watermark: str) -> SyncStats:
+        find_class, get_method, _, _ = _TABLES[table]
+        stats = SyncStats()
+        changed, deleted, newest = [], [], watermark
+        method = find_class(limit=self.page_size, order_by="modifiedTime", order_direction="DESC")
+        async with aclosing(Paginator(self.api, method, prefetch=0, raw=True).pages()) as pages:
+            async for stubs in pages:
+                recent = [stub for stub in stubs if (stub.get("modifiedTime") or "") >= watermark]
+                revs = self._revs(table, [stub["id"] for stub in recent])
+                for stub in recent:
+                    newest = max(newest, stub["modifiedTime"])
+                    if stub.get("deletedTime"):
+                        deleted.append(stub["id"])
+                    elif revs.get(stub["id"]) != stub["rev"]:
+                        changed.append(stub["id"])
+                if len(recent) < len(stubs):
+                    break
+
+        entities = await self.api._fetch_raw([get_method(entity_id) for entity_id in changed]) if changed else []
+        stats.fetched = len(entities)
+        stats.updated, stats.deleted = self._write(table, entities, deleted, newest)
+        return stats
+
+    def _revs(self, table: str, ids: list[int]) -> dict[int, str]:
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" * len(ids))
+        return dict(self.query(f"SELECT id, rev FROM {table} WHERE id IN ({placeholders})", ids))
+
+    def _write(self, table: str, entities: Iterable[dict], deleted: Iterable[int], watermark: str = None
+               ) -> tuple[int, int]:
+        """Upserts entities and removes deleted ids in one transaction, recording the watermark if given. Returns
+        the number of rows upserted and deleted."""
+        _, _, _, columns = _TABLES[table]
+        extractors = [(key, extract) for name, (_, key, extract) in columns.items() if name != "id"]
+        rows = [(entity["id"], entity["rev"], entity.get("modifiedTime"), entity.get("name"),
+                 *(_query_value(entity, key, extract) for key, extract in extractors), json.dumps(entity))
+                for entity in entities]
+        placeholders = ", ".join("?" * (len(extractors) + 5))
+        with self._lock, self._connection:
+            self._connection.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows)
+            removed = self._connection.executemany(f"DELETE FROM {table} WHERE id = ?",
+                                                   [(entity_id,) for entity_id in deleted]).rowcount
+            if watermark is not None:
+                self._connection.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                                         (table, watermark, time.time()))
+        return len(rows), max(removed, 0)
+
+    async def _update_reference(self) -> dict[str, SyncStats]:
+        # built from the raw pages, like the leads and activities, whatever the client's parse mode
+        kinds = list(_KINDS)
+        fetched = dict(zip(kinds, await asyncio.gather(*(self._list(kind) for kind in kinds))))
+        users = [(user["id"], user.get("rev"), user.get("modifiedTime"), user.get("name"), json.dumps(user))
+                 for user in fetched.pop("users")]
+        lists = [(kind, entity["id"], entity.get("name"), json.dumps(entity))
+                 for kind, entities in fetched.items() for entity in entities]
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM users")
+            self._connection.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)", users)
+            self._connection.execute("DELETE FROM reference")
+            self._connection.executemany("INSERT INTO reference VALUES (?, ?, ?, ?)", lists)
+        return {"users": SyncStats(full=True, fetched=len(users), updated=len(users)),
+                "reference": SyncStats(full=True, fetched=len(lists), updated=len(lists))}
+
+    async def _list(self, kind: str) -> list[dict]:
+        method_class, _ = _KINDS[kind]
+        return [entity async for entities in Paginator(self.api, method_class(limit=self.page_size), raw=True).pages()
+                for entity in entities]
@@ -0,0 +1,361 @@
+"""
+This module provides a local stand-in for the Nutshell JSON-RPC API, for offline testing and benchmarking.
+
+MockNutshell serves generated, realistically shaped users, teams, activity types, stagesets, milestones, leads and
+activities. Account size, description size and response latency are configurable, and the data is deterministic for
+a given seed. The server runs on its own event loop thread so synchronous code can use it directly::
+
+    with MockNutshell(leads=10_000, latency=0.02) as server:
+        api = NutshellAPI("user", password="key")
+        api.URL = server.url
+
+It can also be run standalone with ``python -m nutshell.mock_server --port 8080``.
+
+"""
+
+import argparse
+import asyncio
+import inspect
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+
+from nutshell.exceptions import REV_CONFLICT
+
+_EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+_ORDERABLE = ("id", "modifiedTime", "createdTime")
+_STUB_KEYS = ("id", "entityType", "rev", "name", "description", "status", "modifiedTime", "deletedTime")
+_WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet", "kilo", "lima")
+
+
+def _timestamp(seconds: int) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S+0000")
+
+
+class RPCFault(Exception):
+    """Raised or returned by ``respond`` to answer with a JSON-RPC error of a specific code."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class JSONRPCServer:
+    """Threaded aiohttp server answering JSON-RPC requests, single or batched, with ``respond``.
+
+    Attributes
+    ----------
+    latency : seconds each HTTP request is held before being answered.
+    failures : HTTP statuses returned, one per request, before requests are answered normally.
+    retry_after : Retry-After header sent with those failures.
+    reverse_batches : answer batch requests in reverse order, to exercise matching by request id.
+    record_requests : keep every decoded request body in ``requests``.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0, record_requests: bool = True):
+        self.latency = latency
+        self.failures: list[int] = []
+        self.retry_after: Optional[str] = None
+        self.reverse_batches = False
+        self.record_requests = record_requests
+        self.requests: list[Any] = []
+        self.host = host
+        self.port = port
+        self.url: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    def respond(self, method: str, params: dict) -> Any:
+        """Returns the result of a call, or an exception (an RPCFault for a specific code) to answer with a JSON-RPC
+        error. May be a coroutine."""
+        raise NotImplementedError
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if self.record_requests:
+            self.requests.append(body)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failures:
+            headers = {"Retry-After": self.retry_after} if self.retry_after else None
+            return web.Response(status=self.failures.pop(0), headers=headers)
+        if isinstance(body, list):
+            responses = [await self._respond(item) for item in body]
+            if self.reverse_batches:
+                responses.reverse()
+            return web.json_response(responses)
+        return web.json_response(await self._respond(body))
+
+    async def _respond(self, item: dict) -> dict:
+        try:
+            result = self.respond(item["method"], item.get("params", {}))
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as error:
+            result = error
+        if isinstance(result, Exception):
+            code = result.code if isinstance(result, RPCFault) else -32000
+            return {"id": item.get("id"), "jsonrpc": "2.0", "error": {"code": code, "message": str(result)}}
+        return {"id": item.get("id"), "jsonrpc": "2.0", "result": result}
+
+    async def start_async(self):
+        """Starts serving on the running event loop."""
+        app = web.Application(client_max_size=64 * 1024 ** 2)
+        app.router.add_post("/", self._handle)
+        app.router.add_post("/api/v1/json", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        self.url = f"http://{self.host}:{self.port}/api/v1/json"
+
+    async def stop_async(self):
+        await self._runner.cleanup()
+
+    def start(self):
+        """Starts serving on a daemon thread with its own event loop."""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="nutshell-mock-server", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self.start_async(), self._loop).result()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.stop_async(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class MockNutshell(JSONRPCServer):
+    """Stand-in Nutshell API with a generated account.
+
+    Attributes
+    ----------
+    leads, activities, users : number of each entity in the account.
+    description_size : characters of free text in each lead and activity description.
+    edits : EditLead and EditActivity calls applied (rev conflicts are not counted).
+
+    Find* results are ordered by ``id``, ``modifiedTime`` or ``createdTime`` when asked to (other orders are served
+    in id order), FindLeads queries on status, stagesets, milestones and assignees are applied, and
+    ``modify``/``delete`` change the account the way edits made elsewhere would.
+    """
+
+    def __init__(self, leads: int = 1000, activities: int = 1000, users: int = 50, description_size: int = 200,
+                 seed: int = 0, **server_options):
+        super().__init__(**server_options)
+        self.description_size = description_size
+        self._random = random.Random(seed)
+        self.activity_types = [self._activity_type(type_id) for type_id in range(1, 6)]
+        self.stagesets = [{"id": stageset_id, "entityType": "Stagesets", "name": f"Pipeline {stageset_id}",
+                           "default": int(stageset_id == 1), "position": stageset_id} for stageset_id in (1, 2)]
+        self.milestones = [self._milestone(milestone_id) for milestone_id in range(1, 9)]
+        self.teams = [self._team(team_id) for team_id in range(1, 5)]
+        self.users = [self._user(user_id) for user_id in range(1, users + 1)]
+        self.leads = [self._lead(lead_id) for lead_id in range(1, leads + 1)]
+        self.activities = [self._activity(activity_id) for activity_id in range(1, activities + 1)]
+        self._leads_by_id = {lead["id"]: lead for lead in self.leads}
+        self._activities_by_id = {activity["id"]: activity for activity in self.activities}
+        self._users_by_id = {user["id"]: user for user in self.users}
+        self._clock = 40_000_000  # seconds after the epoch of the generated data, later than every generated time
+        self.edits = 0
+
+    def _text(self, size: int) -> str:
+        words = []
+        while sum(len(word) + 1 for word in words) < size:
+            words.append(self._random.choice(_WORDS))
+        return " ".join(words)[:size]
+
+    @staticmethod
+    def _activity_type(type_id: int) -> dict:
+        return {"stub": True, "id": type_id, "rev": "1", "entityType": "Activity_Types", "name": f"Type {type_id}"}
+
+    @staticmethod
+    def _milestone(milestone_id: int) -> dict:
+        return {"stub": True, "id": milestone_id, "rev": "2", "entityType": "Milestones",
+                "name": f"Milestone {milestone_id}", "position": milestone_id, "stagesetId": 1 + milestone_id % 2}
+
+    @staticmethod
+    def _team(team_id: int) -> dict:
+        return {"stub": True, "id": team_id, "rev": "0", "entityType": "Teams", "name": f"Team {team_id}",
+                "modifiedTime": _timestamp(team_id * 3600), "createdTime": _timestamp(0)}
+
+    def _user(self, user_id: int) -> dict:
+        first, last = self._random.choice(_WORDS).title(), self._random.choice(_WORDS).title()
+        return {"stub": True, "id": user_id, "rev": str(self._random.randint(1, 20)), "entityType": "Users",
+                "name": f"{first} {last}", "firstName": first, "lastName": last, "isEnabled": True,
+                "isAdministrator": user_id == 1, "emails": [f"{first.lower()}.{user_id}@example.com"],
+                "modifiedTime": _timestamp(user_id * 600), "createdTime": _timestamp(0)}
+
+    def _lead(self, lead_id: int) -> dict:
+        created = self._random.randint(0, 30_000_000)
+        milestone = self._random.choice(self.milestones)
+        amount = round(self._random.uniform(500, 250_000), 2)
+        return {
+            "id": lead_id, "entityType": "Leads", "rev": str(self._random.randint(1, 90)),
+            "name": f"Lead-{lead_id}", "description": self._text(self.description_size),
+            "htmlUrl": f"https://app.nutshell.com/lead/{lead_id}",
+            "tags": self._random.sample(_WORDS, 2),
+            "createdTime": _timestamp(created), "modifiedTime": _timestamp(created + 86400),
+            "creator": self._random.choice(self.users),
+            "milestone": milestone,
+            "stageset": self.stagesets[milestone["stagesetId"] - 1],
+            "status": self._random.choice((0, 0, 0, 10, 11, 12)),
+            "confidence": self._random.randint(0, 100),
+            "assignee": self._random.choice(self.users + self.teams),
+            "dueTime": _timestamp(created + 90 * 86400),
+            "value": {"currency": "USD", "amount": amount},
+            "normalizedValue": {"currency": "USD", "amount": amount},
+            "customFields": {"Region": self._random.choice(_WORDS)},
+        }
+
+    def _activity(self, activity_id: int) -> dict:
+        start = self._random.randint(0, 30_000_000)
+        lead = self._random.choice(self.leads) if self.leads else None
+        return {
+            "id": activity_id, "entityType": "Activities", "rev": str(self._random.randint(1, 9)),
+            "name": f"Activity {activity_id}", "description": self._text(self.description_size),
+            "activityType": self._random.choice(self.activity_types),
+            "lead": lead, "leads": [lead] if lead else [],
+            "startTime": _timestamp(start), "endTime": _timestamp(start + 1800),
+            "isAllDay": False, "isFlagged": self._random.random() < 0.1,
+            "status": self._random.choice((0, 1, 1, 2, -1)),
+            "participants": [self._random.choice(self.users)],
+            "modifiedTime": _timestamp(start + 3600), "createdTime": _timestamp(start - 3600),
+        }
+
+    def modify(self, entity: dict, **fields) -> dict:
+        """Changes an entity as an edit would: updates the fields, bumps its rev and modifiedTime."""
+        self._clock += 60
+        entity.update(fields, rev=str(int(entity["rev"]) + 1), modifiedTime=_timestamp(self._clock))
+        return entity
+
+    def delete(self, entity: dict) -> dict:
+        """Marks an entity deleted; it keeps being listed, with its deletedTime set."""
+        self.modify(entity)
+        entity["deletedTime"] = entity["modifiedTime"]
+        return entity
+
+    @staticmethod
+    def _page(entities: list[dict], params: dict) -> list[dict]:
+        order_by = params.get("orderBy")
+        if order_by in _ORDERABLE and order_by != "id":
+            entities = sorted(entities, key=lambda entity: (entity.get(order_by, ""), entity["id"]))
+        if params.get("orderDirection") == "DESC":
+            entities = entities[::-1]
+        limit = params.get("limit", 50)
+        start = (params.get("page", 1) - 1) * limit
+        return entities[start:start + limit]
+
+    def _edit(self, entity: Optional[dict], rev: str, changes: dict) -> dict | Exception:
+        if entity is None:
+            return LookupError("Entity not found")
+        if rev != entity["rev"]:
+            return RPCFault(REV_CONFLICT, f"rev {rev} is out of date, the current rev is {entity['rev']}")
+        self.edits += 1
+        return self.modify(entity, **{key: self._resolve(value) for key, value in changes.items()})
+
+    def _resolve(self, value: Any) -> Any:
+        """Replaces an ``{"entityType": "Users", "id": 3}`` reference sent in an edit with the entity itself."""
+        if isinstance(value, dict) and value.keys() == {"entityType", "id"}:
+            entities = {"Users": self.users, "Teams": self.teams}.get(value["entityType"], [])
+            return next((entity for entity in entities if entity["id"] == value["id"]), value)
+        return value
+
+    @staticmethod
+    def _analytics_report(params: dict) -> dict:
+        """Daily effort over 30 days. Counts are strings, as the API sends them, and depend only on the params, so
+        the same report always has the same values."""
+        rng = random.Random(repr(sorted(params.items())))
+        start = int(_EPOCH.timestamp()) * 1000
+        total = [rng.randint(0, 20) for _ in range(30)]
+        successful = [rng.randint(0, count) for count in total]
+        days = [start + day * 86_400_000 for day in range(30)]
+        return {"seriesData": {"total_effort": [[day, str(count)] for day, count in zip(days, total)],
+                               "successful_effort": [[day, str(count)] for day, count in zip(days, successful)]},
+                "summaryData": {}, "periodDescription": "Last 30 days", "deltaPeriodDescription": "Prior"}
+
+    @staticmethod
+    def _lead_filter(query: dict) -> Callable[[dict], bool]:
+        """Predicate matching the leads which meet every condition of a FindLeads query it has a field for."""
+        def ids(key: str) -> set[int]:
+            return set(query.get(f"{key}Ids", ())) | ({query[f"{key}Id"]} if f"{key}Id" in query else set())
+
+        status, stageset_ids, milestone_ids = query.get("status"), ids("stageset"), ids("milestone")
+        assignees = {(assignee["entityType"], assignee["id"]) for assignee in query.get("assignee", ())}
+
+        def matches(lead: dict) -> bool:
+            assignee = lead.get("assignee") or {}
+            return ((status is None or lead["status"] == status)
+                    and (not stageset_ids or (lead.get("stageset") or {}).get("id") in stageset_ids)
+                    and (not milestone_ids or (lead.get("milestone") or {}).get("id") in milestone_ids)
+                    and (not assignees or (assignee.get("entityType"), assignee.get("id")) in assignees))
+        return matches
+
+    @staticmethod
+    def _stub(entity: dict) -> dict:
+        return {key: entity[key] for key in _STUB_KEYS if key in entity} | {"stub": True}
+
+    def respond(self, method: str, params: dict) -> Any:
+        match method:
+            case "findUsers":
+                return self._page(self.users, params)
+            case "getUser":
+                return self._users_by_id.get(params.get("userId", 1)) or LookupError("User not found")
+            case "findTeams":
+                return self._page(self.teams, params)
+            case "findActivityTypes":
+                return self._page(self.activity_types, params)
+            case "findStagesets":
+                return self._page(self.stagesets, params)
+            case "findMilestones":
+                return self._page(self.milestones, params)
+            case "findLeads":
+                query = params.get("query") or {}
+                leads = list(filter(self._lead_filter(query), self.leads)) if query else self.leads
+                page = self._page(leads, params)
+                return [self._stub(lead) for lead in page] if params.get("stubResponses", True) else page
+            case "findActivities":
+                page = self._page(self.activities, params)
+                return [self._stub(activity) for activity in page] if params.get("stubResponses", True) else page
+            case "getLead":
+                return self._leads_by_id.get(params["leadId"]) or LookupError("Lead not found")
+            case "getActivity":
+                return self._activities_by_id.get(params["activityId"]) or LookupError("Activity not found")
+            case "editLead":
+                return self._edit(self._leads_by_id.get(params["leadId"]), params["rev"], params["lead"])
+            case "editActivity":
+                return self._edit(self._activities_by_id.get(params["activityId"]), params["rev"], params["activity"])
+            case "getAnalyticsReport":
+                return self._analytics_report(params)
+        return NotImplementedError(f"Method {method} is not supported by the mock server")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Nutshell JSON-RPC API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--activities", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockNutshell(leads=args.leads, activities=args.activities, users=args.users, latency=args.latency,
+                          host=args.host, port=args.port, record_requests=False)
+    server.start()
+    print(f"Mock Nutshell API listening on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
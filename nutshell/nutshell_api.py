@@ -1,25 +1,207 @@
 import asyncio
-from typing import Sequence
+import itertools
+import json
+import threading
+import time
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, AsyncIterator, Coroutine, Iterator, Optional, Sequence, TypeVar
 from collections import namedtuple
 
-import aiohttp
+from pydantic import ValidationError
 
-from nutshell.methods import _APIMethod
-from nutshell.responses import FindUsersResult, GetUserResult, GetAnalyticsReportResult, FindTeamsResult, \
-    FindActivityTypesResult, _APIResponse, FindStagesetsResult, FindMilestonesResult, FindLeadsResult, \
-    FindActivitiesResult, EditActivityResult, NewActivityResult, GetActivityResult, DeleteActivityResult, GetLeadResult, \
-    EditLeadResult
+from nutshell.cache import EntityCache
+from nutshell.columnar import COLUMN_TABLES, _ColumnTable
+from nutshell.decoding import Decoder, RawResponse, get_decoder
+from nutshell.exceptions import NutshellAPIError, NutshellHTTPError, NutshellRPCError
+from nutshell.instrumentation import CallTiming, Hook, RequestTrace, trace_config
+from nutshell.interning import IdentityMap
+from nutshell.lazy import lazy_response
+from nutshell.methods import _APIMethod, RESPONSE_CLASSES
+from nutshell.pagination import AdaptivePageSize, Paginator
+from nutshell.retry import RetryPolicy, CircuitBreaker, admit, parse_retry_after
+from nutshell.throttle import InFlightLimit, TokenBucket, ThrottleStats
+from nutshell.responses import _APIResponse
+
+if TYPE_CHECKING:
+    # imported on first use, as aiohttp takes longer to import than the rest of the package
+    import aiohttp
 
 _MethodResponse = namedtuple("MethodResponse", ["method", "response"])
 
+T = TypeVar("T")
+
+
+def _parse_chunk(calls: Sequence[_APIMethod], results: list[dict | RawResponse], lazy: bool, decoder: Decoder,
+                 timed: bool) -> tuple[list[_APIResponse | Exception], list[float]]:
+    """Parses the results of calls, returning the responses and, when ``timed``, the seconds each took. Batch bodies
+    left raw for a process pool are decoded here, once per body. Defined at module level so process pools can run it.
+    """
+    bodies: dict[int, Any] = {}
+    responses, durations = [], []
+    for call, result in zip(calls, results):
+        parse_start = time.perf_counter()
+        if isinstance(result, RawResponse) and (result.request_id is not None or lazy):
+            data = bodies.get(id(result.body))
+            if data is None:
+                data = bodies[id(result.body)] = decoder.loads(result.body)
+            result = data if result.request_id is None else NutshellAPI._match_responses(
+                [{"id": result.request_id}], data)[0]
+        responses += NutshellAPI._map_results([call], [result], lazy)
+        if timed:
+            durations.append(time.perf_counter() - parse_start)
+    return responses, durations
+
+
+class _BackgroundLoop:
+    """Event loop running forever on a daemon thread, used to serve synchronous callers."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="nutshell-api-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Runs the coroutine on the background loop and blocks until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Drives an async iterator on the background loop, yielding its items to a synchronous caller."""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if hasattr(agen, "aclose"):
+                self.run(agen.aclose())
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+async def _closed_at_shutdown(session: "aiohttp.ClientSession") -> AsyncIterator[None]:
+    """Async generator which closes the session when it is closed. Once started it is registered with the running loop,
+    and ``shutdown_asyncgens`` (run by ``asyncio.run`` before closing its loop) closes it."""
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+@dataclass
+class _LoopResources:
+    """Connection pool and in-flight shared calls belonging to one event loop. ``closer`` closes the session, either
+    through ``aclose`` or when the loop shuts down."""
+    session: "aiohttp.ClientSession"
+    closer: AsyncIterator[None]
+    shared_calls: dict[tuple[str, str], asyncio.Future] = field(default_factory=dict)
+
 
 class NutshellAPI:
-    """Class to handle multiple API calls to the Nutshell API"""
+    """Class to handle multiple API calls to the Nutshell API
+
+    With the default ``max_batch_size`` of 1 each call is sent as its own JSON-RPC request. Larger values pack up to
+    ``max_batch_size`` calls into a single JSON-RPC 2.0 batch (array) request, and responses are matched back to their
+    calls by request id.
+
+    HTTP connections are pooled in a long-lived ``aiohttp.ClientSession`` with keep-alive and DNS caching, tuned by
+    ``connection_limit``, ``keepalive_timeout`` and ``dns_cache_ttl``. Async code should use the instance as an async
+    context manager and ``await acall(...)``; the synchronous ``call_api`` runs on a background event loop thread which
+    keeps its session between calls until ``close()`` is called. Threads passing their calls to ``call_api`` share
+    that loop and session, so one instance can serve a multi-threaded application.
+
+    At most ``max_in_flight`` HTTP requests are open at once, and ``requests_per_second`` (with bursts of up to
+    ``burst``) caps the request rate. Both limits apply across every call made through the instance, whichever event
+    loop it runs on. Time spent waiting on those limits versus time spent on the wire is recorded in
+    ``throttle_stats``.
+
+    Transient failures (connection errors, timeouts, 429 and 5xx responses) are retried with jittered exponential
+    backoff according to ``retry_policy``, honouring Retry-After. Read methods are retried automatically, methods which
+    change data only when the policy sets ``retry_mutations``. Each API method has a circuit breaker in
+    ``circuit_breakers`` which fails calls fast while that method keeps failing.
+
+    Passing an ``entity_cache`` answers GetLead, GetActivity and GetUser calls from parsed entities already seen, and
+    keeps the cache current with the newer revisions returned by EditLead and EditActivity.
+
+    With ``coalesce`` enabled (the default), identical read calls (same ``api_method`` and ``params``) made in the same
+    batch or in concurrent batches share one network request and one parsed response object; ``coalesced_calls``
+    counts the requests saved. Calls which change data are never coalesced.
+
+    ``as_completed`` (or ``iter_completed`` from sync code) yields ``(call, response_or_error)`` pairs as each call
+    finishes instead of waiting for the slowest call.
+
+    Results are parsed into the response class each method registers (see ``methods.RESPONSE_CLASSES``). With
+    ``lazy`` enabled, responses keep the raw result and entities are LazyEntity proxies which validate each field on
+    first access. With an ``identity_map``, repeated nested entities across the parsed responses resolve to one
+    shared instance and short strings are interned; see ``nutshell.interning``.
+
+    Response bodies are decoded by ``decoder``: ``"json"`` (standard library), ``"orjson"``, or ``"pydantic"``, which
+    validates single-call responses straight from the raw bytes; see ``nutshell.decoding``.
+
+    Parsing runs on the event loop's thread unless a ``parse_executor`` is given. Each batch is then parsed in the
+    executor as soon as it arrives, overlapping the requests still in flight and leaving the loop free for other
+    coroutines. A ThreadPoolExecutor parses the decoded JSON. A ProcessPoolExecutor receives the raw response bytes
+    and returns pickled responses, which keeps CPU-heavy validation off the interpreter running the loop altogether.
+
+    Each function in ``hooks`` is called with a CallTiming for every call sent, splitting its time into queue wait,
+    connect, time to first byte, transfer, decode and validation, along with the response size; see
+    ``nutshell.instrumentation``. Hooks must be given up front, as request tracing is set up with each session.
+
+    With ``adaptive_paging``, every Paginator of the client (``paginate``, ``columns``, mirrors, reference data and
+    sharded pulls) tunes the page size of each Find* method from the size and latency of its pages; see
+    ``nutshell.pagination``.
+    """
     URL = "https://app.nutshell.com/api/v1/json"
 
-    def __init__(self, username: str, password: str):
-        self.auth = aiohttp.BasicAuth(username, password=password)
+    def __init__(self, username: str, password: str, max_batch_size: int = 1, connection_limit: int = 100,
+                 keepalive_timeout: float = 30, dns_cache_ttl: int = 300, max_in_flight: int = 20,
+                 requests_per_second: float = None, burst: int = None, retry_policy: RetryPolicy = None,
+                 entity_cache: EntityCache = None, coalesce: bool = True, lazy: bool = False,
+                 decoder: str | Decoder = "json", identity_map: IdentityMap = None, hooks: Sequence[Hook] = (),
+                 parse_executor: Executor = None, adaptive_paging: AdaptivePageSize = None):
+        if lazy and isinstance(parse_executor, ProcessPoolExecutor):
+            raise ValueError("lazy responses cannot be parsed in a process pool")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self._credentials = (username, password)
+        self.max_batch_size = max_batch_size
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.max_in_flight = max_in_flight
+        self._in_flight = InFlightLimit(max_in_flight)
+        self.rate_limiter = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self.throttle_stats = ThrottleStats()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breakers: dict[str, CircuitBreaker] = {}
+        self.entity_cache = entity_cache
+        self.coalesce = coalesce
+        self.coalesced_calls = 0
+        self.lazy = lazy
+        self.decoder = get_decoder(decoder)
+        self.identity_map = identity_map
+        self.hooks = list(hooks)
+        self.parse_executor = parse_executor
+        self.adaptive_paging = adaptive_paging
         self._api_calls = []
+        self._request_ids = itertools.count(1)
+        self._resources: dict[asyncio.AbstractEventLoop, _LoopResources] = {}
+        self._background: Optional[_BackgroundLoop] = None
+        self._background_lock = threading.Lock()
+
+    @cached_property
+    def auth(self) -> "aiohttp.BasicAuth":
+        import aiohttp
+        username, password = self._credentials
+        return aiohttp.BasicAuth(username, password=password)
 
     @property
     def api_calls(self):
@@ -29,59 +211,436 @@ class NutshellAPI:
     def api_calls(self, calls: Sequence[_APIMethod] | _APIMethod):
         self._api_calls = [calls] if isinstance(calls, _APIMethod) else calls
 
-    def call_api(self):
-        responses = asyncio.run(self._calling_api())
+    def call_api(self, calls: Sequence[_APIMethod] | _APIMethod = None) -> _APIResponse | list[_APIResponse]:
+        """Makes the given calls, or the queued api_calls when none are given, on the background event loop.
 
-        return self._map_results(responses)
+        Passing the calls is thread-safe: any number of threads can share one instance, and so its event loop and
+        connection pool. The queued ``api_calls`` are shared by every thread using the instance."""
+        if calls is None:
+            calls = self._api_calls
+        elif isinstance(calls, _APIMethod):
+            calls = [calls]
+        responses = self._background_loop().run(self._execute(calls))
 
-    async def _calling_api(self):
-        tasks = []
-        async with aiohttp.ClientSession() as session:
-            tasks.extend(self._fetch_report(session, call) for call in self._api_calls)
-            responses = await asyncio.gather(*tasks)
+        return responses[0] if len(responses) == 1 else responses
 
-        return responses
+    async def acall(self, calls: Sequence[_APIMethod] | _APIMethod = None) -> _APIResponse | list[_APIResponse]:
+        """Async counterpart of call_api. Makes the given calls, or the queued api_calls when none are given."""
+        if calls is None:
+            calls = self._api_calls
+        elif isinstance(calls, _APIMethod):
+            calls = [calls]
+        responses = await self._execute(calls)
+
+        return responses[0] if len(responses) == 1 else responses
+
+    async def as_completed(self, calls: Sequence[_APIMethod]
+                           ) -> AsyncIterator[tuple[_APIMethod, _APIResponse | Exception]]:
+        """Yields ``(call, response)`` pairs in completion order. A failed call is paired with its exception instead
+        of raising, and an error affecting a whole batched request is paired with every call in it."""
+        tasks = [asyncio.ensure_future(self._execute_settled(chunk)) for chunk in self._batches(calls)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for pair in await finished:
+                    yield pair
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def iter_completed(self, calls: Sequence[_APIMethod]) -> Iterator[tuple[_APIMethod, _APIResponse | Exception]]:
+        """Synchronous counterpart of as_completed, running on the background event loop."""
+        return self._background_loop().iterate(self.as_completed(calls))
+
+    def paginate(self, method: _APIMethod, prefetch: int = 2) -> Paginator:
+        """Returns a Paginator over every page of a Find* method, usable with ``for`` and ``async for``."""
+        return Paginator(self, method, prefetch=prefetch)
+
+    async def acolumns(self, method: _APIMethod, prefetch: int = 2) -> _ColumnTable:
+        """Collects every page of FindLeads or FindActivities into a columnar table, built straight from the JSON."""
+        table_class = COLUMN_TABLES.get(method.api_method)
+        if table_class is None:
+            raise ValueError(f"{method.api_method} has no columnar table, expected one of {', '.join(COLUMN_TABLES)}")
+        table = table_class()
+        async for entities in Paginator(self, method, prefetch=prefetch, raw=True).pages():
+            table.extend(table_class.from_json(entities))
+        return table
+
+    def columns(self, method: _APIMethod, prefetch: int = 2) -> _ColumnTable:
+        """Synchronous counterpart of acolumns, running on the background event loop."""
+        return self._background_loop().run(self.acolumns(method, prefetch=prefetch))
+
+    async def __aenter__(self) -> "NutshellAPI":
+        await self._loop_resources()
+        return self
 
-    async def _fetch_report(self, session: aiohttp.ClientSession, call: _APIMethod) -> dict:
-        payload = {"id": "apeye",
-                   "jsonrpc": "2.0",
-                   "method": call.api_method,
-                   "params": call.params}
-        async with session.post(self.URL, auth=self.auth, json=payload, ) as resp:
-            return await resp.json()
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
-    def _map_results(self, results: list[dict]) -> _APIResponse | list[_APIResponse]:
+    def __enter__(self) -> "NutshellAPI":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def aclose(self):
+        """Closes the session owned by the running event loop."""
+        resources = self._resources.pop(asyncio.get_running_loop(), None)
+        if resources is not None:
+            await resources.closer.aclose()
+
+    def close(self):
+        """Closes the background loop used by call_api, along with its session."""
+        with self._background_lock:
+            background, self._background = self._background, None
+        if background is not None:
+            background.run(self.aclose())
+            background.stop()
+
+    def _background_loop(self) -> _BackgroundLoop:
+        with self._background_lock:
+            if self._background is None:
+                self._background = _BackgroundLoop()
+            return self._background
+
+    async def _loop_resources(self) -> _LoopResources:
+        """Returns the pooled session for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        # sessions of loops shut down by asyncio.run() were closed with them; a loop closed without shutting down its
+        # async generators took its session down unclosed
+        for stale_loop in [stale_loop for stale_loop in self._resources if stale_loop.is_closed()]:
+            if not self._resources.pop(stale_loop).session.closed:
+                warnings.warn("An event loop was closed without closing its NutshellAPI session; use the API as an "
+                              "async context manager or await aclose() before closing the loop", ResourceWarning)
+        resources = self._resources.get(loop)
+        if resources is None or resources.session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, keepalive_timeout=self.keepalive_timeout,
+                                             ttl_dns_cache=self.dns_cache_ttl)
+            trace_configs = [trace_config()] if self.hooks else None
+            session = aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
+            closer = _closed_at_shutdown(session)
+            await closer.__anext__()
+            resources = _LoopResources(session, closer)
+            self._resources[loop] = resources
+        return resources
+
+    async def _execute(self, calls: Sequence[_APIMethod]) -> list[_APIResponse]:
+        """Makes the calls and returns their responses in order, raising the first error among them."""
+        responses = await self._execute_settled(calls)
+        for _, response in responses:
+            if isinstance(response, Exception):
+                raise response
+        return [response for _, response in responses]
+
+    async def _execute_settled(self, calls: Sequence[_APIMethod]) -> list[tuple[_APIMethod, _APIResponse | Exception]]:
+        """Makes the calls, answering what it can from the entity cache, and pairs each with its response or error."""
+        if self.entity_cache is None:
+            return list(zip(calls, await self._coalesced(calls)))
+
+        responses = [self.entity_cache.lookup(call) for call in calls]
+        to_fetch = [call for call, response in zip(calls, responses) if response is None]
+        if to_fetch:
+            fetched = iter(await self._coalesced(to_fetch))
+            for idx, call in enumerate(calls):
+                if responses[idx] is None:
+                    responses[idx] = next(fetched)
+                    if not isinstance(responses[idx], Exception):
+                        self.entity_cache.update(call, responses[idx])
+        return list(zip(calls, responses))
+
+    @staticmethod
+    def _coalesce_key(call: _APIMethod) -> Optional[tuple[str, str]]:
+        if not call.idempotent:
+            return None
+        return call.api_method, json.dumps(call.params, sort_keys=True, default=str)
+
+    async def _coalesced(self, calls: Sequence[_APIMethod]) -> list[_APIResponse | Exception]:
+        """Fetches and parses the calls, sending each distinct read call only once even across concurrent batches."""
+        traces = {} if self.hooks else None
+        if not self.coalesce:
+            return await self._fetch_parsed(calls, traces)
+
+        shared = (await self._loop_resources()).shared_calls
+        loop = asyncio.get_running_loop()
+        futures, owned = [], {}
+        for call in calls:
+            key = self._coalesce_key(call)
+            future = shared.get(key) if key is not None else None
+            if future is None:
+                future = loop.create_future()
+                owned[future] = (call, key)
+                if key is not None:
+                    shared[key] = future
+            else:
+                self.coalesced_calls += 1
+            futures.append(future)
+
+        try:
+            owned_calls = [call for call, _ in owned.values()]
+            if owned_calls:
+                results = await self._fetch_parsed(owned_calls, traces)
+                for future, response in zip(owned, results):
+                    future.set_result(response)
+        except BaseException as error:
+            for future in owned:
+                if future.done():
+                    continue
+                if isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+                    future.exception()  # waiters in other batches see the error; don't log it as unretrieved
+            raise
+        finally:
+            for future, (_, key) in owned.items():
+                if key is not None and shared.get(key) is future:
+                    del shared[key]
+
+        return [await future for future in futures]
+
+    async def _fetch_parsed(self, calls: Sequence[_APIMethod], traces: dict[int, RequestTrace] = None
+                            ) -> list[_APIResponse | Exception]:
+        """Fetches and parses the calls. With a parse_executor each batch is parsed there as soon as it arrives."""
+        if self.parse_executor is None:
+            return self._parse(calls, await self._calling_api(calls, traces), traces)
+        loop = asyncio.get_running_loop()
+
+        async def fetch_and_parse(chunk: Sequence[_APIMethod]) -> list[_APIResponse | Exception]:
+            results = await self._calling_api(chunk, traces)
+            # transport errors stay here; they need no parsing and may not survive pickling
+            fetched = [idx for idx, result in enumerate(results) if not isinstance(result, Exception)]
+            if fetched:
+                parsed, durations = await loop.run_in_executor(
+                    self.parse_executor, _parse_chunk, [chunk[idx] for idx in fetched],
+                    [results[idx] for idx in fetched], self.lazy, self.decoder, traces is not None)
+                for idx, response in zip(fetched, parsed):
+                    results[idx] = response
+                durations = dict(zip(fetched, durations))
+            else:
+                durations = {}
+            return self._finish_parse(chunk, results, [durations.get(idx, 0.0) for idx in range(len(chunk))],
+                                      traces)
+
+        chunks = await asyncio.gather(*(fetch_and_parse(chunk) for chunk in self._batches(calls)))
+        return [response for chunk in chunks for response in chunk]
+
+    async def _calling_api(self, calls: Sequence[_APIMethod], traces: dict[int, RequestTrace] = None
+                           ) -> list[dict | Exception]:
+        """Fetches the raw results of the calls. When a request fails, each of its calls gets the exception instead,
+        so responses which did arrive are kept. ``traces`` collects the RequestTrace of each call, by ``id(call)``."""
+        resources = await self._loop_resources()
+        chunks = self._batches(calls)
+        tasks = [self._resilient_fetch(resources, chunk, traces) for chunk in chunks]
+        batched_responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = []
+        for chunk, batch in zip(chunks, batched_responses):
+            if isinstance(batch, asyncio.CancelledError):
+                raise batch
+            results.extend([batch] * len(chunk) if isinstance(batch, BaseException) else batch)
+        return results
+
+    def _batches(self, calls: Sequence[_APIMethod]) -> list[Sequence[_APIMethod]]:
+        """Splits calls into chunks of at most max_batch_size, preserving call order."""
+        return [calls[idx:idx + self.max_batch_size] for idx in range(0, len(calls), self.max_batch_size)]
+
+    def _circuit_breaker(self, api_method: str) -> CircuitBreaker:
+        breaker = self.circuit_breakers.get(api_method)
+        if breaker is None:
+            policy = self.retry_policy
+            breaker = self.circuit_breakers.setdefault(
+                api_method, CircuitBreaker(api_method, policy.breaker_threshold, policy.breaker_reset))
+        return breaker
+
+    async def _resilient_fetch(self, resources: _LoopResources, calls: Sequence[_APIMethod],
+                               traces: dict[int, RequestTrace] = None) -> list[dict]:
+        """Fetches the calls, retrying transient failures when every call may safely be repeated."""
+        policy = self.retry_policy
+        api_methods = dict.fromkeys(call.api_method for call in calls)
+        breakers = [self._circuit_breaker(api_method) for api_method in api_methods]
+        retryable = policy.retry_mutations or all(call.idempotent for call in calls)
+        attempt = 1
+        while True:
+            trials = admit(breakers)
+            try:
+                responses = await self._throttled_fetch(resources, calls, traces)
+            except Exception as error:
+                transient = policy.is_transient(error)
+                # any error ends a trial as a failure; only transient ones count towards opening a closed circuit
+                for breaker in breakers if transient else trials:
+                    breaker.record_failure()
+                if not transient or not retryable or attempt >= policy.max_attempts:
+                    raise
+                await asyncio.sleep(policy.backoff(attempt, getattr(error, "retry_after", None)))
+                attempt += 1
+            except BaseException:
+                for breaker in trials:
+                    breaker.release_trial()
+                raise
+            else:
+                for breaker in breakers:
+                    breaker.record_success()
+                return responses
+
+    async def _throttled_fetch(self, resources: _LoopResources, calls: Sequence[_APIMethod],
+                               traces: dict[int, RequestTrace] = None) -> list[dict]:
+        """Waits for an in-flight slot and a rate-limit token, then fetches the calls. Retried requests replace the
+        traces of the previous attempt."""
+        queued_at = time.perf_counter()
+        async with self._in_flight:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            sent_at = time.perf_counter()
+            self.throttle_stats.started(sent_at - queued_at)
+            trace = None
+            if traces is not None:
+                trace = RequestTrace(len(calls), queue_wait=sent_at - queued_at, _sent_at=sent_at)
+                traces.update((id(call), trace) for call in calls)
+            try:
+                return await self._fetch_report(resources.session, calls, trace)
+            finally:
+                self.throttle_stats.finished(time.perf_counter() - sent_at)
+
+    def _build_payload(self, call: _APIMethod) -> dict:
+        return {"id": str(next(self._request_ids)),
+                "jsonrpc": "2.0",
+                "method": call.api_method,
+                "params": call.params}
+
+    async def _fetch_report(self, session: "aiohttp.ClientSession", calls: Sequence[_APIMethod],
+                            trace: RequestTrace = None) -> list[dict]:
+        payloads = [self._build_payload(call) for call in calls]
+        # a lone call is sent as a plain JSON-RPC request object, matching the API's non-batch behaviour
+        body = payloads[0] if len(payloads) == 1 else payloads
+        async with session.post(self.URL, auth=self.auth, json=body, trace_request_ctx=trace) as resp:
+            if resp.status >= 400:
+                raise NutshellHTTPError(resp.status, resp.reason, parse_retry_after(resp.headers.get("Retry-After")))
+            body = await resp.read()
+        if trace is not None:
+            trace.body_read(len(body))
+
+        if isinstance(self.parse_executor, ProcessPoolExecutor):
+            # decoded in the worker processes
+            return [RawResponse(body, payload["id"] if len(payloads) > 1 else None) for payload in payloads]
+        if len(payloads) == 1 and self.decoder.defers_single and not self.lazy:
+            return [RawResponse(body)]
+        decode_start = time.perf_counter()
+        data = self.decoder.loads(body)
+        if trace is not None:
+            trace.decode = time.perf_counter() - decode_start
+
+        return self._match_responses(payloads, data)
+
+    @staticmethod
+    def _match_responses(payloads: list[dict], data: dict | list[dict]) -> list[dict]:
+        """Matches JSON-RPC responses to their requests by id, as batch responses may arrive in any order."""
+        if isinstance(data, dict):
+            if len(payloads) == 1 or data.get("id") is None:
+                # single call, or a batch-level error (e.g. unparsable request) which applies to every call
+                return [data] * len(payloads)
+            data = [data]
+
+        by_id = {response.get("id"): response for response in data}
+        missing = {"error": {"code": -32603, "message": "No response returned for request"}}
+        return [by_id.get(payload["id"], missing) for payload in payloads]
+
+    async def _fetch_raw(self, calls: Sequence[_APIMethod], traces: dict[int, RequestTrace] = None) -> list[Any]:
+        """Makes the calls and returns their decoded results without parsing them, raising the first error.
+        ``traces`` collects the RequestTrace of each call, as with ``_calling_api``."""
+        if traces is None and self.hooks:
+            traces = {}
+        results = await self._calling_api(calls, traces)
+        decoded, bodies = [], {}
+        for call, result in zip(calls, results):
+            trace = traces.get(id(call)) if traces is not None else None
+            if isinstance(result, RawResponse):
+                decode_start = time.perf_counter()
+                raw = result
+                result = bodies.get(id(raw.body))
+                if result is None:
+                    result = bodies[id(raw.body)] = self.decoder.loads(raw.body)
+                if raw.request_id is not None:
+                    result = self._match_responses([{"id": raw.request_id}], result)[0]
+                if trace is not None:
+                    trace.decode = time.perf_counter() - decode_start
+            if not isinstance(result, Exception) and "error" in result:
+                result = NutshellRPCError.from_response(result["error"])
+            if trace is not None:
+                self._report(trace.timing(call.api_method, ok=not isinstance(result, Exception)))
+            decoded.append(result if isinstance(result, Exception) else result["result"])
+        for result in decoded:
+            if isinstance(result, Exception):
+                raise result
+        return decoded
+
+    def _report(self, timing: CallTiming):
+        for hook in self.hooks:
+            hook(timing)
+
+    def _parse(self, calls: Sequence[_APIMethod], results: list[dict | RawResponse | Exception],
+               traces: dict[int, RequestTrace] = None) -> list[_APIResponse | Exception]:
+        """Parses the results with this client's options, passing the responses through the identity map if any.
+        With ``traces``, each call is parsed on its own and its timing is reported to the hooks."""
+        if traces is None:
+            responses, durations = self._map_results(calls, results, self.lazy), []
+        else:
+            responses, durations = _parse_chunk(calls, results, self.lazy, self.decoder, True)
+        return self._finish_parse(calls, responses, durations, traces)
+
+    def _finish_parse(self, calls: Sequence[_APIMethod], responses: list[_APIResponse | Exception],
+                      durations: list[float], traces: Optional[dict[int, RequestTrace]]
+                      ) -> list[_APIResponse | Exception]:
+        """Reports the timing of each call to the hooks and passes the responses through the identity map."""
+        if traces is not None:
+            for call, response, validation in zip(calls, responses, durations):
+                trace = traces.get(id(call))
+                if trace is not None:
+                    self._report(trace.timing(call.api_method, validation, not isinstance(response, Exception)))
+        if self.identity_map is not None:
+            responses = [response if isinstance(response, Exception) else self.identity_map.intern_response(response)
+                         for response in responses]
+        return responses
+
+    @staticmethod
+    def _map_results(calls: Sequence[_APIMethod], results: list[dict | RawResponse | Exception],
+                     lazy: bool = False) -> list[_APIResponse | Exception]:
+        """Parses each result into the response class registered for its call. A call which failed, whether in
+        transport, with a JSON-RPC error or in validation, gets its exception in place of a response."""
         call_responses = []
-        for idx, call in enumerate(self._api_calls):
-            match call.api_method:
-                case "findUsers":
-                    call_responses.append(FindUsersResult(**results[idx]))
-                case "getUser":
-                    call_responses.append(GetUserResult(**results[idx]))
-                case "findTeams":
-                    call_responses.append(FindTeamsResult(**results[idx]))
-                case "findActivityTypes":
-                    call_responses.append(FindActivityTypesResult(**results[idx]))
-                case "getAnalyticsReport":
-                    call_responses.append(GetAnalyticsReportResult(**results[idx]))
-                case "findStagesets":
-                    call_responses.append(FindStagesetsResult(**results[idx]))
-                case "findMilestones":
-                    call_responses.append(FindMilestonesResult(**results[idx]))
-                case "findLeads":
-                    call_responses.append(FindLeadsResult(**results[idx]))
-                case "findActivities":
-                    call_responses.append(FindActivitiesResult(**results[idx]))
-                case "newActivity":
-                    call_responses.append(NewActivityResult(**results[idx]))
-                case "getActivity":
-                    call_responses.append(GetActivityResult(**results[idx]))
-                case "editActivity":
-                    call_responses.append(EditActivityResult(**results[idx]))
-                case "deleteActivity":
-                    call_responses.append(DeleteActivityResult(**results[idx]))
-                case "getLead":
-                    call_responses.append(GetLeadResult(**results[idx]))
-                case "editLead":
-                    call_responses.append(EditLeadResult(**results[idx]))
-        return call_responses[0] if len(call_responses) == 1 else call_responses
+        for call, result in zip(calls, results):
+            if isinstance(result, Exception):
+                call_responses.append(result)
+                continue
+            response_class = RESPONSE_CLASSES.get(call.api_method)
+            if response_class is None:
+                call_responses.append(NutshellAPIError(f"No response class registered for {call.api_method}"))
+                continue
+            if isinstance(result, RawResponse):
+                call_responses.append(NutshellAPI._validate_raw(response_class, result))
+                continue
+            if "error" in result:
+                call_responses.append(NutshellRPCError.from_response(result["error"]))
+                continue
+            try:
+                if lazy:
+                    call_responses.append(lazy_response(response_class, result))
+                else:
+                    call_responses.append(response_class(**result))
+            except ValidationError as error:
+                call_responses.append(error)
+        return call_responses
+
+    @staticmethod
+    def _validate_raw(response_class: type[_APIResponse], result: RawResponse) -> _APIResponse | Exception:
+        """Validates a response straight from its JSON bytes, falling back to a dict only to report an error."""
+        try:
+            return response_class.model_validate_json(result.body)
+        except ValidationError as error:
+            try:
+                decoded = json.loads(result.body)
+            except ValueError:
+                return error
+            if isinstance(decoded, dict) and "error" in decoded:
+                return NutshellRPCError.from_response(decoded["error"])
+            return error
@@ -0,0 +1,194 @@
+"""
+This module provides a paginator which walks every page of a paginated Find* method.
+
+Pages are fetched ahead of the consumer, ``prefetch`` at a time, and iteration stops on the first short page. At most
+``prefetch + 1`` pages are held in memory, however many entities the account has.
+
+With an AdaptivePageSize, the ``limit`` of each page is tuned per API method from the response size and latency of
+the pages already fetched: stub pages grow to fewer, larger requests while pages of heavy entities shrink to stay
+within the latency target and size budget. The API numbers pages in multiples of the limit, so each page takes the
+size nearest the target among those its offset is a multiple of: the target itself, a multiple of the previous page
+size when growing or a divisor of it (never below ``min_limit``) when shrinking, or else the previous page size.
+Sizes settle over a few pages.
+
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Iterator, Optional
+
+from pydantic import BaseModel
+
+from nutshell.methods import _APIMethod
+
+if TYPE_CHECKING:
+    from nutshell.nutshell_api import NutshellAPI
+
+
+@dataclass
+class PageSizeStats:
+    """What AdaptivePageSize observed and chose for one API method.
+
+    Attributes
+    ----------
+    limit : page size of the latest page requested.
+    pages : pages observed.
+    entities : entities in those pages.
+    bytes_per_entity : smoothed response bytes per entity.
+    seconds_per_entity : smoothed latency per entity, from sending the request to reading the response body.
+    limits : page size -> pages requested with it.
+    """
+    limit: int
+    pages: int = 0
+    entities: int = 0
+    bytes_per_entity: Optional[float] = None
+    seconds_per_entity: Optional[float] = None
+    limits: dict[int, int] = field(default_factory=dict)
+
+
+class AdaptivePageSize:
+    """Chooses the page size of each paginated method to keep its pages near a latency target and under a size
+    budget, within the page sizes the API serves.
+
+    Attributes
+    ----------
+    target_latency : seconds a page should take, from sending its request to reading its body.
+    max_bytes : response size a page should stay under.
+    min_limit, max_limit : bounds of the page size aimed for; ``max_limit`` is the largest page the API serves.
+    smoothing : weight of each new page in the per-entity estimates.
+    stats : api_method -> PageSizeStats.
+    """
+
+    def __init__(self, target_latency: float = 1.0, max_bytes: int = 2_000_000, min_limit: int = 10,
+                 max_limit: int = 500, smoothing: float = 0.5):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("min_limit must be at least 1 and at most max_limit")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.stats: dict[str, PageSizeStats] = {}
+
+    def target(self, api_method: str, default: int) -> int:
+        """The page size the estimates call for, or ``default`` before any page of the method was observed."""
+        stats = self.stats.get(api_method)
+        if stats is None or stats.bytes_per_entity is None:
+            return max(self.min_limit, min(default, self.max_limit))
+        limit = self.max_limit
+        if stats.bytes_per_entity > 0:
+            limit = min(limit, int(self.max_bytes / stats.bytes_per_entity))
+        if stats.seconds_per_entity > 0:
+            limit = min(limit, int(self.target_latency / stats.seconds_per_entity))
+        return max(self.min_limit, limit)
+
+    def limit(self, api_method: str, offset: int, previous: int) -> int:
+        """Page size of the page starting at ``offset``, which must be a multiple of ``previous`` (the size of the
+        page before) so the page is addressable by page number: the target if the offset is a multiple of it, else
+        the multiple (when growing) or divisor (when shrinking, no smaller than ``min_limit``) of ``previous``
+        nearest the target which the offset is a multiple of, else ``previous``."""
+        target = self.target(api_method, previous)
+        if target >= previous:
+            sizes = range(target // previous * previous, previous, -previous)
+        else:
+            sizes = (size for size in range(target, self.min_limit - 1, -1) if previous % size == 0)
+        limit = next((size for size in (target, *sizes) if offset % size == 0), previous)
+        stats = self.stats.setdefault(api_method, PageSizeStats(limit))
+        stats.limit = limit
+        stats.limits[limit] = stats.limits.get(limit, 0) + 1
+        return limit
+
+    def observe(self, api_method: str, entities: int, response_bytes: int, latency: float):
+        """Records a fetched page. Empty pages tell nothing about the entities and are ignored."""
+        if not entities:
+            return
+        stats = self.stats.setdefault(api_method, PageSizeStats(entities))
+        stats.pages += 1
+        stats.entities += entities
+        stats.bytes_per_entity = self._smoothed(stats.bytes_per_entity, response_bytes / entities)
+        stats.seconds_per_entity = self._smoothed(stats.seconds_per_entity, latency / entities)
+
+    def _smoothed(self, estimate: Optional[float], value: float) -> float:
+        return value if estimate is None else estimate + self.smoothing * (value - estimate)
+
+
+class Paginator:
+    """Iterates the entities of every page of a Find* method, as either an async or a sync iterator.
+
+    The page and limit of the given method are used as the starting page and the page size. With ``raw``, pages are
+    the entities as decoded JSON dicts instead of parsed models. With ``adaptive_paging`` (by default the client's),
+    the size of each later page is chosen by that AdaptivePageSize.
+    """
+
+    def __init__(self, api: "NutshellAPI", method: _APIMethod, prefetch: int = 2, raw: bool = False,
+                 adaptive_paging: AdaptivePageSize = None):
+        if not {"page", "limit"} <= type(method).model_fields.keys():
+            raise ValueError(f"{method.api_method} is not a paginated method")
+        if prefetch < 0:
+            raise ValueError("prefetch must not be negative")
+        self.api = api
+        self.method = method
+        self.prefetch = prefetch
+        self.raw = raw
+        self.adaptive_paging = adaptive_paging if adaptive_paging is not None else api.adaptive_paging
+
+    async def _fetch(self, page_call: _APIMethod) -> list:
+        if self.adaptive_paging is None:
+            if self.raw:
+                return (await self.api._fetch_raw([page_call]))[0]
+            return (await self.api.acall(page_call)).result
+        # fetched with a trace to observe the response size and latency
+        traces = {}
+        if self.raw:
+            entities = (await self.api._fetch_raw([page_call], traces))[0]
+        else:
+            (response,) = await self.api._fetch_parsed([page_call], traces)
+            if isinstance(response, Exception):
+                raise response
+            entities = response.result
+        trace = traces.get(id(page_call))
+        if trace is not None:
+            self.adaptive_paging.observe(page_call.api_method, len(entities), trace.response_bytes, trace.latency)
+        return entities
+
+    async def pages(self) -> AsyncIterator[list[BaseModel] | list[dict]]:
+        """Yields the result of each page in order, keeping up to ``prefetch`` later pages in flight."""
+        offset = (self.method.page - 1) * self.method.limit
+        limit = self.method.limit
+        pending: list[tuple[int, asyncio.Task]] = []
+
+        def schedule():
+            nonlocal offset, limit
+            if self.adaptive_paging is not None:
+                limit = self.adaptive_paging.limit(self.method.api_method, offset, limit)
+            page_call = self.method.model_copy(update={"page": offset // limit + 1, "limit": limit})
+            pending.append((limit, asyncio.ensure_future(self._fetch(page_call))))
+            offset += limit
+
+        try:
+            for _ in range(self.prefetch + 1):
+                schedule()
+            while pending:
+                page_limit, task = pending.pop(0)
+                entities = await task
+                if len(entities) < page_limit:
+                    if entities:
+                        yield entities
+                    return
+                schedule()
+                yield entities
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+    async def __aiter__(self) -> AsyncIterator[BaseModel]:
+        async for entities in self.pages():
+            for entity in entities:
+                yield entity
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for entities in self.api._background_loop().iterate(self.pages()):
+            yield from entities
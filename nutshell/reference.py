@@ -0,0 +1,178 @@
+"""
+This module contains a reference-data layer for the small, rarely changing lists in a Nutshell account: activity types,
+stagesets (pipelines), milestones, teams and users.
+
+The lists are fetched once, kept in memory with lookup maps by id, and optionally persisted to a local JSON file so a
+new process can start warm. Lookups only ever read memory; refreshing happens explicitly or on a background thread.
+
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from nutshell.entities import ActivityType, Stageset, Milestone, Team, User
+from nutshell.methods import FindActivityTypes, FindStagesets, FindMilestones, FindTeams, FindUsers
+from nutshell.pagination import Paginator
+
+if TYPE_CHECKING:
+    from nutshell.nutshell_api import NutshellAPI
+
+logger = logging.getLogger(__name__)
+
+# kind -> (method listing it, entity model)
+_KINDS = {
+    "activity_types": (FindActivityTypes, ActivityType),
+    "stagesets": (FindStagesets, Stageset),
+    "milestones": (FindMilestones, Milestone),
+    "teams": (FindTeams, Team),
+    "users": (FindUsers, User),
+}
+
+
+class ReferenceData:
+    """In-memory reference lists with id lookups, optionally persisted to ``path``.
+
+    Attributes
+    ----------
+    ttl : seconds after which the lists are considered stale and refreshed by the background thread.
+    fetched_at : epoch time of the last successful fetch from the API, or None before the first.
+    """
+
+    def __init__(self, api: "NutshellAPI", path: str | Path = None, ttl: float = 3600, page_size: int = 100):
+        self.api = api
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.page_size = page_size
+        self.fetched_at: Optional[float] = None
+        self._by_id: dict[str, dict[int, BaseModel]] = {kind: {} for kind in _KINDS}
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+
+    @property
+    def activity_types(self) -> list[ActivityType]:
+        return list(self._by_id["activity_types"].values())
+
+    @property
+    def stagesets(self) -> list[Stageset]:
+        return list(self._by_id["stagesets"].values())
+
+    @property
+    def milestones(self) -> list[Milestone]:
+        return list(self._by_id["milestones"].values())
+
+    @property
+    def teams(self) -> list[Team]:
+        return list(self._by_id["teams"].values())
+
+    @property
+    def users(self) -> list[User]:
+        return list(self._by_id["users"].values())
+
+    def activity_type(self, activity_type_id: int) -> Optional[ActivityType]:
+        return self._by_id["activity_types"].get(activity_type_id)
+
+    def activity_type_name(self, activity_type_id: int) -> Optional[str]:
+        activity_type = self.activity_type(activity_type_id)
+        return activity_type.name if activity_type else None
+
+    def stageset(self, stageset_id: int) -> Optional[Stageset]:
+        return self._by_id["stagesets"].get(stageset_id)
+
+    def milestone(self, milestone_id: int) -> Optional[Milestone]:
+        return self._by_id["milestones"].get(milestone_id)
+
+    def team(self, team_id: int) -> Optional[Team]:
+        return self._by_id["teams"].get(team_id)
+
+    def user(self, user_id: int) -> Optional[User]:
+        return self._by_id["users"].get(user_id)
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fetched_at is None or time.time() - self.fetched_at > self.ttl
+
+    def load(self) -> "ReferenceData":
+        """Loads the lists from disk if possible, otherwise from the API. Stale files are still used for a warm start
+        and are refreshed by ``start_refresh`` or an explicit ``refresh``."""
+        if not self._load_file():
+            self.refresh()
+        return self
+
+    def refresh(self):
+        """Fetches every list from the API, replacing the in-memory lists and the file."""
+        self.api._background_loop().run(self.arefresh())
+
+    async def arefresh(self):
+        kinds = list(_KINDS)
+        fetched = await asyncio.gather(*(self._fetch(kind) for kind in kinds))
+        # swap in whole maps so readers never see a partially refreshed list
+        self._by_id = {kind: {entity.id: entity for entity in entities} for kind, entities in zip(kinds, fetched)}
+        self.fetched_at = time.time()
+        self._save_file()
+
+    async def _fetch(self, kind: str) -> list[BaseModel]:
+        # fetched raw and validated here, so the lists are full models whatever the client's parse mode
+        method_class, model = _KINDS[kind]
+        adapter = TypeAdapter(list[model])
+        return [entity async for entities in Paginator(self.api, method_class(limit=self.page_size), raw=True).pages()
+                for entity in adapter.validate_python(entities)]
+
+    def start_refresh(self):
+        """Starts a daemon thread refreshing the lists whenever they become stale."""
+        if self._refresher is not None:
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name="nutshell-reference-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_refresh(self):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            wait = self.ttl
+            if self.is_stale:
+                try:
+                    self.refresh()
+                except Exception:
+                    # keep serving the lists already loaded and try again after another ttl
+                    logger.exception("Refreshing reference data failed")
+            else:
+                wait = self.ttl - (time.time() - self.fetched_at)
+            self._stop.wait(max(0.0, wait))
+
+    def _load_file(self) -> bool:
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            stored = json.loads(self.path.read_text())
+            self._by_id = {
+                kind: {entity.id: entity for entity in TypeAdapter(list[model]).validate_python(stored[kind])}
+                for kind, (_, model) in _KINDS.items()
+            }
+        except (ValueError, KeyError):
+            return False
+        self.fetched_at = stored.get("fetched_at")
+        return True
+
+    def _save_file(self):
+        if self.path is None:
+            return
+        stored = {"fetched_at": self.fetched_at}
+        for kind, entities in self._by_id.items():
+            stored[kind] = [entity.model_dump(mode="json", by_alias=True, exclude_unset=True)
+                            for entity in entities.values()]
+        partial = self.path.with_name(self.path.name + ".tmp")
+        partial.write_text(json.dumps(stored))
+        os.replace(partial, self.path)
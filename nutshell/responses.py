@@ -2,12 +2,12 @@
 This module contains classes that represent the responses from the Nutshell API.
 """
 
-from nutshell.entities import User, Team, ActivityType, AnalyticsReport, Stageset, Milestone, Lead, Activity
+from nutshell.entities import _Model, User, Team, ActivityType, AnalyticsReport, Stageset, Milestone, Lead, Activity
 
 from pydantic import BaseModel
 
 
-class _APIResponse(BaseModel):
+class _APIResponse(_Model):
     """Base class for all API responses."""
     result: list[BaseModel] | BaseModel | bool
 
@@ -0,0 +1,139 @@
+"""
+This module contains the retry policy and circuit breaker used by NutshellAPI to ride out transient API failures.
+
+Only transient failures are retried: connection errors, timeouts, and the HTTP statuses listed on the policy. Methods
+which change data (``idempotent = False`` on the method class) are only retried when the policy opts in.
+
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Sequence
+
+from nutshell.exceptions import NutshellHTTPError, CircuitOpenError
+
+
+@dataclass
+class RetryPolicy:
+    """Retry and circuit breaker settings for a NutshellAPI instance.
+
+    Attributes
+    ----------
+    max_attempts : total attempts per request, including the first.
+    base_delay : backoff before the first retry, doubled on each later retry.
+    max_delay : cap on any single backoff, including one requested by Retry-After.
+    retry_statuses : HTTP statuses treated as transient.
+    retry_mutations : also retry methods which are not idempotent, such as EditLead.
+    breaker_threshold : consecutive failures of a method which open its circuit.
+    breaker_reset : seconds an open circuit waits before letting a trial call through.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: frozenset[int] = field(default_factory=lambda: frozenset({429, 502, 503, 504}))
+    retry_mutations: bool = False
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+
+    def is_transient(self, error: BaseException) -> bool:
+        if isinstance(error, NutshellHTTPError):
+            return error.status in self.retry_statuses
+        import aiohttp  # already loaded by the request which failed
+        return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError))
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (1-based), using full jitter unless the API asked."""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Fails calls fast after ``threshold`` consecutive failures, until ``reset`` seconds have passed.
+
+    Once the reset time has passed a single trial call is let through (half-open); its success closes the circuit and
+    its failure opens it again.
+    """
+
+    def __init__(self, api_method: str, threshold: int = 5, reset: float = 30.0):
+        self.api_method = api_method
+        self.threshold = threshold
+        self.reset = reset
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "open" if time.monotonic() - self._opened_at < self.reset else "half-open"
+
+    def before_call(self) -> bool:
+        """Raises CircuitOpenError unless the call may go ahead. Returns whether the call is the half-open trial, which
+        must end in ``record_success``, ``record_failure`` or ``release_trial``."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset or self._trial_running:
+                raise CircuitOpenError(self.api_method, max(0.0, self.reset - waited))
+            self._trial_running = True
+            return True
+
+    def release_trial(self):
+        """Ends a trial call which neither succeeded nor failed, such as a cancelled one, so the next call can be the
+        trial."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+def admit(breakers: Sequence[CircuitBreaker]) -> list[CircuitBreaker]:
+    """Lets a call through all of the breakers or none of them. Returns the breakers for which the call is the trial;
+    when one breaker refuses the call, the trials taken on the others are released before its error is raised."""
+    trials = []
+    try:
+        for breaker in breakers:
+            if breaker.before_call():
+                trials.append(breaker)
+    except CircuitOpenError:
+        for breaker in trials:
+            breaker.release_trial()
+        raise
+    return trials
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
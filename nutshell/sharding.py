@@ -0,0 +1,160 @@
+"""
+This module fetches every lead matching a FindLeads query as independent shards paged concurrently.
+
+A FindLeads query pages through its leads one page after another, so a full pull takes about as long as its pages do
+in sequence, less what ``prefetch`` overlaps. ``plan_shards`` splits the query on one dimension into a query per
+value, each ANDed with the rest of the query:
+
+- ``status``: one shard per FindLeadsQueryStatus, or the query's own status;
+- ``stageset`` and ``milestone``: one shard per id of the query, or per stageset or milestone of the account;
+- ``assignee``: one shard per user or team of the query, or of the account.
+
+ShardedFindLeads pages the shards ``concurrency`` at a time and merges them back into the method's ``order_by``
+order, keeping the first copy of a lead listed by more than one shard (as a lead moved between shards during the
+pull can be)::
+
+    leads = ShardedFindLeads(api, FindLeads(limit=100, stub_responses=False), by="milestone").fetch()
+
+Shards only cover the leads which have a value of the dimension: leads with another status, or without a milestone or
+an assignee, are not listed by any shard. ``stageset`` and ``status`` cover every lead of a typical account.
+
+"""
+
+import asyncio
+import heapq
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+from nutshell.entities import FindLeadsQuery, FindLeadsQueryStatus, Lead, Team, User
+from nutshell.methods import FindLeads, FindMilestones, FindStagesets, FindTeams, FindUsers
+from nutshell.pagination import Paginator
+
+if TYPE_CHECKING:
+    from nutshell.nutshell_api import NutshellAPI
+
+# dimension -> (values the query already names, query fields of the shard for one value)
+_DIMENSIONS: dict[str, tuple[Callable[[FindLeadsQuery], Optional[list]], Callable[[Any], dict]]] = {
+    "status": (lambda query: None if query.status is None else [query.status],
+               lambda status: {"status": status}),
+    "stageset": (lambda query: query.stageset_ids or ([query.stageset_id] if query.stageset_id else None),
+                 lambda stageset_id: {"stageset_ids": [stageset_id], "stageset_id": None}),
+    "milestone": (lambda query: query.milestone_ids or ([query.milestone_id] if query.milestone_id else None),
+                  lambda milestone_id: {"milestone_ids": [milestone_id], "milestone_id": None}),
+    "assignee": (lambda query: query.assignee or None,
+                 lambda assignee: {"assignee": [assignee]}),
+}
+
+
+def plan_shards(query: Optional[FindLeadsQuery], by: str = "status", values: Sequence = None) -> list[FindLeadsQuery]:
+    """Splits a query into one query per value of the ``by`` dimension. The query's own values are split when it has
+    any, then ``values``; every status is used for ``status`` when neither is given."""
+    if by not in _DIMENSIONS:
+        raise ValueError(f"Unknown dimension {by!r}, expected one of {', '.join(_DIMENSIONS)}")
+    query = query or FindLeadsQuery()
+    query_values, shard_fields = _DIMENSIONS[by]
+    values = query_values(query) or values
+    if values is None:
+        if by != "status":
+            raise ValueError(f"Sharding by {by} needs values when the query has none")
+        values = list(FindLeadsQueryStatus)
+    return [query.model_copy(update=shard_fields(value)) for value in values]
+
+
+def _order_key(order_by: str) -> Callable[[dict], tuple]:
+    def key(entity: dict) -> tuple:
+        value = entity.get(order_by)
+        if isinstance(value, dict):
+            # money fields such as value and normalizedValue are ordered by their amount
+            value = value.get("amount")
+        return value is None, 0 if value is None else value
+    return key
+
+
+class ShardedFindLeads:
+    """Fetches every lead of a FindLeads call as shards of its query paged concurrently.
+
+    Attributes
+    ----------
+    method : the FindLeads call; its limit is the page size of every shard and its order that of the merged leads.
+    by : dimension the query is split on: ``status``, ``stageset``, ``milestone`` or ``assignee``.
+    values : values to split on when the query names none, or None for every one in the account.
+    concurrency : shards paged at once.
+    prefetch : pages each shard keeps in flight (see Paginator).
+    raw : return the leads as decoded JSON dicts instead of models.
+    shards : the shard calls of the last fetch.
+    pages : pages fetched by the last fetch.
+    duplicates : leads dropped by the last fetch because an earlier shard already listed them.
+    """
+
+    def __init__(self, api: "NutshellAPI", method: FindLeads = None, by: str = "status", values: Sequence = None,
+                 concurrency: int = 8, prefetch: int = 1, raw: bool = False):
+        if by not in _DIMENSIONS:
+            raise ValueError(f"Unknown dimension {by!r}, expected one of {', '.join(_DIMENSIONS)}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.api = api
+        self.method = method or FindLeads()
+        self.by = by
+        self.values = values
+        self.concurrency = concurrency
+        self.prefetch = prefetch
+        self.raw = raw
+        self.shards: list[FindLeads] = []
+        self.pages = 0
+        self.duplicates = 0
+
+    async def plan(self) -> list[FindLeads]:
+        """The shard calls, listing the account's stagesets, milestones, users and teams if the values are needed."""
+        values = self.values
+        query = self.method.query or FindLeadsQuery()
+        if values is None and self.by != "status" and _DIMENSIONS[self.by][0](query) is None:
+            values = await self._account_values()
+        return [self.method.model_copy(update={"query": shard, "page": 1})
+                for shard in plan_shards(query, self.by, values)]
+
+    async def _account_values(self) -> list:
+        if self.by == "assignee":
+            users, teams = await asyncio.gather(self._list(FindUsers), self._list(FindTeams))
+            return [User.model_validate(user) for user in users] + [Team.model_validate(team) for team in teams]
+        return [entity["id"] for entity in await self._list(FindStagesets if self.by == "stageset" else FindMilestones)]
+
+    async def _list(self, method_class: type) -> list[dict]:
+        return [entity async for entities in Paginator(self.api, method_class(limit=100), raw=True).pages()
+                for entity in entities]
+
+    def fetch(self) -> list[Lead] | list[dict]:
+        """Fetches and merges every shard, running on the background event loop."""
+        return self.api._background_loop().run(self.afetch())
+
+    async def afetch(self) -> list[Lead] | list[dict]:
+        self.shards = await self.plan()
+        self.pages = self.duplicates = 0
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def shard_leads(shard: FindLeads) -> list[dict]:
+            leads = []
+            async with slots:
+                async for entities in Paginator(self.api, shard, prefetch=self.prefetch, raw=True).pages():
+                    self.pages += 1
+                    leads.extend(entities)
+            return leads
+
+        shard_results = await asyncio.gather(*(shard_leads(shard) for shard in self.shards))
+        leads = self._merge(shard_results)
+        if self.raw:
+            return leads
+        (response,) = self.api._parse([self.method], [{"result": leads}])
+        if isinstance(response, Exception):
+            raise response
+        return response.result
+
+    def _merge(self, shard_results: list[list[dict]]) -> list[dict]:
+        descending = self.method.order_direction.upper() == "DESC"
+        merged = heapq.merge(*shard_results, key=_order_key(self.method.order_by), reverse=descending)
+        leads, seen = [], set()
+        for lead in merged:
+            if lead["id"] in seen:
+                self.duplicates += 1
+                continue
+            seen.add(lead["id"])
+            leads.append(lead)
+        return leads
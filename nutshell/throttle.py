@@ -0,0 +1,132 @@
+"""
+This module contains the client-side throttling used by NutshellAPI: an in-flight request limit, a token-bucket rate
+limiter and the statistics recorded for time spent queued versus time spent on the wire. Both limits are shared by
+every event loop using the instance, such as the background loop of call_api and an application's own loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class InFlightLimit:
+    """Async context manager admitting at most ``limit`` holders at once, across event loops.
+
+    Slots are counted under a thread lock. A released slot is handed to the longest waiting holder, on whichever loop
+    it runs, so waiters are admitted in order.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self._in_use = 0
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_use < self.limit and not self._waiters:
+                self._in_use += 1
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if (loop, waiter) in self._waiters:
+                    self._waiters.remove((loop, waiter))
+                    raise
+            # the slot was handed over as the wait was cancelled; pass it on
+            self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(_wake, waiter)
+                    return
+            self._in_use -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class TokenBucket:
+    """Token-bucket limiter allowing ``rate`` requests per second with bursts of up to ``burst`` requests.
+
+    Tokens are reserved under a thread lock and the caller sleeps off any debt, so a single bucket can be shared by
+    coroutines running on different event loops.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token and returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class ThrottleStats:
+    """Cumulative timings for HTTP requests made by a NutshellAPI instance, in seconds."""
+    requests: int = 0
+    queued_time: float = 0.0
+    wire_time: float = 0.0
+    max_queued_time: float = 0.0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def started(self, queued: float):
+        with self._lock:
+            self.requests += 1
+            self.queued_time += queued
+            self.max_queued_time = max(self.max_queued_time, queued)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finished(self, wire: float):
+        with self._lock:
+            self.in_flight -= 1
+            self.wire_time += wire
+
+    @property
+    def mean_queued_time(self) -> float:
+        return self.queued_time / self.requests if self.requests else 0.0
+
+    @property
+    def mean_wire_time(self) -> float:
+        return self.wire_time / self.requests if self.requests else 0.0
@@ -0,0 +1,48 @@
+import pytest
+
+from nutshell.mock_server import JSONRPCServer, MockNutshell
+from nutshell.nutshell_api import NutshellAPI
+
+
+class FakeNutshell(JSONRPCServer):
+    """JSON-RPC server standing in for the Nutshell API during tests.
+
+    ``handler`` receives the method name and params of each request and returns (or is a coroutine returning) the
+    ``result`` value, or an exception to answer with a JSON-RPC error.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.handler = lambda method, params: {"method": method, "params": params}
+
+    def respond(self, method: str, params: dict):
+        return self.handler(method, params)
+
+
+@pytest.fixture()
+def fake_nutshell():
+    with FakeNutshell() as server:
+        yield server
+
+
+@pytest.fixture()
+def mock_nutshell():
+    with MockNutshell(leads=120, activities=80, users=10, description_size=40) as server:
+        yield server
+
+
+@pytest.fixture()
+def make_api():
+    """Factory of clients pointed at a test server (or the real API without one), closed after the test."""
+    apis = []
+
+    def _make(server=None, **kwargs) -> NutshellAPI:
+        api = NutshellAPI("user", password="key", **kwargs)
+        if server is not None:
+            api.URL = server.url
+        apis.append(api)
+        return api
+
+    yield _make
+    for api in apis:
+        api.close()
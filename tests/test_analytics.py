@@ -0,0 +1,100 @@
+import sys
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from nutshell.analytics import AnalyticsEngine, label
+from nutshell.entities import ActivityType, Team, User
+from nutshell.methods import GetAnalyticsReport
+from nutshell.mock_server import MockNutshell
+from nutshell.retry import RetryPolicy
+
+
+@pytest.fixture()
+def server():
+    with MockNutshell(leads=1, activities=1, users=4) as server:
+        yield server
+
+
+@pytest.fixture()
+def api(server, make_api):
+    return make_api(server, retry_policy=RetryPolicy(max_attempts=1))
+
+
+@pytest.fixture()
+def users(server):
+    return [User.model_validate(user) for user in server.users]
+
+
+def _reports(server) -> int:
+    return sum(1 for body in server.requests if body["method"] == "getAnalyticsReport")
+
+
+def _total(server, call: GetAnalyticsReport, metric: str) -> int:
+    return sum(int(count) for _, count in server.respond(call.api_method, call.params)["seriesData"][metric])
+
+
+def test_grid_shape_and_totals(server, api, users):
+    grid = AnalyticsEngine(api, concurrency=3).grid(users[:3], ["-d7", "-d30"])
+
+    assert grid.values.shape == (3, 2, 2)
+    assert grid.metrics == ["total_effort", "successful_effort"]
+    assert grid.labels == ["Users:1", "Users:2", "Users:3"]
+    expected = _total(server, GetAnalyticsReport(report_type="Effort", period="-d30", filters=[users[1]]),
+                      "successful_effort")
+    assert grid.value(users[1], "-d30", "successful_effort") == expected
+    assert grid.series[1, 1]["successful_effort"].shape == (30, 2)
+    assert grid.fetched == 6 and not grid.errors
+
+
+def test_combined_filters_and_whole_account(server, api, users):
+    activity_type = ActivityType.model_validate(server.activity_types[0])
+    team = Team.model_validate(server.teams[0])
+
+    grid = AnalyticsEngine(api).grid([None, team, (users[0], activity_type)], ["-d7"])
+
+    assert grid.labels == ["all", "Teams:1", "Users:1+Activity_Types:1"]
+    call = GetAnalyticsReport(report_type="Effort", period="-d7", filters=[users[0], activity_type])
+    assert grid.value("Users:1+Activity_Types:1", "-d7", "total_effort") == _total(server, call, "total_effort")
+
+
+def test_overlapping_grids_reuse_cells(server, api, users):
+    engine = AnalyticsEngine(api)
+    engine.grid(users[:2], ["-d7"])
+
+    grid = engine.grid(users[:3], ["-d7", "-d30"])
+
+    assert (grid.fetched, grid.cached) == (4, 2)
+    assert _reports(server) == 6
+    assert (engine.hits, engine.misses) == (2, 6)
+
+
+def test_expired_cells_are_fetched_again(server, api, users):
+    engine = AnalyticsEngine(api, ttl=0)
+    engine.grid(users[:1], ["-d7"])
+    engine.grid(users[:1], ["-d7"])
+
+    assert _reports(server) == 2
+
+
+def test_failed_cells_are_nan(server, api, users):
+    server.failures = [503]
+
+    grid = AnalyticsEngine(api, concurrency=1).grid(users[:2], ["-d7"])
+
+    assert list(grid.errors) == [(0, 0)]
+    assert numpy.isnan(grid.values[0, 0]).all()
+    assert grid.values[1, 0, 0] > 0
+    assert AnalyticsEngine(api).grid(users[:1], ["-d7"]).fetched == 1  # the failure was not cached
+
+
+def test_label():
+    assert label(None) == "all"
+
+
+def test_numpy_is_required(api, monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    with pytest.raises(ImportError, match=r'pip install "nutshell\[numpy\]"'):
+        AnalyticsEngine(api)
@@ -0,0 +1,17 @@
+from benchmarks.harness import percentile, regressions
+
+
+def test_percentile():
+    samples = [float(value) for value in range(1, 101)]
+
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([3.0], 90) == 3.0
+
+
+def test_regressions_respect_metric_direction():
+    baseline = {"results": {"bench": {"calls_per_s": 100.0, "best_s": 1.0, "p99_s": 1.0}}}
+    current = {"results": {"bench": {"calls_per_s": 70.0, "best_s": 1.1, "p99_s": 0.5}, "new": {"best_s": 9.0}}}
+
+    assert regressions(baseline, current, threshold=0.2) == ["bench.calls_per_s: 100 -> 70 (+30%)"]
+    assert regressions(baseline, current, threshold=0.5) == []
@@ -0,0 +1,152 @@
+import pytest
+
+from nutshell.bulk import BulkEditor, EditPlanner
+from nutshell.cache import EntityCache
+from nutshell.exceptions import NutshellRPCError
+from nutshell.methods import GetActivity, GetLead
+from nutshell.mock_server import MockNutshell
+
+
+@pytest.fixture()
+def server():
+    with MockNutshell(leads=40, activities=20, users=5, description_size=10) as server:
+        yield server
+
+
+@pytest.fixture()
+def api(server, make_api):
+    return make_api(server)
+
+
+def _methods(server) -> list[str]:
+    return [item["method"] for body in server.requests for item in (body if isinstance(body, list) else [body])]
+
+
+def test_edits_with_known_revs(server, api):
+    revs = {lead["id"]: lead["rev"] for lead in server.leads}
+    assignee = {"entityType": "Users", "id": 3}
+
+    outcomes = BulkEditor(api, concurrency=5).run([(lead_id, {"assignee": assignee}) for lead_id in range(1, 31)],
+                                                  revs=revs)
+
+    assert [outcome.entity_id for outcome in outcomes] == list(range(1, 31))
+    assert all(outcome.ok and outcome.attempts == 1 for outcome in outcomes)
+    assert all(outcome.response.result.assignee.id == 3 for outcome in outcomes)
+    assert _methods(server).count("getLead") == 0
+    assert server.edits == 30
+
+
+def test_unknown_revs_are_fetched(server, api):
+    outcomes = BulkEditor(api).run([(2, {"name": "Two"}), (4, {"name": "Four"})])
+
+    assert [outcome.response.result.name for outcome in outcomes] == ["Two", "Four"]
+    assert _methods(server).count("getLead") == 2
+
+
+def test_conflicts_are_resolved_per_item(server, api):
+    revs = {lead["id"]: lead["rev"] for lead in server.leads}
+    server.modify(server.leads[2])  # lead 3 changed since its rev was read
+
+    outcomes = BulkEditor(api).run([(lead_id, {"confidence": 90}) for lead_id in (1, 2, 3, 4)], revs=revs)
+
+    assert all(outcome.ok for outcome in outcomes)
+    assert [outcome.conflicts for outcome in outcomes] == [0, 0, 1, 0]
+    assert outcomes[2].attempts == 2
+    assert server.leads[2]["confidence"] == 90
+
+
+def test_patch_function_sees_current_entity(server, api):
+    server.modify(server.leads[0], tags=["first"])
+
+    (outcome,) = BulkEditor(api).run([(1, lambda lead: {"tags": [*lead.tags, "bulk"]})], revs={1: "0"})
+
+    assert outcome.ok
+    assert server.leads[0]["tags"] == ["first", "bulk"]
+
+
+def test_persistent_conflict_is_reported(server, api):
+    (outcome,) = BulkEditor(api, max_attempts=1).run([(1, {"name": "x"})], revs={1: "stale"})
+
+    assert not outcome.ok
+    assert isinstance(outcome.error, NutshellRPCError) and outcome.error.is_rev_conflict
+
+
+def test_failures_do_not_stop_other_items(server, api):
+    outcomes = BulkEditor(api).run([(1, {"name": "ok"}), (10_000, {"name": "missing"}), (2, {"name": "ok"})])
+
+    assert [outcome.ok for outcome in outcomes] == [True, False, True]
+    assert isinstance(outcomes[1].error, NutshellRPCError)
+
+
+def test_uses_entity_cache_revs(server, make_api):
+    with make_api(server, entity_cache=EntityCache()) as api:
+        editor = BulkEditor(api, kind="activities")
+        editor.run([(1, {"status": 1})])
+        server.requests.clear()
+
+        (outcome,) = editor.run([(1, {"status": 2})])
+
+    assert outcome.ok and outcome.response.result.status == 2
+    assert _methods(server) == ["editActivity"]
+
+
+def test_unknown_kind(make_api):
+    with pytest.raises(ValueError):
+        BulkEditor(make_api(), kind="users")
+
+
+def _get(api, call):
+    api.api_calls = call
+    return api.call_api().result
+
+
+def test_planner_sends_only_changed_fields(server, api):
+    lead = _get(api, GetLead(lead_id=1))
+    planner = EditPlanner()
+
+    call = planner.edit(lead, {"name": lead.name, "confidence": 17, "due_time": lead.due_time})
+
+    assert call.params["lead"] == {"confidence": 17}
+    assert (planner.planned, planner.avoided, planner.fields_dropped) == (1, 0, 2)
+
+
+def test_planner_skips_unchanged_state(server, api):
+    lead = _get(api, GetLead(lead_id=1))
+    planner = EditPlanner()
+
+    assert planner.edit(lead, {"assignee": {"entityType": lead.assignee.entity_type, "id": lead.assignee.id}}) is None
+    assert planner.edit(lead, lead.model_copy()) is None
+    assert planner.avoided == 2 and planner.planned == 0
+
+
+def test_planner_accepts_desired_model(server, api):
+    activity = _get(api, GetActivity(activity_id=1))
+    desired = activity.model_copy(update={"name": "Renamed"})
+    desired.__pydantic_fields_set__ = {"name", "description"}
+
+    call = EditPlanner().edit(activity, desired)
+
+    assert call.params == {"activityId": 1, "rev": activity.rev, "activity": {"name": "Renamed"}}
+
+
+def test_no_op_edits_are_skipped(server, api):
+    server.modify(server.leads[0], confidence=50)
+    server.modify(server.leads[1], confidence=10)
+    editor = BulkEditor(api)
+
+    outcomes = editor.run([(1, {"confidence": 50}), (2, {"confidence": 50})])
+
+    assert [outcome.skipped for outcome in outcomes] == [True, False]
+    assert all(outcome.ok for outcome in outcomes)
+    assert [outcome.attempts for outcome in outcomes] == [0, 1]
+    assert server.edits == editor.planner.planned == 1 and editor.planner.avoided == 1
+
+
+def test_planning_on_a_lazy_client(server, make_api):
+    server.modify(server.leads[0], confidence=50)
+    with make_api(server, lazy=True) as api:
+        outcomes = BulkEditor(api).run([(1, {"confidence": 50}), (2, lambda lead: {"name": lead.name + "!"})])
+
+    assert [outcome.skipped for outcome in outcomes] == [True, False]
+    assert all(outcome.ok for outcome in outcomes)
+    assert server.leads[1]["name"].endswith("!")
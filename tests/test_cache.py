@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from nutshell.cache import EntityCache
+from nutshell.entities import Lead, Activity
+from nutshell.methods import GetLead, EditLead, GetUser, FindTeams, DeleteActivity
+from nutshell.responses import DeleteActivityResult
+
+
+def _lead(lead_id: int, rev: str = "1", name: str = None) -> dict:
+    return {"id": lead_id, "entityType": "Leads", "rev": rev, "name": name or f"Lead {lead_id}", "description": "",
+            "status": 0}
+
+
+@pytest.fixture()
+def lead_server(fake_nutshell):
+    revs = {}
+
+    def handler(method, params):
+        if method == "editLead":
+            revs[params["leadId"]] = str(int(params["rev"]) + 1)
+            return _lead(params["leadId"], revs[params["leadId"]], params["lead"]["name"])
+        return _lead(params["leadId"], revs.get(params["leadId"], "1"))
+
+    fake_nutshell.handler = handler
+    return fake_nutshell
+
+
+@pytest.fixture()
+def api(lead_server, make_api):
+    return make_api(lead_server, entity_cache=EntityCache())
+
+
+def test_repeated_get_served_from_cache(api, lead_server):
+    api.api_calls = GetLead(lead_id=1)
+    first = api.call_api()
+    second = api.call_api()
+
+    assert second.result is first.result
+    assert len(lead_server.requests) == 1
+    assert (api.entity_cache.hits, api.entity_cache.misses) == (1, 1)
+
+
+def test_mixed_hits_and_misses_keep_order(api, lead_server):
+    api.api_calls = GetLead(lead_id=2)
+    api.call_api()
+    api.api_calls = [GetLead(lead_id=1), GetLead(lead_id=2), GetLead(lead_id=3)]
+    results = api.call_api()
+
+    assert [result.result.id for result in results] == [1, 2, 3]
+    assert len(lead_server.requests) == 3
+
+
+def test_edit_replaces_cached_revision(api, lead_server):
+    api.api_calls = GetLead(lead_id=1)
+    api.call_api()
+    api.api_calls = EditLead(lead_id=1, rev="1", lead={"name": "Renamed"})
+    api.call_api()
+    api.api_calls = GetLead(lead_id=1)
+    cached = api.call_api()
+
+    assert (cached.result.rev, cached.result.name) == ("2", "Renamed")
+    assert len(lead_server.requests) == 2
+
+
+def test_older_revision_does_not_replace():
+    cache = EntityCache()
+    cache.put(Lead(**_lead(1, rev="5")))
+    cache.put(Lead(**_lead(1, rev="4")))
+
+    assert cache.get("Leads", 1).rev == "5"
+
+
+def test_ttl_expiry():
+    cache = EntityCache(ttl=0.01)
+    cache.put(Lead(**_lead(1)))
+    time.sleep(0.02)
+
+    assert cache.get("Leads", 1) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = EntityCache(max_entries=2)
+    for lead_id in (1, 2):
+        cache.put(Lead(**_lead(lead_id)))
+    cache.get("Leads", 1)
+    cache.put(Lead(**_lead(3)))
+
+    assert cache.get("Leads", 2) is None
+    assert cache.get("Leads", 1) is not None
+
+
+def test_uncacheable_calls():
+    cache = EntityCache()
+
+    assert cache.lookup(GetUser()) is None
+    assert cache.lookup(FindTeams()) is None
+    assert cache.misses == 0
+
+
+def test_delete_invalidates():
+    cache = EntityCache()
+    cache.put(Activity(id=9, entityType="Activities", rev="1", name="Call", startTime="", endTime="", isAllDay=False,
+                       isFlagged=False, status=0, modifiedTime="", createdTime=""))
+    cache.update(DeleteActivity(activity_id=9, rev="1"), DeleteActivityResult(result=True))
+
+    assert cache.get("Activities", 9) is None
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from nutshell.exceptions import NutshellHTTPError
+from nutshell.methods import GetLead, EditLead, FindStagesets
+
+
+def _lead(lead_id: int) -> dict:
+    return {"id": lead_id, "entityType": "Leads", "rev": "1", "name": f"Lead {lead_id}", "description": "",
+            "status": 0}
+
+
+@pytest.fixture()
+def lead_server(fake_nutshell):
+    fake_nutshell.handler = lambda method, params: _lead(params["leadId"]) if "leadId" in params else []
+    return fake_nutshell
+
+
+def test_duplicates_in_one_batch_share_a_request(make_api, lead_server):
+    api = make_api(lead_server)
+    api.api_calls = [GetLead(lead_id=1), GetLead(lead_id=2), GetLead(lead_id=1), FindStagesets(), FindStagesets()]
+    first, second, duplicate, stagesets, duplicate_stagesets = api.call_api()
+
+    assert duplicate is first
+    assert duplicate_stagesets is stagesets
+    assert second.result.id == 2
+    assert len(lead_server.requests) == 3
+    assert api.coalesced_calls == 2
+
+
+def test_concurrent_batches_share_a_request(make_api, lead_server):
+    lead_server.latency = 0.05
+    api = make_api(lead_server)
+
+    async def run():
+        return await asyncio.gather(api.acall(GetLead(lead_id=5)), api.acall([GetLead(lead_id=5), GetLead(lead_id=6)]))
+
+    single, (shared, other) = asyncio.run(run())
+
+    assert shared is single
+    assert other.result.id == 6
+    assert len(lead_server.requests) == 2
+    assert api.coalesced_calls == 1
+
+
+def test_sequential_calls_are_not_coalesced(make_api, lead_server):
+    api = make_api(lead_server)
+    api.api_calls = GetLead(lead_id=1)
+    api.call_api()
+    api.call_api()
+
+    assert len(lead_server.requests) == 2
+    assert api.coalesced_calls == 0
+
+
+def test_mutations_are_never_coalesced(make_api, lead_server):
+    api = make_api(lead_server)
+    edit = {"lead_id": 1, "rev": "1", "lead": {"name": "Renamed"}}
+    api.api_calls = [EditLead(**edit), EditLead(**edit)]
+    api.call_api()
+
+    assert len(lead_server.requests) == 2
+    assert api.coalesced_calls == 0
+
+
+def test_coalescing_disabled(make_api, lead_server):
+    api = make_api(lead_server, coalesce=False)
+    api.api_calls = [GetLead(lead_id=1), GetLead(lead_id=1)]
+    first, duplicate = api.call_api()
+
+    assert duplicate is not first
+    assert len(lead_server.requests) == 2
+
+
+def test_shared_failure_reaches_every_waiter(make_api, lead_server):
+    lead_server.failures = [500]
+    api = make_api(lead_server)
+    api.api_calls = [GetLead(lead_id=1), GetLead(lead_id=1)]
+
+    with pytest.raises(NutshellHTTPError):
+        api.call_api()
+    assert api._resources[api._background.loop].shared_calls == {}
@@ -0,0 +1,113 @@
+import json
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from nutshell.columnar import MISSING, ActivityColumns, LeadColumns
+from nutshell.methods import FindActivities, FindLeads, FindTeams
+from nutshell.responses import FindActivitiesResult, FindLeadsResult
+
+FIXTURES = Path(__file__).parent
+
+
+def _fixture(name: str) -> list[dict]:
+    return json.loads((FIXTURES / name).read_text())["result"]
+
+
+def _epoch(timestamp: str) -> int:
+    return int(datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+
+
+def test_lead_columns_match_models():
+    raw = _fixture("findLeadsNonStub.json")
+    leads = FindLeadsResult(result=raw).result
+    table = LeadColumns.from_json(raw)
+
+    assert len(table) == len(leads)
+    assert list(table["id"]) == [lead.id for lead in leads]
+    assert list(table["status"]) == [lead.status for lead in leads]
+    assert list(table["milestone_id"]) == [lead.milestone.id if lead.milestone else MISSING for lead in leads]
+    assert list(table["assignee_id"]) == [lead.assignee.id if lead.assignee else MISSING for lead in leads]
+    assert list(table["due_time"]) == [_epoch(lead.due_time) if lead.due_time else MISSING for lead in leads]
+    assert list(table["value_amount"]) == [float(lead.value["amount"]) for lead in leads]
+
+
+def test_activity_columns_match_models():
+    raw = _fixture("findActivitiesNonStub.json")
+    activities = FindActivitiesResult(result=raw).result
+    table = ActivityColumns.from_json(raw)
+
+    assert list(table["activity_type_id"]) == [activity.activity_type.id for activity in activities]
+    assert list(table["start_time"]) == [_epoch(activity.start_time) for activity in activities]
+    assert list(table["is_flagged"]) == [int(activity.is_flagged) for activity in activities]
+
+
+def test_stub_entities_have_missing_values():
+    table = LeadColumns.from_json(_fixture("findLeadsStub.json"))
+
+    assert set(table["milestone_id"]) == {MISSING}
+    assert set(table["confidence"]) == {MISSING}
+    assert all(math.isnan(amount) for amount in table["normalized_value_amount"])
+
+
+def test_missing_is_not_an_overdue_status():
+    table = ActivityColumns.from_json([{"id": 1, "status": -1, "startTime": "1969-12-31T23:59:59+0000"}, {"id": 2}])
+
+    assert list(table["status"]) == [-1, MISSING]
+    assert list(table["start_time"]) == [-1, MISSING]
+
+
+def test_to_numpy_shares_memory():
+    numpy = pytest.importorskip("numpy")
+    table = LeadColumns.from_json(_fixture("findLeadsNonStub.json"))
+    columns = table.to_numpy()
+
+    assert columns["id"].dtype == numpy.int64
+    assert columns["value_amount"].dtype == numpy.float64
+    table["status"][0] = 42
+    assert columns["status"][0] == 42
+
+
+def test_empty_table_to_numpy():
+    pytest.importorskip("numpy")
+    assert LeadColumns().to_numpy()["id"].shape == (0,)
+
+
+def test_numpy_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    with pytest.raises(ImportError, match=r'pip install "nutshell\[numpy\]"'):
+        LeadColumns().to_numpy()
+
+
+def test_extend_requires_same_table():
+    with pytest.raises(TypeError):
+        LeadColumns().extend(ActivityColumns())
+
+
+def test_columns_across_pages(mock_nutshell, make_api):
+    pytest.importorskip("numpy")
+    with make_api(mock_nutshell) as api:
+        table = api.columns(FindLeads(limit=25, stub_responses=False))
+
+    assert list(table["id"]) == [lead["id"] for lead in mock_nutshell.leads]
+    columns = table.to_numpy()
+    open_value = columns["value_amount"][columns["status"] == 0].sum()
+    expected = sum(lead["value"]["amount"] for lead in mock_nutshell.leads if lead["status"] == 0)
+    assert open_value == pytest.approx(expected)
+
+
+def test_columns_with_deferred_decoder(mock_nutshell, make_api):
+    with make_api(mock_nutshell, decoder="pydantic") as api:
+        table = api.columns(FindActivities(limit=30, stub_responses=False))
+
+    assert len(table) == len(mock_nutshell.activities)
+
+
+def test_columns_unsupported_method(make_api):
+    with make_api() as api:
+        with pytest.raises(ValueError):
+            api.columns(FindTeams())
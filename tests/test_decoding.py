@@ -0,0 +1,66 @@
+import sys
+
+import pytest
+
+from nutshell.decoding import get_decoder, Decoder, PydanticDecoder, OrjsonDecoder, RawResponse
+from nutshell.exceptions import NutshellRPCError
+from nutshell.methods import FindActivities, GetLead
+from nutshell.nutshell_api import NutshellAPI
+
+
+@pytest.fixture()
+def fetch(mock_nutshell, make_api):
+    def _fetch(decoder, calls, **kwargs):
+        with make_api(mock_nutshell, decoder=decoder, **kwargs) as api:
+            api.api_calls = calls
+            return api.call_api()
+
+    return _fetch
+
+
+@pytest.mark.parametrize("decoder", ["orjson", "pydantic"])
+def test_decoders_match_stdlib(fetch, decoder):
+    calls = [FindActivities(stub_responses=False, limit=20)]
+
+    assert fetch(decoder, calls) == fetch("json", calls)
+
+
+def test_pydantic_decoder_batches(fetch):
+    calls = [GetLead(lead_id=1), GetLead(lead_id=2)]
+
+    assert fetch("pydantic", calls, max_batch_size=2) == fetch("json", calls)
+
+
+def test_pydantic_decoder_reports_rpc_errors(fetch):
+    with pytest.raises(NutshellRPCError):
+        fetch("pydantic", GetLead(lead_id=10_000))
+
+
+def test_pydantic_decoder_with_lazy(fetch):
+    lead = fetch("pydantic", GetLead(lead_id=4), lazy=True)
+
+    assert lead.result.id == 4
+
+
+def test_raw_response_validation():
+    from nutshell.responses import DeleteActivityResult
+
+    assert NutshellAPI._validate_raw(DeleteActivityResult, RawResponse(b'{"result": true}')).result is True
+    assert isinstance(NutshellAPI._validate_raw(DeleteActivityResult, RawResponse(b'{not json')), Exception)
+
+
+def test_get_decoder():
+    assert type(get_decoder("json")) is Decoder
+    assert isinstance(get_decoder("pydantic"), PydanticDecoder)
+    decoder = Decoder()
+    assert get_decoder(decoder) is decoder
+    with pytest.raises(ValueError):
+        get_decoder("simdjson")
+
+
+def test_orjson_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    with pytest.raises(ImportError):
+        OrjsonDecoder()
+    assert get_decoder("pydantic").loads(b"[1]") == [1]
@@ -0,0 +1,93 @@
+import pytest
+
+from nutshell.exceptions import NutshellRPCError
+from nutshell.instrumentation import CallTiming, Histogram, HistogramCollector
+from nutshell.methods import FindLeads, GetLead, GetUser
+from nutshell.mock_server import MockNutshell
+
+
+@pytest.fixture()
+def server():
+    with MockNutshell(leads=30, activities=10, users=5) as server:
+        yield server
+
+
+def test_hooks_receive_call_timings(server, make_api):
+    timings = []
+    with make_api(server, hooks=[timings.append]) as api:
+        api.api_calls = [GetUser(user_id=1), FindLeads(limit=30, stub_responses=False)]
+        api.call_api()
+
+    assert [timing.api_method for timing in timings] == ["getUser", "findLeads"]
+    first, second = timings
+    assert first.ok and first.batch_size == 1
+    assert second.response_bytes > first.response_bytes > 0
+    assert second.validation > 0 and second.decode > 0
+    assert all(timing.first_byte > 0 and timing.transfer >= 0 for timing in timings)
+    # one of the two concurrent requests opened a connection
+    assert any(timing.connect > 0 for timing in timings)
+
+
+def test_batch_calls_share_request_timings(server, make_api):
+    timings = []
+    with make_api(server, max_batch_size=5, hooks=[timings.append]) as api:
+        api.api_calls = [GetLead(lead_id=lead_id) for lead_id in range(1, 4)]
+        api.call_api()
+
+    assert {timing.batch_size for timing in timings} == {3}
+    assert len({(timing.first_byte, timing.response_bytes, timing.decode) for timing in timings}) == 1
+
+
+def test_failed_calls_are_reported(server, make_api):
+    collector = HistogramCollector()
+    with make_api(server, hooks=[collector]) as api:
+        api.api_calls = GetLead(lead_id=10_000)
+        with pytest.raises(NutshellRPCError):
+            api.call_api()
+
+    assert collector.errors == {"getLead": 1}
+
+
+def test_raw_fetches_are_reported(server, make_api):
+    collector = HistogramCollector()
+    with make_api(server, hooks=[collector]) as api:
+        # without prefetch no page is requested past the empty one, however fast the pages arrive
+        table = api.columns(FindLeads(limit=10, stub_responses=False), prefetch=0)
+
+    assert len(table) == 30
+    assert collector.histograms["findLeads", "transfer"].count == 4  # three full pages and an empty one
+    assert collector.histograms["findLeads", "validation"].total == 0
+
+
+def test_no_hooks_no_tracing(server, make_api):
+    with make_api(server) as api:
+        api.api_calls = GetUser(user_id=1)
+        assert api.call_api().result.id == 1
+        (resources,) = api._resources.values()
+        assert not resources.session.trace_configs
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 50, 500):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5 and histogram.total == 556.5
+    assert histogram.quantile(0.5) == 10
+    assert histogram.quantile(1) == float("inf")
+
+
+def test_collector_text_export():
+    collector = HistogramCollector(seconds_buckets=(0.01, 0.1), bytes_buckets=(1000,))
+    collector(CallTiming("getLead", first_byte=0.05, validation=0.002, response_bytes=500))
+    collector(CallTiming("getLead", first_byte=0.2, response_bytes=5000, ok=False))
+
+    text = collector.export_text()
+
+    assert '# TYPE nutshell_call_seconds histogram' in text
+    assert 'nutshell_call_seconds_bucket{method="getLead",phase="first_byte",le="0.1"} 1' in text
+    assert 'nutshell_call_seconds_bucket{method="getLead",phase="first_byte",le="+Inf"} 2' in text
+    assert 'nutshell_call_seconds_sum{method="getLead",phase="first_byte"} 0.25' in text
+    assert 'nutshell_response_bytes_count{method="getLead"} 2' in text
+    assert 'nutshell_call_errors_total{method="getLead"} 1' in text
@@ -0,0 +1,87 @@
+import gc
+import json
+
+from nutshell.entities import Lead
+from nutshell.interning import IdentityMap
+from nutshell.methods import FindActivities, FindLeads
+from nutshell.nutshell_api import NutshellAPI
+
+
+def _parse(server, method):
+    raw = json.loads(json.dumps({"result": server.respond(method.api_method, method.params)}))
+    (response,) = NutshellAPI._map_results([method], [raw])
+    return response
+
+
+def test_repeated_entities_are_shared(mock_nutshell):
+    activities = _parse(mock_nutshell, FindActivities(limit=80, stub_responses=False)).result
+    identity_map = IdentityMap()
+    strict = [activity.model_dump() for activity in activities]
+
+    for activity in activities:
+        identity_map.intern(activity)
+
+    by_type = {}
+    for activity in activities:
+        assert by_type.setdefault(activity.activity_type.id, activity.activity_type) is activity.activity_type
+        assert activity.leads[0] is activity.lead
+    assert identity_map.shared > 0
+    assert [activity.model_dump() for activity in activities] == strict
+
+
+def test_shared_across_responses(mock_nutshell):
+    identity_map = IdentityMap()
+    first = identity_map.intern_response(_parse(mock_nutshell, FindLeads(limit=50, stub_responses=False)))
+    second = identity_map.intern_response(_parse(mock_nutshell, FindLeads(limit=50, stub_responses=False)))
+
+    assert all(a is b for a, b in zip(first.result, second.result))
+
+
+def test_different_revs_and_stubs_are_kept_apart():
+    lead = {"id": 1, "entityType": "Leads", "rev": "1", "name": "Lead", "description": "", "status": 0}
+    identity_map = IdentityMap()
+    original = identity_map.intern(Lead(**lead))
+
+    assert identity_map.intern(Lead(**lead)) is original
+    assert identity_map.intern(Lead(**lead | {"rev": "2"})) is not original
+    assert identity_map.intern(Lead(**lead | {"stub": True})) is not original
+
+
+def test_strings_are_interned(mock_nutshell):
+    leads = IdentityMap().intern_response(_parse(mock_nutshell, FindLeads(limit=20, stub_responses=False))).result
+
+    tags = {}
+    for lead in leads:
+        assert lead.entity_type is leads[0].entity_type
+        for tag in lead.tags:
+            assert tags.setdefault(tag, tag) is tag
+
+
+def test_long_strings_are_left_alone():
+    first, second = "".join(["alpha", "bravo"]), "".join(["alpha", "bravo"])
+    assert first is not second
+
+    assert IdentityMap(max_string_length=5).intern(second) is second
+    assert IdentityMap().intern(first) is IdentityMap().intern(second)
+
+
+def test_entities_are_held_weakly(mock_nutshell):
+    identity_map = IdentityMap()
+    identity_map.intern_response(_parse(mock_nutshell, FindLeads(limit=20, stub_responses=False)))
+    gc.collect()
+
+    assert len(identity_map) == 0
+
+
+def test_client_identity_map(mock_nutshell, make_api):
+    identity_map = IdentityMap()
+    with make_api(mock_nutshell, identity_map=identity_map) as api:
+        api.api_calls = [FindActivities(stub_responses=False, limit=40), FindActivities(stub_responses=False,
+                                                                                        limit=40, page=2)]
+        first, second = api.call_api()
+
+    creators = {}
+    for activity in first.result + second.result:
+        creator = activity.lead.creator
+        assert creators.setdefault(creator.id, creator) is creator
+    assert identity_map.shared > 0
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from nutshell.entities import Activity, Lead, User
+from nutshell.lazy import LazyEntity, LazyList, lazy_response
+from nutshell.methods import FindActivities, GetLead
+from nutshell.responses import FindActivitiesResult, FindLeadsResult, DeleteActivityResult
+
+FIXTURES = Path(__file__).parent
+
+
+def _fixture(name: str) -> dict:
+    return json.loads((FIXTURES / name).read_text())
+
+
+def test_lazy_fields_match_strict():
+    raw = _fixture("findActivitiesNonStub.json")
+    strict = FindActivitiesResult(**raw)
+    lazy = lazy_response(FindActivitiesResult, raw)
+
+    assert isinstance(lazy.result, LazyList)
+    assert len(lazy.result) == len(strict.result)
+    for lazy_activity, activity in zip(lazy.result, strict.result):
+        assert lazy_activity.id == activity.id
+        assert lazy_activity.name == activity.name
+        assert lazy_activity.activity_type.name == activity.activity_type.name
+        assert lazy_activity.start_time == activity.start_time
+        assert lazy_activity.model() == activity
+
+
+def test_nested_entities_are_lazy():
+    raw = _fixture("findLeadsNonStub.json")
+    lead = lazy_response(FindLeadsResult, raw).result[0]
+
+    assert isinstance(lead.creator, LazyEntity)
+    assert lead.creator.name == FindLeadsResult(**raw).result[0].creator.name
+    assert lead.tags == Lead(**raw["result"][0]).tags
+
+
+def test_validation_happens_on_access():
+    raw = {"id": 1, "entityType": "Teams", "rev": "1", "name": "Not a user", "isEnabled": True,
+           "isAdministrator": False, "emails": [], "modifiedTime": "", "createdTime": ""}
+    user = LazyEntity(User, raw)
+
+    assert user.name == "Not a user"
+    with pytest.raises(ValidationError):
+        user.entity_type
+
+
+def test_missing_required_field_raises():
+    with pytest.raises(ValidationError):
+        LazyEntity(Lead, {"id": 1}).status
+
+
+def test_defaults_for_absent_fields():
+    activity = LazyEntity(Activity, _fixture("findActivitiesStub.json")["result"][0])
+
+    assert activity.follow_up is None
+
+
+def test_non_entity_results_validated_eagerly():
+    assert lazy_response(DeleteActivityResult, {"result": True}).result is True
+
+
+def test_lazy_client(mock_nutshell, make_api):
+    with make_api(mock_nutshell, lazy=True) as api:
+        api.api_calls = [FindActivities(stub_responses=False, limit=5), GetLead(lead_id=3)]
+        activities, lead = api.call_api()
+
+    assert len(activities.result) == 5
+    assert activities.result[0].lead.milestone.entity_type == "Milestones"
+    assert lead.result.id == 3
@@ -206,3 +206,32 @@ def test_edit_lead():
     edit_lead = EditLead(lead_id=1, rev="1", lead={"name": "New Name"})
 
     assert edit_lead.params == {"leadId": 1, "rev": "1", "lead": {"name": "New Name"}}
+
+
+def test_response_registry_covers_methods():
+    from nutshell.methods import RESPONSE_CLASSES, DeleteActivity
+    from nutshell.responses import GetLeadResult, DeleteActivityResult, FindUsersResult
+
+    assert RESPONSE_CLASSES["getLead"] is GetLeadResult
+    assert RESPONSE_CLASSES["findUsers"] is FindUsersResult
+    assert DeleteActivity.response_class is DeleteActivityResult
+    assert len(RESPONSE_CLASSES) == 15
+
+
+def test_response_registry_extensible():
+    from typing import ClassVar
+
+    from nutshell.methods import RESPONSE_CLASSES, _APIMethod
+    from nutshell.responses import _APIResponse
+
+    class SearchLeadsResult(_APIResponse):
+        result: list[dict]
+
+    class SearchLeads(_APIMethod):
+        api_method: str = "searchLeads"
+        response_class: ClassVar[type[_APIResponse]] = SearchLeadsResult
+
+    try:
+        assert RESPONSE_CLASSES["searchLeads"] is SearchLeadsResult
+    finally:
+        del RESPONSE_CLASSES["searchLeads"]
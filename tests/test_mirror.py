@@ -0,0 +1,102 @@
+import pytest
+
+from nutshell.mirror import Mirror
+from nutshell.mock_server import MockNutshell
+
+
+@pytest.fixture()
+def server():
+    with MockNutshell(leads=60, activities=45, users=8, description_size=20) as server:
+        yield server
+
+
+@pytest.fixture()
+def mirror(server, tmp_path, make_api):
+    mirror = Mirror(make_api(server, max_batch_size=10), tmp_path / "account.db", page_size=20)
+    yield mirror
+    mirror.close()
+
+
+def test_first_update_is_full(server, mirror):
+    stats = mirror.update()
+
+    assert stats["leads"].full and stats["leads"].updated == 60
+    assert stats["activities"].updated == 45
+    assert stats["users"].updated == 8
+    assert [lead.id for lead in mirror.leads()] == list(range(1, 61))
+    assert mirror.activity(3).lead.id == server.activities[2]["lead"]["id"]
+    assert mirror.user(2).name == server.users[1]["name"]
+    assert len(mirror.reference("milestones")) == len(server.milestones)
+
+
+def test_update_on_a_lazy_client(server, tmp_path, make_api):
+    with make_api(server, lazy=True) as api:
+        with Mirror(api, tmp_path / "lazy.db", page_size=20) as mirror:
+            stats = mirror.update()
+            assert stats["users"].updated == 8 and stats["leads"].updated == 60
+            assert mirror.user(2).name == server.users[1]["name"]
+            assert len(mirror.reference("teams")) == len(server.teams)
+
+
+def test_query_columns(server, mirror):
+    mirror.update()
+
+    (open_value,), = mirror.query("SELECT SUM(value_amount) FROM leads WHERE status = 0")
+    expected = sum(lead["value"]["amount"] for lead in server.leads if lead["status"] == 0)
+    assert open_value == pytest.approx(expected)
+    assert mirror.query("SELECT COUNT(*) FROM activities WHERE lead_id IS NULL") == [(0,)]
+
+
+def test_overdue_activities_keep_their_status(server, mirror):
+    server.modify(server.activities[0], status=-1)
+    server.activities[1].pop("isFlagged")
+    mirror.update()
+
+    overdue = [activity["id"] for activity in server.activities if activity["status"] == -1]
+    assert mirror.query("SELECT id FROM activities WHERE status = -1 ORDER BY id") == [(i,) for i in overdue]
+    assert mirror.query("SELECT COUNT(*) FROM activities WHERE status IS NULL") == [(0,)]
+    assert mirror.query("SELECT is_flagged FROM activities WHERE id = 2") == [(None,)]
+
+
+def test_delta_fetches_only_changes(server, mirror):
+    mirror.update()
+    server.requests.clear()
+    server.modify(server.leads[4], name="Renamed")
+    server.modify(server.activities[9], status=2)
+    server.delete(server.activities[11])
+
+    stats = mirror.update()
+
+    assert not stats["leads"].full
+    assert (stats["leads"].fetched, stats["leads"].updated, stats["leads"].deleted) == (1, 1, 0)
+    assert (stats["activities"].fetched, stats["activities"].deleted) == (1, 1)
+    assert mirror.lead(5).name == "Renamed"
+    assert mirror.lead(5).rev == server.leads[4]["rev"]
+    assert mirror.activity(10).status == 2
+    assert mirror.activity(12) is None
+    # one stub page per table, however large the account
+    stub_pages = [item for body in server.requests for item in (body if isinstance(body, list) else [body])
+                  if item["method"] in ("findLeads", "findActivities")]
+    assert len(stub_pages) == 2
+    assert all(item["params"]["stubResponses"] for item in stub_pages)
+
+
+def test_no_changes(server, mirror):
+    mirror.update()
+    watermark = mirror.watermark("leads")
+
+    stats = mirror.update()
+
+    assert (stats["leads"].fetched, stats["activities"].fetched) == (0, 0)
+    assert mirror.watermark("leads") == watermark
+
+
+def test_mirror_persists_across_instances(server, mirror, tmp_path):
+    mirror.update()
+    server.modify(server.leads[0], name="Changed")
+
+    with Mirror(mirror.api, tmp_path / "account.db", page_size=20) as reopened:
+        stats = reopened.update()
+        assert not stats["leads"].full
+        assert stats["leads"].fetched == 1
+        assert reopened.lead(1).name == "Changed"
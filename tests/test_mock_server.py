@@ -0,0 +1,54 @@
+import pytest
+
+from nutshell.entities import FindLeadsQuery, FindLeadsQueryStatus, User
+from nutshell.methods import FindLeads, FindActivities, GetLead, GetUser, FindUsers, FindActivityTypes
+from nutshell.mock_server import MockNutshell
+from nutshell.exceptions import NutshellRPCError
+
+
+@pytest.fixture()
+def api(mock_nutshell, make_api):
+    return make_api(mock_nutshell)
+
+
+def test_generated_payloads_validate(api):
+    api.api_calls = [FindLeads(stub_responses=False), FindActivities(stub_responses=False), FindUsers(),
+                     FindActivityTypes(), GetLead(lead_id=7), GetUser(user_id=2)]
+    leads, activities, users, activity_types, lead, user = api.call_api()
+
+    assert len(leads.result) == 50
+    assert activities.result[0].lead is not None
+    assert len(users.result) == 10
+    assert len(activity_types.result) == 5
+    assert lead.result.id == 7
+    assert user.result.id == 2
+
+
+def test_pagination_covers_account(api):
+    assert len(list(api.paginate(FindLeads(limit=50)))) == 120
+
+
+def test_lead_queries_are_applied(mock_nutshell, api):
+    user = User.model_validate(mock_nutshell.users[0])
+    query = FindLeadsQuery(status=FindLeadsQueryStatus.OPEN, stageset_ids=[1], assignee=[user])
+
+    leads = list(api.paginate(FindLeads(query=query, limit=50, stub_responses=False)))
+
+    expected = [lead["id"] for lead in mock_nutshell.leads if lead["status"] == 0 and lead["stageset"]["id"] == 1
+                and lead["assignee"]["entityType"] == "Users" and lead["assignee"]["id"] == user.id]
+    assert [lead.id for lead in leads] == expected and expected
+
+
+def test_unknown_entity_is_an_rpc_error(api):
+    api.api_calls = GetLead(lead_id=10_000)
+
+    with pytest.raises(NutshellRPCError):
+        api.call_api()
+
+
+def test_deterministic_for_seed():
+    first = MockNutshell(leads=5, activities=5, users=3, seed=3)
+    second = MockNutshell(leads=5, activities=5, users=3, seed=3)
+
+    assert first.leads == second.leads
+    assert first.activities == second.activities
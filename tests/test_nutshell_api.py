@@ -0,0 +1,178 @@
+import asyncio
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from nutshell.nutshell_api import NutshellAPI
+from nutshell.methods import GetLead, FindTeams
+from nutshell.responses import GetLeadResult, FindTeamsResult
+
+
+def _lead(lead_id: int) -> dict:
+    return {"id": lead_id, "entityType": "Leads", "rev": "1", "name": f"Lead {lead_id}", "description": "",
+            "status": 0}
+
+
+@pytest.fixture()
+def lead_server(fake_nutshell):
+    fake_nutshell.handler = lambda method, params: _lead(params["leadId"])
+    return fake_nutshell
+
+
+def test_unbatched_sends_one_request_per_call(lead_server, make_api):
+    api = make_api(lead_server)
+    api.api_calls = [GetLead(lead_id=1), GetLead(lead_id=2)]
+    results = api.call_api()
+
+    assert [result.result.id for result in results] == [1, 2]
+    assert all(isinstance(request, dict) for request in lead_server.requests)
+    assert len(lead_server.requests) == 2
+
+
+def test_batch_chunks_to_max_batch_size(lead_server, make_api):
+    api = make_api(lead_server, max_batch_size=3)
+    api.api_calls = [GetLead(lead_id=lead_id) for lead_id in range(1, 8)]
+    results = api.call_api()
+
+    assert [result.result.id for result in results] == list(range(1, 8))
+    assert sorted(len(request) if isinstance(request, list) else 1 for request in lead_server.requests) == [1, 3, 3]
+
+
+def test_batch_matches_responses_by_id(lead_server, make_api):
+    lead_server.reverse_batches = True
+    api = make_api(lead_server, max_batch_size=10)
+    api.api_calls = [GetLead(lead_id=lead_id) for lead_id in range(1, 6)]
+    results = api.call_api()
+
+    assert [result.result.id for result in results] == [1, 2, 3, 4, 5]
+
+
+def test_request_ids_are_unique(lead_server, make_api):
+    api = make_api(lead_server, max_batch_size=2)
+    api.api_calls = [GetLead(lead_id=1), GetLead(lead_id=2)]
+    api.call_api()
+    api.call_api()
+
+    ids = [item["id"] for request in lead_server.requests for item in request]
+    assert len(ids) == len(set(ids)) == 4
+
+
+def test_batch_mixed_methods(fake_nutshell, make_api):
+    fake_nutshell.handler = lambda method, params: _lead(params["leadId"]) if method == "getLead" else []
+    api = make_api(fake_nutshell, max_batch_size=5)
+    api.api_calls = [GetLead(lead_id=4), FindTeams()]
+    lead_result, teams_result = api.call_api()
+
+    assert isinstance(lead_result, GetLeadResult)
+    assert isinstance(teams_result, FindTeamsResult)
+
+
+def test_match_missing_response():
+    matched = NutshellAPI._match_responses([{"id": "1"}, {"id": "2"}], [{"id": "2", "result": True}])
+
+    assert matched[1] == {"id": "2", "result": True}
+    assert "error" in matched[0]
+
+
+def test_invalid_batch_size(make_api):
+    with pytest.raises(ValueError):
+        make_api(max_batch_size=0)
+
+
+def test_call_api_reuses_session(lead_server, make_api):
+    api = make_api(lead_server)
+    api.api_calls = GetLead(lead_id=1)
+    api.call_api()
+    sessions = [resources.session for resources in api._resources.values()]
+    api.call_api()
+
+    assert [resources.session for resources in api._resources.values()] == sessions
+    assert len(sessions) == 1
+
+
+def test_call_api_inside_running_loop(lead_server, make_api):
+    api = make_api(lead_server)
+    api.api_calls = GetLead(lead_id=3)
+
+    async def from_async_code():
+        return api.call_api()
+
+    assert asyncio.run(from_async_code()).result.id == 3
+
+
+def test_acall_context_manager(lead_server, make_api):
+    async def run():
+        async with make_api(lead_server) as api:
+            single = await api.acall(GetLead(lead_id=5))
+            many = await api.acall([GetLead(lead_id=6), GetLead(lead_id=7)])
+            session_count = len(api._resources)
+        return single, many, session_count, api
+
+    single, many, session_count, api = asyncio.run(run())
+
+    assert single.result.id == 5
+    assert [result.result.id for result in many] == [6, 7]
+    assert session_count == 1
+    assert api._resources == {}
+
+
+def test_session_closes_with_its_event_loop(lead_server, make_api):
+    api = make_api(lead_server)
+
+    assert asyncio.run(api.acall(GetLead(lead_id=4))).result.id == 4
+    (resources,) = api._resources.values()
+    assert resources.session.closed
+
+
+def test_loop_closed_without_shutdown_is_reported(lead_server, make_api):
+    api = make_api(lead_server)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(api.acall(GetLead(lead_id=4)))
+    loop.close()
+
+    with pytest.warns(ResourceWarning):
+        api.call_api(GetLead(lead_id=5))
+
+
+def test_close_stops_background_loop(lead_server, make_api):
+    api = make_api(lead_server)
+    api.api_calls = GetLead(lead_id=1)
+    api.call_api()
+    loop = api._background.loop
+    api.close()
+
+    assert api._background is None
+    assert loop.is_closed()
+
+
+def test_call_api_with_calls_from_many_threads(lead_server, make_api):
+    api = make_api(lead_server)
+    api.api_calls = GetLead(lead_id=999)  # queued calls are left alone
+
+    with ThreadPoolExecutor(8) as threads:
+        responses = list(threads.map(lambda lead_id: api.call_api(GetLead(lead_id=lead_id)), range(1, 101)))
+    pair = api.call_api([GetLead(lead_id=1), GetLead(lead_id=2)])
+
+    assert [response.result.id for response in responses] == list(range(1, 101))
+    assert [response.result.id for response in pair] == [1, 2]
+    assert len(api._resources) == 1
+    assert api.api_calls[0].lead_id == 999
+
+
+def test_package_import_is_lazy():
+    code = ("import sys, nutshell\n"
+            "from nutshell.entities import Lead\n"
+            "assert 'nutshell.nutshell_api' not in sys.modules and not Lead.__pydantic_complete__\n"
+            "api = nutshell.NutshellAPI('user', password='key')\n"
+            "assert 'aiohttp' not in sys.modules and nutshell.methods.GetLead(lead_id=1).lead_id == 1\n"
+            "try:\n"
+            "    nutshell.missing\n"
+            "except AttributeError:\n"
+            "    print('ok')\n")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parents[1])
+
+    assert result.stdout == "ok\n", result.stderr
@@ -0,0 +1,134 @@
+import asyncio
+import random
+
+import pytest
+
+from nutshell.methods import FindActivities, FindLeads, FindTeams, GetLead
+from nutshell.pagination import AdaptivePageSize, Paginator
+
+
+def _team(team_id: int) -> dict:
+    return {"stub": True, "id": team_id, "name": f"Team {team_id}", "rev": "1", "entityType": "Teams",
+            "modifiedTime": "", "createdTime": ""}
+
+
+@pytest.fixture()
+def team_server(fake_nutshell):
+    total = 23
+
+    def find_teams(method, params):
+        first = (params["page"] - 1) * params["limit"] + 1
+        return [_team(team_id) for team_id in range(first, min(first + params["limit"], total + 1))]
+
+    fake_nutshell.handler = find_teams
+    return fake_nutshell
+
+
+@pytest.fixture()
+def api(team_server, make_api):
+    return make_api(team_server)
+
+
+def test_sync_iteration(api, team_server):
+    teams = list(api.paginate(FindTeams(limit=5), prefetch=2))
+
+    assert [team.id for team in teams] == list(range(1, 24))
+
+
+def test_async_iteration(team_server, make_api):
+    async def collect():
+        async with make_api(team_server) as api:
+            return [team.id async for team in api.paginate(FindTeams(limit=10), prefetch=1)]
+
+    assert asyncio.run(collect()) == list(range(1, 24))
+
+
+def test_stops_on_short_page(api, team_server):
+    list(api.paginate(FindTeams(limit=5), prefetch=0))
+
+    assert sorted(request["params"]["page"] for request in team_server.requests) == [1, 2, 3, 4, 5]
+
+
+def test_exact_multiple_of_limit(api, team_server):
+    teams = list(api.paginate(FindTeams(limit=23)))
+
+    assert len(teams) == 23
+
+
+def test_start_page(api):
+    teams = list(api.paginate(FindTeams(limit=10, page=2)))
+
+    assert [team.id for team in teams] == list(range(11, 24))
+
+
+def test_early_break_cancels_prefetch(api):
+    for team in api.paginate(FindTeams(limit=2), prefetch=3):
+        if team.id == 3:
+            break
+
+    assert api.throttle_stats.in_flight == 0
+
+
+def test_rejects_unpaginated_method(api):
+    with pytest.raises(ValueError):
+        Paginator(api, GetLead(lead_id=1))
+
+
+def test_page_size_follows_the_estimates():
+    adaptive = AdaptivePageSize(target_latency=1.0, max_bytes=100_000, min_limit=10, max_limit=500)
+
+    assert adaptive.target("findLeads", 50) == 50
+    adaptive.observe("findLeads", 100, 200_000, 0.5)
+    assert adaptive.target("findLeads", 50) == 50  # 2 kB per entity against a 100 kB budget
+    adaptive.observe("findActivities", 100, 10_000, 2.0)
+    assert adaptive.target("findActivities", 50) == 50  # 20 ms per entity against a 1 s target
+    adaptive.observe("findTeams", 10, 1_000, 0.01)
+    assert adaptive.target("findTeams", 50) == 500
+    adaptive.observe("findUsers", 10, 1_000_000, 1.0)
+    assert adaptive.target("findUsers", 50) == 10
+
+
+def test_page_size_stays_addressable():
+    adaptive = AdaptivePageSize(max_limit=200)
+    adaptive.observe("findLeads", 50, 100, 0.01)
+
+    assert [adaptive.limit("findLeads", offset, 50) for offset in (0, 50, 150, 400)] == [200, 50, 150, 200]
+    assert adaptive.stats["findLeads"].limits == {200: 2, 50: 1, 150: 1}
+    adaptive.observe("findActivities", 100, 100, 100 / 13)  # aims for pages of 13
+    assert adaptive.limit("findActivities", 250, 250) == 10  # the largest divisor of 250 from min_limit up to 13
+
+
+def test_page_size_never_drops_below_min_limit():
+    adaptive = AdaptivePageSize(max_bytes=100_000, min_limit=20, max_limit=100)
+    rng = random.Random(7)
+    offset, limit, limits = 0, 50, []
+    for _ in range(200):
+        limit = adaptive.limit("findLeads", offset, limit)
+        assert offset % limit == 0
+        limits.append(limit)
+        adaptive.observe("findLeads", limit, limit * rng.randint(500, 5_000), limit * rng.uniform(0.001, 0.05))
+        offset += limit
+
+    assert min(limits) >= 20 and len(set(limits)) > 1
+
+
+def test_adaptive_pages_grow_for_small_entities(mock_nutshell, make_api):
+    adaptive = AdaptivePageSize(max_limit=40)
+    with make_api(mock_nutshell, adaptive_paging=adaptive) as api:
+        leads = list(api.paginate(FindLeads(limit=5), prefetch=1))
+
+    assert [lead.id for lead in leads] == list(range(1, 121))
+    assert len(mock_nutshell.requests) < 120 // 5
+    assert adaptive.stats["findLeads"].limit == 40
+
+
+def test_adaptive_pages_shrink_for_large_entities(mock_nutshell, make_api):
+    adaptive = AdaptivePageSize(max_bytes=10_000, min_limit=2)
+    with make_api(mock_nutshell, adaptive_paging=adaptive) as api:
+        pages = api._background_loop().iterate(
+            Paginator(api, FindActivities(limit=40, stub_responses=False), prefetch=0, raw=True).pages())
+        activities = [activity for page in pages for activity in page]
+
+    assert [activity["id"] for activity in activities] == list(range(1, 81))
+    stats = adaptive.stats["findActivities"]
+    assert stats.limit < 40 and stats.bytes_per_entity * stats.limit <= 10_000
@@ -0,0 +1,66 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from nutshell.entities import Activity
+from nutshell.exceptions import NutshellRPCError
+from nutshell.methods import FindActivities, GetLead
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield pool
+
+
+@pytest.fixture(scope="module")
+def thread_pool():
+    with ThreadPoolExecutor(2) as pool:
+        yield pool
+
+
+def _calls():
+    return [GetLead(lead_id=lead_id) for lead_id in range(1, 8)] + [FindActivities(limit=40, stub_responses=False)]
+
+
+@pytest.mark.parametrize("pool", ["thread_pool", "process_pool"])
+@pytest.mark.parametrize("options", [{}, {"max_batch_size": 3}])
+def test_executor_parses_like_the_loop(mock_nutshell, request, pool, options, make_api):
+    with make_api(mock_nutshell, **options) as api:
+        expected = api.call_api(_calls())
+    with make_api(mock_nutshell, parse_executor=request.getfixturevalue(pool), **options) as api:
+        responses = api.call_api(_calls())
+
+    assert responses == expected
+    assert isinstance(responses[-1].result[0], Activity)
+
+
+@pytest.mark.parametrize("pool", ["thread_pool", "process_pool"])
+def test_executor_reports_errors_per_call(mock_nutshell, request, pool, make_api):
+    with make_api(mock_nutshell, max_batch_size=2, parse_executor=request.getfixturevalue(pool)) as api:
+        pairs = list(api.iter_completed([GetLead(lead_id=1), GetLead(lead_id=10_000)]))
+
+    errors = [response for _, response in pairs if isinstance(response, Exception)]
+    assert len(errors) == 1 and isinstance(errors[0], NutshellRPCError)
+
+
+def test_executor_reports_validation_time(mock_nutshell, process_pool, make_api):
+    timings = []
+    with make_api(mock_nutshell, max_batch_size=4, parse_executor=process_pool, hooks=[timings.append]) as api:
+        api.call_api(_calls())
+
+    assert len(timings) == 8
+    assert all(timing.validation > 0 for timing in timings)
+
+
+def test_raw_fetches_with_process_pool(mock_nutshell, process_pool, make_api):
+    with make_api(mock_nutshell, parse_executor=process_pool) as api:
+        table = api.columns(FindActivities(limit=30, stub_responses=False))
+
+    assert len(table) == 80
+
+
+def test_lazy_cannot_use_process_pool(process_pool, make_api):
+    with pytest.raises(ValueError):
+        make_api(lazy=True, parse_executor=process_pool)
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from nutshell.entities import User
+from nutshell.reference import ReferenceData
+
+_ENTITIES = {
+    "findActivityTypes": [{"stub": True, "id": 1, "rev": "1", "entityType": "Activity_Types", "name": "Phone Call"},
+                          {"stub": True, "id": 2, "rev": "1", "entityType": "Activity_Types", "name": "Email"}],
+    "findStagesets": [{"id": 1, "entityType": "Stagesets", "name": "Sales"}],
+    "findMilestones": [{"id": 4, "entityType": "Milestones", "rev": "1", "name": "Qualified", "stagesetId": 1}],
+    "findTeams": [{"stub": True, "id": 7, "name": "Blue", "rev": "1", "entityType": "Teams", "modifiedTime": "",
+                   "createdTime": ""}],
+    "findUsers": [{"id": 3, "entityType": "Users", "rev": "1", "name": "Jane", "isEnabled": True,
+                   "isAdministrator": False, "emails": [], "modifiedTime": "", "createdTime": ""}],
+}
+
+
+@pytest.fixture()
+def reference_server(fake_nutshell):
+    fake_nutshell.handler = lambda method, params: _ENTITIES[method] if params["page"] == 1 else []
+    return fake_nutshell
+
+
+@pytest.fixture()
+def api(reference_server, make_api):
+    return make_api(reference_server)
+
+
+def test_load_fetches_and_builds_lookups(api, reference_server):
+    reference = ReferenceData(api).load()
+
+    assert reference.activity_type_name(2) == "Email"
+    assert reference.milestone(4).stageset_id == 1
+    assert reference.team(7).name == "Blue"
+    assert reference.user(3).name == "Jane"
+    assert reference.stageset(1).name == "Sales"
+    assert reference.activity_type(99) is None
+    assert len(reference.activity_types) == 2
+    assert not reference.is_stale
+
+
+def test_lookups_never_call_the_api(api, reference_server):
+    reference = ReferenceData(api).load()
+    request_count = len(reference_server.requests)
+    reference.activity_type_name(1)
+    reference.users
+
+    assert len(reference_server.requests) == request_count
+
+
+def test_lists_are_models_on_a_lazy_client(reference_server, tmp_path, make_api):
+    with make_api(reference_server, lazy=True) as api:
+        reference = ReferenceData(api, path=tmp_path / "reference.json").load()
+
+    assert isinstance(reference.user(3), User)
+    assert ReferenceData(api, path=tmp_path / "reference.json").load().team(7).name == "Blue"
+
+
+def test_warm_start_from_file(api, reference_server, tmp_path):
+    path = tmp_path / "reference.json"
+    ReferenceData(api, path=path).load()
+    request_count = len(reference_server.requests)
+    warm = ReferenceData(api, path=path).load()
+
+    assert len(reference_server.requests) == request_count
+    assert warm.activity_type_name(1) == "Phone Call"
+    assert warm.fetched_at is not None
+
+
+def test_corrupt_file_falls_back_to_api(api, tmp_path):
+    path = tmp_path / "reference.json"
+    path.write_text("{not json")
+    reference = ReferenceData(api, path=path).load()
+
+    assert reference.team(7) is not None
+
+
+def test_background_refresh(api, reference_server):
+    reference = ReferenceData(api, ttl=0.05)
+    reference.start_refresh()
+    try:
+        time.sleep(0.3)
+    finally:
+        reference.stop_refresh()
+
+    assert reference.activity_type_name(1) == "Phone Call"
+    assert len(reference_server.requests) > 10
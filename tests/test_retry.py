@@ -0,0 +1,177 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from nutshell.exceptions import NutshellHTTPError, CircuitOpenError
+from nutshell.methods import GetLead, EditLead
+from nutshell.nutshell_api import NutshellAPI
+from nutshell.retry import RetryPolicy, CircuitBreaker, admit, parse_retry_after
+
+
+def _lead(lead_id: int) -> dict:
+    return {"id": lead_id, "entityType": "Leads", "rev": "2", "name": f"Lead {lead_id}", "description": "",
+            "status": 0}
+
+
+@pytest.fixture()
+def lead_server(fake_nutshell):
+    fake_nutshell.handler = lambda method, params: _lead(params["leadId"])
+    return fake_nutshell
+
+
+@pytest.fixture()
+def retrying_api(lead_server, make_api):
+    return lambda **policy: make_api(lead_server, retry_policy=RetryPolicy(base_delay=0.01, **policy))
+
+
+def test_read_method_is_retried(lead_server, retrying_api):
+    lead_server.failures = [502, 429]
+    api = retrying_api()
+    api.api_calls = GetLead(lead_id=1)
+
+    assert api.call_api().result.id == 1
+    assert len(lead_server.requests) == 3
+
+
+def test_gives_up_after_max_attempts(lead_server, retrying_api):
+    lead_server.failures = [503, 503, 503]
+    api = retrying_api(max_attempts=2)
+    api.api_calls = GetLead(lead_id=1)
+
+    with pytest.raises(NutshellHTTPError) as error:
+        api.call_api()
+    assert error.value.status == 503
+    assert len(lead_server.requests) == 2
+
+
+def test_mutation_not_retried_by_default(lead_server, retrying_api):
+    lead_server.failures = [502]
+    api = retrying_api()
+    api.api_calls = EditLead(lead_id=1, rev="1", lead={"name": "Renamed"})
+
+    with pytest.raises(NutshellHTTPError):
+        api.call_api()
+    assert len(lead_server.requests) == 1
+
+
+def test_mutation_retried_when_opted_in(lead_server, retrying_api):
+    lead_server.failures = [502]
+    api = retrying_api(retry_mutations=True)
+    api.api_calls = EditLead(lead_id=1, rev="1", lead={"name": "Renamed"})
+
+    assert api.call_api().result.rev == "2"
+
+
+@pytest.mark.parametrize("status", [500, 401])
+def test_non_transient_status_not_retried(lead_server, retrying_api, status):
+    lead_server.failures = [status]
+    api = retrying_api()
+    api.api_calls = GetLead(lead_id=1)
+
+    with pytest.raises(NutshellHTTPError) as error:
+        api.call_api()
+    assert error.value.status == status
+    assert len(lead_server.requests) == 1
+
+
+def test_honours_retry_after(lead_server, retrying_api):
+    lead_server.failures = [429]
+    lead_server.retry_after = "0.2"
+    api = retrying_api()
+    api.api_calls = GetLead(lead_id=1)
+    start = time.perf_counter()
+    api.call_api()
+
+    assert time.perf_counter() - start >= 0.2
+
+
+def test_circuit_opens_and_fails_fast(lead_server, retrying_api):
+    lead_server.failures = [503] * 4
+    api = retrying_api(max_attempts=2, breaker_threshold=2, breaker_reset=60)
+    api.api_calls = GetLead(lead_id=1)
+
+    with pytest.raises(NutshellHTTPError):
+        api.call_api()
+    with pytest.raises(CircuitOpenError):
+        api.call_api()
+    assert len(lead_server.requests) == 2
+    assert api.circuit_breakers["getLead"].state == "open"
+
+
+def test_circuit_half_open_trial():
+    breaker = CircuitBreaker("getLead", threshold=1, reset=0.05)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def _half_open(api: NutshellAPI, lead_server):
+    lead_server.failures = [503]
+    with pytest.raises(NutshellHTTPError):
+        api.call_api(GetLead(lead_id=1))
+    time.sleep(0.06)
+    assert api.circuit_breakers["getLead"].state == "half-open"
+
+
+def test_trial_failing_with_a_non_transient_error_reopens_the_circuit(lead_server, retrying_api):
+    api = retrying_api(max_attempts=1, breaker_threshold=1, breaker_reset=0.05)
+    _half_open(api, lead_server)
+
+    lead_server.failures = [500]
+    with pytest.raises(NutshellHTTPError):
+        api.call_api(GetLead(lead_id=1))
+    assert api.circuit_breakers["getLead"].state == "open"
+    time.sleep(0.06)
+    assert api.call_api(GetLead(lead_id=1)).result.id == 1
+    assert api.circuit_breakers["getLead"].state == "closed"
+
+
+def test_cancelled_trial_is_released(lead_server, retrying_api):
+    api = retrying_api(max_attempts=1, breaker_threshold=1, breaker_reset=0.05)
+    _half_open(api, lead_server)
+
+    async def cancel_trial():
+        lead_server.latency = 0.5
+        async with api:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(api.acall(GetLead(lead_id=1)), 0.05)
+        lead_server.latency = 0
+
+    asyncio.run(cancel_trial())
+    assert api.circuit_breakers["getLead"].state == "half-open"
+    assert api.call_api(GetLead(lead_id=1)).result.id == 1
+
+
+def test_admit_takes_no_trial_when_another_circuit_is_open():
+    half_open = CircuitBreaker("getLead", threshold=1, reset=0.05)
+    half_open.record_failure()
+    time.sleep(0.06)
+    still_open = CircuitBreaker("getUser", threshold=1, reset=60)
+    still_open.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        admit([half_open, still_open])
+    assert admit([half_open]) == [half_open]
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+
+    assert all(0 <= policy.backoff(attempt) <= 4 for attempt in range(1, 10))
+    assert policy.backoff(1, retry_after=10) == 4
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
@@ -0,0 +1,64 @@
+import pytest
+
+from nutshell.entities import FindLeadsQuery, FindLeadsQueryStatus, Lead, User
+from nutshell.methods import FindLeads
+from nutshell.sharding import ShardedFindLeads, plan_shards
+
+
+@pytest.fixture()
+def api(mock_nutshell, make_api):
+    return make_api(mock_nutshell)
+
+
+def test_plan_splits_on_the_query_values_first():
+    query = FindLeadsQuery(stageset_ids=[1, 2], status=FindLeadsQueryStatus.OPEN)
+
+    by_stageset = plan_shards(query, "stageset", values=[7])
+    by_status = plan_shards(query, "status")
+
+    assert [shard.query for shard in by_stageset] == [{"status": 0, "stagesetIds": [1]},
+                                                      {"status": 0, "stagesetIds": [2]}]
+    assert [shard.query for shard in by_status] == [{"status": 0, "stagesetIds": [1, 2]}]
+    assert [shard.status for shard in plan_shards(None)] == list(FindLeadsQueryStatus)
+
+
+def test_plan_needs_values_or_a_known_dimension():
+    with pytest.raises(ValueError):
+        plan_shards(None, "milestone")
+    with pytest.raises(ValueError):
+        plan_shards(None, "region")
+    assert [shard.query for shard in plan_shards(FindLeadsQuery(milestone_id=3), "milestone")] == [
+        {"milestoneIds": [3]}]
+
+
+@pytest.mark.parametrize("by", ["status", "stageset", "milestone", "assignee"])
+def test_sharded_fetch_matches_a_single_query(mock_nutshell, api, by):
+    method = FindLeads(limit=10, stub_responses=False)
+    sharded = ShardedFindLeads(api, method, by=by, concurrency=4)
+
+    leads = sharded.fetch()
+
+    assert [lead.id for lead in leads] == [lead.id for lead in api.paginate(method)]
+    assert all(isinstance(lead, Lead) for lead in leads)
+    assert len(sharded.shards) > 1 and sharded.duplicates == 0
+
+
+def test_merge_keeps_the_requested_order(mock_nutshell, api):
+    method = FindLeads(limit=15, order_by="modifiedTime", order_direction="DESC")
+
+    leads = ShardedFindLeads(api, method, by="milestone", raw=True).fetch()
+
+    assert [lead["id"] for lead in leads] == [lead.id for lead in api.paginate(method)]
+    assert all(lead["stub"] for lead in leads)
+
+
+def test_leads_listed_by_several_shards_are_kept_once(mock_nutshell, api):
+    user = User.model_validate(mock_nutshell.users[0])
+    sharded = ShardedFindLeads(api, FindLeads(limit=5), by="assignee", values=[user, user])
+
+    leads = sharded.fetch()
+
+    expected = [lead["id"] for lead in mock_nutshell.leads
+                if lead["assignee"]["entityType"] == "Users" and lead["assignee"]["id"] == user.id]
+    assert [lead.id for lead in leads] == expected and expected
+    assert sharded.duplicates == len(expected)
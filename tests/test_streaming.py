@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from nutshell.exceptions import NutshellRPCError
+from nutshell.methods import GetLead
+from nutshell.responses import GetLeadResult
+
+
+async def _slow_lead(method, params):
+    lead_id = params["leadId"]
+    if lead_id < 0:
+        return ValueError("Lead not found")
+    await asyncio.sleep(lead_id / 20)
+    return {"id": lead_id, "entityType": "Leads", "rev": "1", "name": f"Lead {lead_id}", "description": "",
+            "status": 0}
+
+
+@pytest.fixture()
+def api(fake_nutshell, make_api):
+    fake_nutshell.handler = _slow_lead
+    return make_api(fake_nutshell)
+
+
+def test_yields_in_completion_order(api):
+    calls = [GetLead(lead_id=lead_id) for lead_id in (3, 1, 2)]
+    completed = list(api.iter_completed(calls))
+
+    assert [call.lead_id for call, _ in completed] == [1, 2, 3]
+    assert all(response.result.id == call.lead_id for call, response in completed)
+
+
+def test_errors_are_yielded_not_raised(api):
+    completed = dict((call.lead_id, response) for call, response in
+                     api.iter_completed([GetLead(lead_id=1), GetLead(lead_id=-1)]))
+
+    assert isinstance(completed[1], GetLeadResult)
+    assert isinstance(completed[-1], NutshellRPCError)
+    assert completed[-1].message == "Lead not found"
+
+
+def test_async_as_completed(api, fake_nutshell, make_api):
+    async def first_result():
+        async with make_api(fake_nutshell) as client:
+            async for call, response in client.as_completed([GetLead(lead_id=8), GetLead(lead_id=1)]):
+                return call, response
+
+    call, response = asyncio.run(first_result())
+
+    assert call.lead_id == 1
+
+
+def test_batched_calls_complete_together(fake_nutshell, make_api):
+    fake_nutshell.handler = _slow_lead
+    with make_api(fake_nutshell, max_batch_size=2) as api:
+        completed = list(api.iter_completed([GetLead(lead_id=lead_id) for lead_id in (1, 2, 3)]))
+
+    assert sorted(call.lead_id for call, _ in completed) == [1, 2, 3]
+
+
+def test_rpc_error_raised_by_call_api(api):
+    api.api_calls = GetLead(lead_id=-1)
+
+    with pytest.raises(NutshellRPCError):
+        api.call_api()
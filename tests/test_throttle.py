@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from nutshell.methods import GetUser
+from nutshell.throttle import InFlightLimit, TokenBucket, ThrottleStats
+
+
+def test_token_bucket_burst_is_immediate():
+    bucket = TokenBucket(rate=10, burst=5)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    start = time.perf_counter()
+    asyncio.run(take(5))
+    assert time.perf_counter() - start < 0.05
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def take(count):
+        await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+
+    start = time.perf_counter()
+    asyncio.run(take(6))
+    assert time.perf_counter() - start >= 0.09
+
+
+def test_token_bucket_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_throttle_stats():
+    stats = ThrottleStats()
+    stats.started(0.5)
+    stats.started(0.1)
+    stats.finished(1.0)
+    stats.finished(2.0)
+
+    assert stats.requests == 2
+    assert stats.max_in_flight == 2
+    assert stats.in_flight == 0
+    assert stats.mean_queued_time == pytest.approx(0.3)
+    assert stats.mean_wire_time == pytest.approx(1.5)
+
+
+def test_max_in_flight_bounds_requests(fake_nutshell, make_api):
+    fake_nutshell.latency = 0.05
+    fake_nutshell.handler = lambda method, params: {"id": params["userId"], "entityType": "Users", "rev": "1",
+                                                     "name": "User", "isEnabled": True, "isAdministrator": False,
+                                                     "emails": [], "modifiedTime": "", "createdTime": ""}
+    with make_api(fake_nutshell, max_in_flight=3) as api:
+        api.api_calls = [GetUser(user_id=user_id) for user_id in range(1, 10)]
+        api.call_api()
+
+    assert api.throttle_stats.requests == 9
+    assert api.throttle_stats.max_in_flight == 3
+    assert api.throttle_stats.queued_time > 0
+    assert api.throttle_stats.wire_time >= 9 * 0.05
+
+
+def test_max_in_flight_is_shared_across_event_loops(fake_nutshell, make_api):
+    fake_nutshell.latency = 0.05
+    fake_nutshell.handler = lambda method, params: {"id": params["userId"], "entityType": "Users", "rev": "1",
+                                                     "name": "User", "isEnabled": True, "isAdministrator": False,
+                                                     "emails": [], "modifiedTime": "", "createdTime": ""}
+    api = make_api(fake_nutshell, max_in_flight=3)
+
+    async def both_loops():
+        async with api:
+            background = asyncio.get_running_loop().run_in_executor(
+                None, api.call_api, [GetUser(user_id=user_id) for user_id in range(1, 7)])
+            await api.acall([GetUser(user_id=user_id) for user_id in range(7, 13)])
+            await background
+
+    asyncio.run(both_loops())
+    api.close()
+
+    assert api.throttle_stats.requests == 12
+    assert api.throttle_stats.max_in_flight == 3
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    async def scenario():
+        limit = InFlightLimit(1)
+        await limit.acquire()
+        cancelled = asyncio.ensure_future(limit.acquire())
+        admitted = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0)
+        limit.release()  # handed to the first waiter...
+        cancelled.cancel()  # ...which is cancelled before it runs
+        await asyncio.gather(cancelled, return_exceptions=True)
+        await asyncio.wait_for(admitted, 1)
+        limit.release()
+        return limit._in_use
+
+    assert asyncio.run(scenario()) == 0